@@ -0,0 +1,223 @@
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ai_context import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+ISSUE_KEY = re.compile(r'\b[A-Z][A-Z0-9_]+-\d+\b')
+# Summarize older turns once the memory block passes this many tokens
+DEFAULT_TOKEN_BUDGET = 600
+KEEP_TURNS = 3
+MAX_ISSUES = 10
+NOTE_CHARS = 160
+ANSWER_CHARS = 240
+SUMMARY_CHARS = 600
+MEMORY_HEADER = "Conversation memory (check it before calling a tool again):"
+
+# Follow-ups pointing at the issue under discussion: "assign it to me", "move that one to Done"
+_REFERENCE = r'(?P<ref>it|this\s+one|that\s+one|(?:this|that|the\s+same)\s+(?:issue|ticket|bug|task|story))'
+FOLLOW_UP = re.compile(
+    r'\b(?:assign|reassign|move|transition|close|reopen|resolve|update|mark|set|change|edit|show(?:\s+me)?|get'
+    rf'|open|describe|summarize|(?:details?|info|information|status)\s+(?:for|of|on|about))\s+{_REFERENCE}\b',
+    re.IGNORECASE
+)
+
+SUMMARY_PROMPT = """Condense this Jira assistant conversation into at most 80 words.
+Keep issue keys, decisions and changes made; drop pleasantries.
+
+{previous}{turns}
+
+Summary:"""
+
+
+def _compact(text: str, limit: int) -> str:
+    text = ' '.join(str(text).replace('\t', ' | ').split())
+    return text if len(text) <= limit else text[:limit - 3] + '...'
+
+
+@dataclass
+class Turn:
+    query: str
+    answer: str
+    # "tool: input" for every tool the turn called
+    tools: List[str] = field(default_factory=list)
+
+    def line(self) -> str:
+        used = f" [{'; '.join(self.tools)}]" if self.tools else ''
+        return f"- User: {self.query}{used} -> {self.answer}"
+
+
+class ConversationMemory:
+    """Bounded memory of one JiraAgent conversation.
+
+    Keeps the last turns, one compact line per recently seen issue (taken from
+    tool observations) and a summary of older turns. When the rendered block
+    passes ``token_budget`` tokens the older turns are folded into the summary
+    by ``summarize`` (an LLM prompt -> text callable) or, without one, by
+    keeping their questions.
+    """
+
+    def __init__(self, summarize: Optional[Callable[[str], str]] = None,
+                 token_budget: int = DEFAULT_TOKEN_BUDGET, keep_turns: int = KEEP_TURNS,
+                 max_issues: int = MAX_ISSUES):
+        self.summarize = summarize
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+        self.max_issues = max_issues
+        self.summary = ''
+        self.turns: List[Turn] = []
+        # key -> note, most recently referenced last
+        self.issues: 'OrderedDict[str, str]' = OrderedDict()
+        # key -> result of the last write, which may make the note's status stale
+        self.actions: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self._compacting = False
+        self.summaries = 0
+        self.summarized_turns = 0
+        self.resolved = 0
+
+    # --- Follow-ups ---
+    def current_key(self) -> Optional[str]:
+        with self._lock:
+            return next(reversed(self.issues), None)
+
+    def resolve(self, query: str) -> str:
+        """Replace "it"/"that one" with the issue under discussion when the query names none"""
+        key = self.current_key()
+        if not key or ISSUE_KEY.search(query):
+            return query
+        match = FOLLOW_UP.search(query)
+        if not match:
+            return query
+        with self._lock:
+            self.resolved += 1
+        return query[:match.start('ref')] + key + query[match.end('ref'):]
+
+    def prompt(self, query: str) -> str:
+        """The agent input: the request first, then the memory block"""
+        context = self.context()
+        return f"{query}\n\n{context}" if context else query
+
+    # --- Recording ---
+    def _touch(self, key: str, note: Optional[str] = None):
+        if note is not None or key not in self.issues:
+            self.issues[key] = note or self.issues.get(key) or key
+        self.issues.move_to_end(key)
+        while len(self.issues) > self.max_issues:
+            dropped, _ = self.issues.popitem(last=False)
+            self.actions.pop(dropped, None)
+
+    def observe(self, tool: str, tool_input: str, output: Any):
+        """Keep the issue lines of one tool observation (search rows, issue details, write results)"""
+        lines = str(output).splitlines()
+        notes = []
+        for i, line in enumerate(lines):
+            match = ISSUE_KEY.match(line)
+            if not match:
+                continue
+            note = line
+            if i + 1 < len(lines) and lines[i + 1].startswith('status:'):
+                note += ' | ' + lines[i + 1]
+            notes.append((match.group(0), _compact(note, NOTE_CHARS)))
+        with self._lock:
+            if notes:
+                # Reversed so the first row ends up as the issue in focus
+                for key, note in reversed(notes[:self.max_issues]):
+                    self._touch(key, note)
+                    self.actions.pop(key, None)
+                return
+            first = _compact(lines[0] if lines else '', NOTE_CHARS)
+            for key in dict.fromkeys(ISSUE_KEY.findall(f"{tool_input} {first}")):
+                self._touch(key)
+                self.actions[key] = first
+
+    def record(self, query: str, answer: str, steps: Sequence[Tuple[str, str, Any]] = ()) -> bool:
+        """Add a finished turn; returns True when it is time to compact()"""
+        for tool, tool_input, output in steps:
+            self.observe(tool, tool_input, output)
+        with self._lock:
+            self.turns.append(Turn(_compact(query, ANSWER_CHARS), _compact(answer, ANSWER_CHARS),
+                                   [_compact(f"{tool}: {tool_input}", 80) for tool, tool_input, _ in steps]))
+            # Keys the user typed are what follow-ups refer to
+            for key in ISSUE_KEY.findall(query):
+                self._touch(key)
+            return self._over_budget()
+
+    # --- Rendering and compaction ---
+    def context(self) -> str:
+        with self._lock:
+            if not (self.summary or self.turns or self.issues):
+                return ''
+            lines = [MEMORY_HEADER]
+            if self.summary:
+                lines.append(f"Earlier: {self.summary}")
+            if self.turns:
+                lines.append("Recent turns:")
+                lines.extend(turn.line() for turn in self.turns)
+            if self.issues:
+                lines.append("Issues seen (most recent last):")
+                for key, note in self.issues.items():
+                    action = self.actions.get(key)
+                    lines.append(f"{note} | last change: {action}" if action else note)
+            return '\n'.join(lines)
+
+    def _over_budget(self) -> bool:
+        return len(self.turns) > self.keep_turns and estimate_tokens(self.context()) > self.token_budget
+
+    def compact(self) -> bool:
+        """Fold all but the last ``keep_turns`` turns into the summary (safe to run in the background)"""
+        with self._lock:
+            if self._compacting or not self._over_budget():
+                return False
+            self._compacting = True
+            folded = self.turns[:-self.keep_turns]
+            previous = self.summary
+        try:
+            summary = self._summarize(previous, folded)
+            with self._lock:
+                # Turns recorded while the summary was written stay verbatim
+                self.turns = self.turns[len(folded):]
+                self.summary = summary
+                self.summaries += 1
+                self.summarized_turns += len(folded)
+            return True
+        finally:
+            with self._lock:
+                self._compacting = False
+
+    def _summarize(self, previous: str, turns: List[Turn]) -> str:
+        text = '\n'.join(turn.line() for turn in turns)
+        if self.summarize:
+            try:
+                prompt = SUMMARY_PROMPT.format(previous=f"Earlier: {previous}\n" if previous else '', turns=text)
+                return _compact(self.summarize(prompt).strip(), SUMMARY_CHARS)
+            except Exception as e:
+                logger.error(f"Memory summarization failed, keeping the questions only: {str(e)}")
+        asked = '; '.join(turn.query for turn in turns)
+        summary = f"{previous} Asked: {asked}." if previous else f"Asked: {asked}."
+        # Keep the most recent end when the running summary gets long
+        return summary if len(summary) <= SUMMARY_CHARS else '...' + summary[-(SUMMARY_CHARS - 3):]
+
+    def clear(self):
+        with self._lock:
+            self.summary = ''
+            self.turns = []
+            self.issues.clear()
+            self.actions.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            context = self.context()
+            return {
+                'turns': len(self.turns),
+                'summarized_turns': self.summarized_turns,
+                'summaries': self.summaries,
+                'issues': len(self.issues),
+                'followups_resolved': self.resolved,
+                'context_tokens': estimate_tokens(context) if context else 0,
+            }
@@ -0,0 +1,251 @@
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fields the context stage asks Jira for - everything else is dead weight in a prompt
+CONTEXT_FIELDS = ['summary', 'status', 'priority', 'assignee', 'issuetype', 'updated', 'description']
+DEFAULT_TOKEN_BUDGET = 3000
+DESCRIPTION_CHARS = 160
+MAX_PARALLEL_CHUNKS = 4
+# "Part N:" header and blank line around each partial answer in a reduce prompt
+PART_OVERHEAD_TOKENS = 8
+
+STOPWORDS = {
+    'a', 'about', 'all', 'an', 'and', 'any', 'are', 'at', 'be', 'by', 'can', 'do', 'does', 'for',
+    'from', 'give', 'have', 'how', 'i', 'in', 'is', 'issue', 'issues', 'it', 'jira', 'list', 'me',
+    'many', 'my', 'of', 'on', 'or', 'project', 'show', 'summarize', 'summary', 'tell', 'that',
+    'the', 'there', 'these', 'this', 'to', 'was', 'what', 'which', 'who', 'why', 'with', 'you',
+}
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    # tiktoken loads its BPE tables on import, so only pay for it when tokens are counted
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding('cl100k_base')
+        except Exception:
+            _encoding = None
+        _encoding_loaded = True
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count via tiktoken when installed, otherwise the usual ~4 chars/token estimate"""
+    _encoding = _get_encoding()
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return max(1, (len(text) + 3) // 4)
+
+
+def _value(fields, name: str, attr: str = 'name') -> Optional[str]:
+    value = fields.get(name) if isinstance(fields, dict) else getattr(fields, name, None)
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return value.get(attr)
+    if isinstance(value, str):
+        return value
+    return getattr(value, attr, None)
+
+
+def compact_issue(issue) -> str:
+    """One line per issue: KEY | status | priority | assignee | summary | description snippet"""
+    if isinstance(issue, dict):
+        key, fields = issue['key'], issue.get('fields', {})
+    else:
+        key, fields = issue.key, issue.fields
+    description = re.sub(r'\s+', ' ', _value(fields, 'description') or '').strip()
+    if len(description) > DESCRIPTION_CHARS:
+        description = description[:DESCRIPTION_CHARS - 3] + '...'
+    parts = [
+        key,
+        _value(fields, 'status') or '-',
+        _value(fields, 'priority') or '-',
+        _value(fields, 'assignee', 'displayName') or 'Unassigned',
+        _value(fields, 'summary') or '',
+    ]
+    if description:
+        parts.append(description)
+    return ' | '.join(parts)
+
+
+def question_keywords(question: str, limit: int = 4) -> List[str]:
+    """Content words from a natural-language question, for the keyword search"""
+    words = [w for w in re.findall(r'[A-Za-z0-9]+', question.lower()) if w not in STOPWORDS and len(w) > 2]
+    return list(dict.fromkeys(words))[:limit]
+
+
+@dataclass
+class ContextStats:
+    """What was sent to the LLM for one question"""
+    issues_seen: int = 0
+    issues_included: int = 0
+    chunks: int = 0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    # More issues matched than max_chunks could hold; the rest were not read
+    truncated: bool = False
+    reduce_rounds: int = 0
+    per_call_tokens: List[int] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'issues_seen': self.issues_seen,
+            'issues_included': self.issues_included,
+            'chunks': self.chunks,
+            'truncated': self.truncated,
+            'reduce_rounds': self.reduce_rounds,
+            'llm_calls': self.llm_calls,
+            'prompt_tokens': self.prompt_tokens,
+        }
+
+
+class ContextBuilder:
+    """Packs retrieved issues into token-budgeted prompts, map-reducing large sets.
+
+    ``ask`` is any prompt -> text callable (e.g. simple_jira_agent.ask_ai); the
+    optional ``stream`` (prompt -> text chunks) is used for the final answer when
+    the caller wants tokens as they arrive.
+    """
+
+    def __init__(self, ask: Callable[[str], str], token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 max_chunks: int = 8, max_parallel: int = MAX_PARALLEL_CHUNKS,
+                 stream: Optional[Callable[[str], Iterable[str]]] = None):
+        self.ask = ask
+        self.stream = stream
+        self.token_budget = token_budget
+        self.max_chunks = max_chunks
+        self.max_parallel = max_parallel
+        self.last_stats: Optional[ContextStats] = None
+        self._lock = threading.Lock()
+
+    def _prompt(self, question: str, lines: List[str]) -> str:
+        return (
+            "You are a Jira assistant. Answer using only the issues below.\n"
+            "Each line is: KEY | status | priority | assignee | summary | description.\n\n"
+            + "\n".join(lines)
+            + f"\n\nQuestion: {question}\nAnswer concisely and cite issue keys."
+        )
+
+    def _call(self, prompt: str, stats: ContextStats,
+              on_token: Optional[Callable[[str], None]] = None) -> str:
+        tokens = estimate_tokens(prompt)
+        with self._lock:
+            stats.llm_calls += 1
+            stats.prompt_tokens += tokens
+            stats.per_call_tokens.append(tokens)
+        if on_token is None or self.stream is None:
+            return self.ask(prompt)
+        parts = []
+        for chunk in self.stream(prompt):
+            on_token(chunk)
+            parts.append(chunk)
+        return ''.join(parts)
+
+    def chunk(self, lines: Iterable[str], question: str, stats: ContextStats) -> List[List[str]]:
+        """Greedily split issue lines into chunks that each fit the token budget"""
+        overhead = estimate_tokens(self._prompt(question, []))
+        chunks, current, used = [], [], overhead
+        for line in lines:
+            stats.issues_seen += 1
+            cost = estimate_tokens(line) + 1
+            if current and used + cost > self.token_budget:
+                chunks.append(current)
+                if len(chunks) == self.max_chunks:
+                    # Stop reading: the issues may be a lazy Jira stream
+                    stats.truncated = True
+                    return chunks
+                current, used = [], overhead
+            current.append(line)
+            used += cost
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def answer(self, question: str, issues: Iterable[Any],
+               on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Answer ``question`` grounded in ``issues``; returns the LLM's answer.
+
+        With ``on_token`` the final (single-chunk or reduce) call is streamed to it.
+        When more issues match than ``max_chunks`` can hold, the answer ends with a note saying so.
+        """
+        stats = ContextStats()
+        chunks = self.chunk((compact_issue(issue) for issue in issues), question, stats)
+        stats.chunks = len(chunks)
+        stats.issues_included = sum(len(c) for c in chunks)
+
+        if not chunks:
+            answer = "No matching Jira issues were found to answer that."
+        elif len(chunks) == 1:
+            answer = self._call(self._prompt(question, chunks[0]), stats, on_token)
+        else:
+            answer = self._map_reduce(question, chunks, stats, on_token)
+
+        if stats.truncated:
+            logger.warning(f"AI context: only the first {stats.issues_included} issues fit in "
+                           f"{self.max_chunks} chunks, the rest were dropped")
+            note = (f"\n\n(Only the first {stats.issues_included} matching issues were considered; "
+                    f"narrow the question to cover the rest.)")
+            if on_token:
+                on_token(note)
+            answer += note
+
+        self.last_stats = stats
+        logger.info(f"AI context: {stats.as_dict()}")
+        return answer
+
+    def _map_reduce(self, question: str, chunks: List[List[str]], stats: ContextStats,
+                    on_token: Optional[Callable[[str], None]] = None) -> str:
+        # Map: each chunk is answered independently and in parallel
+        with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix='ai-map') as pool:
+            partials = list(pool.map(lambda lines: self._call(self._prompt(question, lines), stats), chunks))
+        return self._reduce(question, partials, stats, on_token)
+
+    def _reduce_prompt(self, question: str, partials: List[str]) -> str:
+        notes = "\n\n".join(f"Part {i + 1}:\n{p}" for i, p in enumerate(partials))
+        return (
+            "Combine these partial answers about different batches of Jira issues into one answer.\n\n"
+            f"{notes}\n\nQuestion: {question}\nAnswer concisely and cite issue keys."
+        )
+
+    def _reduce(self, question: str, partials: List[str], stats: ContextStats,
+                on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Merge partial answers into one, in rounds when they do not all fit the token budget"""
+        overhead = estimate_tokens(self._reduce_prompt(question, []))
+        # Any two clipped partials fit one prompt, so every round at least halves their number
+        limit = max(1, (self.token_budget - overhead) // 2 - PART_OVERHEAD_TOKENS)
+        while True:
+            stats.reduce_rounds += 1
+            partials = [_clip(p, limit) for p in partials]
+            groups, current, used = [], [], overhead
+            for partial in partials:
+                cost = estimate_tokens(partial) + PART_OVERHEAD_TOKENS
+                if current and used + cost > self.token_budget:
+                    groups.append(current)
+                    current, used = [], overhead
+                current.append(partial)
+                used += cost
+            groups.append(current)
+            if len(groups) == 1:
+                return self._call(self._reduce_prompt(question, groups[0]), stats, on_token)
+            with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix='ai-reduce') as pool:
+                partials = list(pool.map(
+                    lambda group: self._call(self._reduce_prompt(question, group), stats) if len(group) > 1
+                    else group[0], groups))
+
+
+def _clip(text: str, tokens: int) -> str:
+    """``text`` cut down to about ``tokens`` tokens"""
+    while len(text) > 1 and estimate_tokens(text) > tokens:
+        text = text[:max(1, len(text) * tokens // estimate_tokens(text) - 1)]
+    return text
@@ -0,0 +1,77 @@
+"""Sync (thread per conversation) vs async (one event loop) tool throughput against the mock Jira.
+
+    python benchmarks/bench_async.py --requests 400 --concurrency 50 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from atlassian import Jira  # noqa: E402
+
+from mock_jira import MockJiraServer  # noqa: E402
+from jira_tools import JiraGetIssueTool, JiraSearchTool  # noqa: E402
+from jira_async import AsyncJiraClient  # noqa: E402
+from jira_http import RetryingAdapter, TokenBucket, build_session  # noqa: E402
+
+UNLIMITED = 1e9
+
+
+def run_sync(url, keys, concurrency):
+    session = build_session(RetryingAdapter(pool_size=concurrency, rate_limiter=TokenBucket(UNLIMITED)))
+    client = Jira(url=url, username='bench', password='bench', session=session)
+    get_tool = JiraGetIssueTool(client)
+    search_tool = JiraSearchTool(client)
+
+    def conversation(key):
+        get_tool._run(key)
+        search_tool._run(f'key in ({key})')
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(conversation, keys))
+    return time.perf_counter() - started
+
+
+async def run_async(url, keys, concurrency):
+    async with AsyncJiraClient(url, 'bench', 'bench', pool_size=concurrency,
+                               rate_limiter=TokenBucket(UNLIMITED)) as client:
+        get_tool = JiraGetIssueTool(None, async_client=client)
+        search_tool = JiraSearchTool(None, async_client=client)
+        limit = asyncio.Semaphore(concurrency)
+
+        async def conversation(key):
+            async with limit:
+                await get_tool._arun(key)
+                await search_tool._arun(f'key in ({key})')
+
+        started = time.perf_counter()
+        await asyncio.gather(*(conversation(key) for key in keys))
+        return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=400, help='number of conversations')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.05, help='mock Jira latency per call (s)')
+    args = parser.parse_args()
+
+    with MockJiraServer(issue_count=args.requests, latency=args.latency) as server:
+        keys = [server.state.key(i) for i in range(args.requests)]
+        calls = args.requests * 2
+        sync_seconds = run_sync(server.url, keys, args.concurrency)
+        async_seconds = asyncio.run(run_async(server.url, keys, args.concurrency))
+
+    print(f"{'mode':<8}{'seconds':>10}{'calls/s':>12}")
+    print(f"{'sync':<8}{sync_seconds:>10.2f}{calls / sync_seconds:>12.1f}")
+    print(f"{'async':<8}{async_seconds:>10.2f}{calls / async_seconds:>12.1f}")
+    print(f"speedup: {sync_seconds / async_seconds:.2f}x with {args.concurrency} concurrent conversations")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Export throughput (issues/sec) against the mock Jira, by worker count and format.
+
+    python benchmarks/bench_export.py
+    python benchmarks/bench_export.py --issues 100000 --workers 1,4,8 --jira-latency 0.05
+    python benchmarks/bench_export.py --format csv
+
+The baseline is the simple agent's loop: one sequential paginated search printed
+to stdout (here written to /dev/null). Peak RSS is reported so the bounded-memory
+claim can be checked on large projects.
+"""
+import argparse
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from atlassian import Jira  # noqa: E402
+
+from mock_jira import MockJiraServer  # noqa: E402
+from jira_export import EXPORT_FIELDS, JiraExporter  # noqa: E402
+from jira_http import RetryingAdapter, TokenBucket, build_session  # noqa: E402
+from jira_search import search_issues  # noqa: E402
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def baseline(client, jql: str) -> float:
+    started = time.perf_counter()
+    with open(os.devnull, 'w') as out:
+        for issue in search_issues(client, jql, fields=EXPORT_FIELDS):
+            print(f"{issue['key']}: {issue['fields']['summary']}", file=out)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--issues', type=int, default=20000)
+    parser.add_argument('--workers', default='1,4,8', help='comma separated worker counts')
+    parser.add_argument('--format', default='auto', choices=['auto', 'parquet', 'csv'])
+    parser.add_argument('--jira-latency', type=float, default=0.02, help='mock seconds per request')
+    args = parser.parse_args()
+
+    with MockJiraServer(issue_count=args.issues, latency=args.jira_latency) as server:
+        session = build_session(RetryingAdapter(rate_limiter=TokenBucket(1e9)))
+        client = Jira(url=server.url, username='bench', password='bench', session=session)
+        jql = 'project = MOCK ORDER BY created ASC'
+
+        seconds = baseline(client, jql)
+        print(f"{'mode':<16}{'issues/s':>10}{'seconds':>9}{'pages':>7}{'peak RSS MB':>13}")
+        print(f"{'search loop':<16}{args.issues / seconds:>10.0f}{seconds:>9.1f}{'':>7}{peak_rss_mb():>13.0f}")
+        for workers in [int(w) for w in args.workers.split(',')]:
+            out_dir = tempfile.mkdtemp(prefix='jira-export-')
+            try:
+                stats = JiraExporter(client, jql, out_dir, fmt=args.format, workers=workers).run()
+            finally:
+                shutil.rmtree(out_dir, ignore_errors=True)
+            print(f"{f'export x{workers} ' + stats['format']:<16}{stats['issues_per_second']:>10.0f}"
+                  f"{stats['seconds']:>9.1f}{stats['pages']:>7}{peak_rss_mb():>13.0f}")
+
+
+if __name__ == '__main__':
+    main()
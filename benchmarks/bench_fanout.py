@@ -0,0 +1,98 @@
+"""Latency of N-issue questions ("compare MOCK-1, MOCK-2 and MOCK-3") by agent strategy (mock Jira + mock Ollama).
+
+    python benchmarks/bench_fanout.py
+    python benchmarks/bench_fanout.py --sizes 1,4,16 --jira-latency 0.05 --llm-latency 0.3
+
+"sequential" is how the ReAct agent answered before: one jira_get_issue per
+iteration, so every issue costs an LLM round trip. "get_issues" fetches all keys
+with one `key in (...)` search; "parallel" dispatches the per-key lookups in
+jira_parallel steps of up to 8 calls. Every mode gets enough iterations to
+finish, so the numbers compare strategies rather than cut-offs. Reports wall
+time, LLM calls and Jira requests per question (the first row of each mode also
+pays for the agent's connection check).
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from mock_jira import MockJiraServer  # noqa: E402
+from mock_ollama import MockOllamaServer  # noqa: E402
+
+KEY = re.compile(r'\b[A-Z][A-Z0-9_]+-\d+\b')
+MODES = ('sequential', 'get_issues', 'parallel')
+
+
+def fanout_responder(mode: str):
+    """A ReAct model that fetches the question's issues one per step, in one batch or in parallel steps"""
+    def respond(prompt: str) -> str:
+        question, _, scratchpad = prompt.rpartition('Question:')[2].partition('\n')
+        keys = list(dict.fromkeys(KEY.findall(question)))
+        if mode == 'sequential':
+            pending = [key for key in keys if f'Action Input: {key}' not in scratchpad]
+            if pending:
+                return f' I still need {pending[0]}\nAction: jira_get_issue\nAction Input: {pending[0]}'
+        elif mode == 'get_issues':
+            if 'Observation:' not in scratchpad:
+                return f" I can fetch them together\nAction: jira_get_issues\nAction Input: {', '.join(keys)}"
+        else:
+            # jira_parallel runs a bounded number of calls per step and names the ones it skipped
+            pending = [key for key in keys if f'jira_get_issue {key}:' not in scratchpad]
+            if pending:
+                calls = json.dumps([{'tool': 'jira_get_issue', 'input': key} for key in pending])
+                return f' These lookups are independent\nAction: jira_parallel\nAction Input: {calls}'
+        return ' I now know the final answer\nFinal Answer: Compared the issues above.'
+    return respond
+
+
+def question(count: int, offset: int) -> str:
+    keys = [f'MOCK-{offset + i}' for i in range(1, count + 1)]
+    listed = keys[0] if count == 1 else f"{', '.join(keys[:-1])} and {keys[-1]}"
+    return f'Compare {listed}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1,2,4,8,16', help='comma separated issue counts')
+    parser.add_argument('--jira-latency', type=float, default=0.05, help='mock seconds per Jira request')
+    parser.add_argument('--llm-latency', type=float, default=0.2, help='mock seconds per LLM call')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    with MockJiraServer(issue_count=10000, latency=args.jira_latency) as jira:
+        os.environ.update({'JIRA_URL': jira.url, 'JIRA_USERNAME': 'bench', 'JIRA_API_TOKEN': 'bench',
+                           'LLM_PROVIDER': 'ollama', 'OLLAMA_MODEL': 'mock:latest',
+                           'JIRA_METADATA_PATH': '', 'JIRA_RATE_LIMIT': '1000000'})
+        from jira_agent import JiraAgent, JiraConfig
+
+        print(f"{'mode':<12}{'issues':>8}{'seconds':>9}{'LLM calls':>11}{'Jira requests':>15}")
+        offset = 0
+        for mode in MODES:
+            with MockOllamaServer(first_token_latency=args.llm_latency, token_latency=0.0,
+                                  responder=fanout_responder(mode)) as llm:
+                os.environ['OLLAMA_URL'] = llm.url
+                config = JiraConfig()
+                config.memory_tokens = 0
+                config.max_iterations = max(sizes) + 2
+                agent = JiraAgent(config=config, use_router=False, verbose=False, trace=False)
+                for count in sizes:
+                    # Fresh keys every run so the issue cache never answers
+                    text = question(count, offset)
+                    offset += count
+                    llm_calls, jira_calls = llm.request_count, jira.request_count
+                    started = time.perf_counter()
+                    agent.run(text)
+                    seconds = time.perf_counter() - started
+                    print(f"{mode:<12}{count:>8}{seconds:>9.2f}{llm.request_count - llm_calls:>11}"
+                          f"{jira.request_count - jira_calls:>15}")
+                agent.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Memory per 10k issues and tokens per LLM observation: raw REST dicts + pretty JSON vs the issue model.
+
+    python benchmarks/bench_issue_model.py
+    python benchmarks/bench_issue_model.py --issues 100000 --page 50
+
+Issues come from the mock Jira's synthetic data, padded with the ``self``/avatar/
+statusCategory noise a real REST payload carries, so the raw-dict figures are
+closer to what the tools actually hold than the bare mock fields would be.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from ai_context import estimate_tokens  # noqa: E402
+from issue_model import IssueDetail, IssueSummary, loads, orjson, summary_table  # noqa: E402
+from mock_jira import MockJiraState  # noqa: E402
+
+BASE = 'https://example.atlassian.net/rest/api/2'
+
+
+def _user(name):
+    if not name:
+        return None
+    return {'self': f'{BASE}/user?accountId={name}', 'accountId': name.replace(' ', '').lower(),
+            'displayName': name, 'active': True, 'timeZone': 'UTC',
+            'avatarUrls': {size: f'https://avatar.example/{name}/{size}' for size in ('48x48', '24x24', '16x16', '32x32')}}
+
+
+def rest_issue(state, index):
+    """A synthetic issue shaped like a real /search response entry"""
+    issue = state.issue(index)
+    fields = issue['fields']
+    fields['status'].update({'self': f'{BASE}/status/1', 'id': '1', 'iconUrl': f'{BASE}/status.png',
+                             'statusCategory': {'self': f'{BASE}/statuscategory/2', 'id': 2, 'key': 'new',
+                                                'colorName': 'blue-gray', 'name': 'To Do'}})
+    fields['priority'].update({'self': f'{BASE}/priority/3', 'id': '3', 'iconUrl': f'{BASE}/priority.svg'})
+    fields['issuetype'].update({'self': f'{BASE}/issuetype/1', 'id': '1', 'subtask': False})
+    fields['assignee'] = _user(fields['assignee'] and fields['assignee']['displayName'])
+    fields['reporter'] = _user(fields['reporter']['displayName'])
+    issue.update({'expand': 'operations,versionedRepresentations,editmeta,changelog,renderedFields',
+                  'self': f"{BASE}/issue/{issue['id']}"})
+    return issue
+
+
+def payload(state, count):
+    return json.dumps({'issues': [rest_issue(state, i) for i in range(count)]}).encode('utf-8')
+
+
+def retained_bytes(build):
+    """Bytes still allocated once ``build()`` returns (the result is kept alive)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def old_search(issues, total):
+    # The pre-model JiraSearchTool._format_results
+    rows = [{'key': i['key'], 'summary': i['fields']['summary'], 'status': i['fields']['status']['name'],
+             'assignee': i['fields']['assignee']['displayName'] if i['fields']['assignee'] else 'Unassigned',
+             'priority': i['fields']['priority']['name'] if i['fields']['priority'] else 'None'} for i in issues]
+    return json.dumps(rows, indent=2) + f"\n\n(Showing {len(rows)} of {total} matching issues)"
+
+
+def old_detail(issue):
+    # The pre-model JiraGetIssueTool._format_issue
+    f = issue['fields']
+    return json.dumps({
+        'key': issue['key'], 'summary': f['summary'], 'description': f.get('description') or 'No description',
+        'status': f['status']['name'],
+        'assignee': f['assignee']['displayName'] if f['assignee'] else 'Unassigned',
+        'reporter': f['reporter']['displayName'] if f['reporter'] else 'Unknown',
+        'priority': f['priority']['name'] if f['priority'] else 'None',
+        'created': f['created'], 'updated': f['updated'], 'issue_type': f['issuetype']['name'],
+    }, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--issues', type=int, default=10000)
+    parser.add_argument('--page', type=int, default=50, help='issues per search observation')
+    args = parser.parse_args()
+
+    state = MockJiraState(args.issues)
+    body = payload(state, args.issues)
+    per_10k = 10000 / args.issues
+
+    def raw_dicts():
+        return json.loads(body)['issues']
+
+    def summaries():
+        return [IssueSummary.from_raw(i) for i in loads(body)['issues']]
+
+    def details():
+        return [IssueDetail.from_raw(i) for i in loads(body)['issues']]
+
+    print(f"payload: {len(body) / 1e6:.1f} MB for {args.issues} issues (parser: {'orjson' if orjson else 'json'})")
+    print(f"{'held in memory':<22}{'MB per 10k':>12}")
+    for name, build in (('raw REST dicts', raw_dicts), ('IssueDetail', details), ('IssueSummary', summaries)):
+        print(f"{name:<22}{retained_bytes(build) * per_10k / 1e6:>12.2f}")
+
+    for name, parse in (('json.loads', json.loads), ('issue_model.loads', loads)):
+        started = time.perf_counter()
+        parse(body)
+        print(f"{name:<22}{(time.perf_counter() - started) * 1000:>9.0f} ms parse")
+
+    issues = raw_dicts()
+    page = issues[:args.page]
+    old_page = old_search(page, args.issues)
+    new_page = summary_table(IssueSummary.from_raw(i) for i in page) + \
+        f"\n\n(Showing {len(page)} of {args.issues} matching issues)"
+    old_tokens = sum(estimate_tokens(old_detail(i)) for i in page) / len(page)
+    new_tokens = sum(estimate_tokens(IssueDetail.from_raw(i).text()) for i in page) / len(page)
+
+    print(f"\n{'observation':<22}{'before':>10}{'after':>10}{'saved':>8}")
+    for name, before, after in ((f'search ({len(page)} hits)', estimate_tokens(old_page), estimate_tokens(new_page)),
+                                ('get issue (mean)', old_tokens, new_tokens)):
+        print(f"{name:<22}{before:>10.0f}{after:>10.0f}{1 - after / before:>8.0%}")
+
+
+if __name__ == '__main__':
+    main()
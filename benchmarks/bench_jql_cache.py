@@ -0,0 +1,99 @@
+"""Repeated searches with and without the JQL result cache, and streaming a large project (mock Jira).
+
+    python benchmarks/bench_jql_cache.py
+    python benchmarks/bench_jql_cache.py --searches 500 --issues 50000 --jira-latency 0.05
+
+The workload repeats a small set of queries in different spellings ("project=MOCK
+and text ~ ..." vs "project = MOCK AND text ~ ..."), the way an agent re-issues
+the same search across turns; a write every ``--write-every`` searches clears the
+cache. Reports Jira requests, wall time and hit rate. The second table compares
+a plain paged search of a huge project with the menu's ResultStream, which must
+not add requests (the total comes from the first page), and an empty search
+repeated once its zero count is cached.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from atlassian import Jira  # noqa: E402
+
+from mock_jira import WORDS, MockJiraServer  # noqa: E402
+from jira_http import RetryingAdapter, TokenBucket, build_session  # noqa: E402
+from jira_search import SUMMARY_FIELDS, search_issues  # noqa: E402
+from jql_cache import JqlResultCache, text_search  # noqa: E402
+
+
+def workload(searches: int, seed: int = 3):
+    """Queries drawn from a skewed distribution, each in one of several spellings"""
+    rng = random.Random(seed)
+    topics = WORDS[:12]
+    for _ in range(searches):
+        word = topics[min(int(rng.expovariate(0.4)), len(topics) - 1)]
+        yield rng.choice([
+            text_search(word, project='MOCK'),
+            f'project=MOCK and text ~ "{word}" order by created desc',
+            f'project =  MOCK  AND text ~ "{word}"  ORDER BY created DESC',
+        ])
+
+
+def run(client, server, queries, cache, write_every: int, limit: int):
+    first = server.request_count
+    started = time.perf_counter()
+    for i, jql in enumerate(queries, 1):
+        if cache:
+            cache.search(client, jql, limit=limit)
+            if write_every and i % write_every == 0:
+                cache.clear()
+        else:
+            list(search_issues(client, jql, fields=SUMMARY_FIELDS, limit=limit))
+    return server.request_count - first, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--searches', type=int, default=300)
+    parser.add_argument('--issues', type=int, default=20000)
+    parser.add_argument('--limit', type=int, default=50, help='rows per search (JiraSearchTool uses 50)')
+    parser.add_argument('--write-every', type=int, default=50, help='clear the cache every N searches (0: never)')
+    parser.add_argument('--jira-latency', type=float, default=0.02, help='mock seconds per request')
+    args = parser.parse_args()
+
+    with MockJiraServer(issue_count=args.issues, latency=args.jira_latency) as server:
+        session = build_session(RetryingAdapter(rate_limiter=TokenBucket(1e9)))
+        client = Jira(url=server.url, username='bench', password='bench', session=session)
+        queries = list(workload(args.searches))
+
+        print(f"{args.searches} searches, {len(set(queries))} distinct spellings")
+        print(f"{'mode':<12}{'requests':>10}{'seconds':>9}{'hit rate':>10}")
+        requests, seconds = run(client, server, queries, None, args.write_every, args.limit)
+        print(f"{'no cache':<12}{requests:>10}{seconds:>9.2f}{'':>10}")
+        cache = JqlResultCache()
+        requests, seconds = run(client, server, queries, cache, args.write_every, args.limit)
+        print(f"{'cache':<12}{requests:>10}{seconds:>9.2f}{cache.stats()['hit_rate']:>10.2f}")
+        print(f"cache: {cache.stats()}")
+
+        jql = 'project = MOCK ORDER BY created DESC'
+        print(f"\nprinting '{jql}' ({args.issues} issues)")
+        print(f"{'mode':<12}{'requests':>10}{'seconds':>9}{'rows':>8}")
+        first, started = server.request_count, time.perf_counter()
+        rows = sum(1 for _ in search_issues(client, jql, fields=['summary']))
+        print(f"{'all pages':<12}{server.request_count - first:>10}{time.perf_counter() - started:>9.2f}{rows:>8}")
+        cache = JqlResultCache()
+        first, started = server.request_count, time.perf_counter()
+        rows = sum(1 for _ in cache.stream(client, jql))
+        print(f"{'stream':<12}{server.request_count - first:>10}{time.perf_counter() - started:>9.2f}{rows:>8}")
+        empty = text_search('no such words', project='MOCK')
+        for label in ('empty', 'empty again'):
+            first, started = server.request_count, time.perf_counter()
+            rows = sum(1 for _ in cache.stream(client, empty))
+            print(f"{label:<12}{server.request_count - first:>10}{time.perf_counter() - started:>9.2f}{rows:>8}")
+
+
+if __name__ == '__main__':
+    main()
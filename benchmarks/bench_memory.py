@@ -0,0 +1,109 @@
+"""Scripted multi-turn sessions with and without conversation memory (mock Jira + mock Ollama).
+
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --sessions 10 --memory-tokens 400
+
+Each session searches for a topic and then asks follow-ups that only make sense
+with the earlier turns ("which of those are still open?", "assign it to Ada").
+The mock LLM behaves like a model that reads the memory block: it answers from
+remembered issue lines when it can and calls a tool otherwise. Reports tool
+calls, LLM calls and prompt tokens per session, and how large the memory block
+stays once older sessions are summarized.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from mock_jira import WORDS, MockJiraServer  # noqa: E402
+from mock_ollama import MockOllamaServer  # noqa: E402
+from ai_context import estimate_tokens  # noqa: E402
+from agent_memory import MEMORY_HEADER  # noqa: E402
+from instrumentation import instrumentation  # noqa: E402
+
+KEY = re.compile(r'\b[A-Z][A-Z0-9_]+-\d+\b')
+FACT = re.compile(r'\b(status|open|priority|who|assignee)\b', re.IGNORECASE)
+WRITE = re.compile(r'\bassign\b.*\bto\s+(.+?)[.?!]*$', re.IGNORECASE)
+
+
+def script(topic: str):
+    return [
+        f'Find issues about {topic}',
+        'Which of those are still open?',
+        'Show me the details of it',
+        'What is the status of that one?',
+        'Assign it to Ada Lovelace',
+    ]
+
+
+def session_responder(prompt: str) -> str:
+    """A ReAct model that uses the memory block before reaching for a tool"""
+    if prompt.startswith('Condense this Jira assistant conversation'):
+        return 'Discussed ' + ', '.join(sorted(set(KEY.findall(prompt)))[:8]) + '.'
+    question, _, rest = prompt.rpartition('Question:')[2].partition('\n')
+    memory, _, scratchpad = rest.partition('\nThought:')
+    if 'Observation:' in scratchpad:
+        return ' I now know the final answer\nFinal Answer: Done, see the tool output above.'
+    remembered = MEMORY_HEADER in memory
+    key = KEY.search(question)
+    write = WRITE.search(question)
+    if key and write:
+        update = json.dumps({'issue_key': key.group(0), 'assignee': write.group(1)})
+        return f' I should update the issue\nAction: jira_update_issue\nAction Input: {update}'
+    if FACT.search(question) and remembered and (key is None or key.group(0) in memory):
+        return ' The memory already has this\nFinal Answer: Answered from the issues seen earlier.'
+    if key:
+        return f' I should look up the issue\nAction: jira_get_issue\nAction Input: {key.group(0)}'
+    topic = re.search(r'\babout\s+(.+?)[?.!]*$', question)
+    return f' I should search Jira\nAction: jira_search\nAction Input: {topic.group(1) if topic else question.strip()}'
+
+
+def tool_calls() -> int:
+    return sum(row['count'] for name, row in instrumentation.snapshot().items() if name.startswith('tool '))
+
+
+def run_sessions(agent, llm, sessions: int):
+    first_prompt = len(llm.prompts)
+    instrumentation.reset()
+    for i in range(1, sessions + 1):
+        # Word pairs the mock's summaries actually contain
+        for question in script(f'{WORDS[i % len(WORDS)]} {WORDS[(i * 7) % len(WORDS)]}'):
+            agent.run(question)
+    prompts = llm.prompts[first_prompt:]
+    return tool_calls(), len(prompts), sum(estimate_tokens(p) for p in prompts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=5, help='scripted sessions in one conversation')
+    parser.add_argument('--memory-tokens', type=int, default=600, help='summarize past this many tokens')
+    args = parser.parse_args()
+
+    with MockJiraServer(issue_count=2000) as jira, \
+            MockOllamaServer(first_token_latency=0.0, token_latency=0.0, responder=session_responder) as llm:
+        os.environ.update({'JIRA_URL': jira.url, 'JIRA_USERNAME': 'bench', 'JIRA_API_TOKEN': 'bench',
+                           'LLM_PROVIDER': 'ollama', 'OLLAMA_URL': llm.url, 'OLLAMA_MODEL': 'mock:latest',
+                           'JIRA_METADATA_PATH': '', 'JIRA_RATE_LIMIT': '1000000'})
+        from jira_agent import JiraAgent, JiraConfig
+
+        turns = args.sessions * len(script(''))
+        print(f"{args.sessions} sessions, {turns} turns")
+        print(f"{'mode':<10}{'tool calls':>12}{'LLM calls':>11}{'prompt tokens':>15}{'tokens/turn':>13}")
+        for mode, budget in (('stateless', 0), ('memory', args.memory_tokens)):
+            config = JiraConfig()
+            config.memory_tokens = budget
+            agent = JiraAgent(config=config, verbose=False, trace=False)
+            tools, calls, tokens = run_sessions(agent, llm, args.sessions)
+            print(f"{mode:<10}{tools:>12}{calls:>11}{tokens:>15}{tokens / turns:>13.0f}")
+            if agent.memory:
+                print(f"memory: {agent.memory.stats()}")
+            agent.close()
+
+
+if __name__ == '__main__':
+    main()
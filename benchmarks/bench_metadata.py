@@ -0,0 +1,89 @@
+"""Round trips saved by the metadata cache (projects, create validation, transitions).
+
+    python benchmarks/bench_metadata.py --operations 200 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from atlassian import Jira  # noqa: E402
+
+from mock_jira import MockJiraServer  # noqa: E402
+from jira_http import RetryingAdapter, TokenBucket, build_session  # noqa: E402
+from jira_metadata import JiraMetadata  # noqa: E402
+
+
+def workload(server, operations):
+    """(kind, argument) mix: list projects, validate a create, look up a transition"""
+    ops = []
+    for i in range(operations):
+        kind = ('projects', 'create', 'transition')[i % 3]
+        ops.append((kind, server.state.key(i % server.state.issue_count)))
+    return ops
+
+
+def run_uncached(client, ops):
+    for kind, key in ops:
+        if kind == 'projects':
+            client.get('rest/api/2/project')
+        elif kind == 'create':
+            # Without local validation a typo is only discovered by the server
+            client.get('rest/api/2/priority')
+        else:
+            client.get_issue_transitions(key)
+
+
+def run_cached(metadata, client, ops, project):
+    for kind, key in ops:
+        if kind == 'projects':
+            metadata.projects()
+        elif kind == 'create':
+            metadata.resolve_fields({'project': {'key': project.lower()}, 'issuetype': {'name': 'bug'},
+                                     'priority': {'name': 'high'}, 'assignee': {'name': 'Grace Hopper'}})
+        else:
+            metadata.transition_id(client, key, 'Done', (project, 'Bug', 'To Do'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--operations', type=int, default=300)
+    parser.add_argument('--latency', type=float, default=0.05, help='mock Jira latency per call (s)')
+    args = parser.parse_args()
+
+    snapshot = os.path.join(tempfile.mkdtemp(), 'metadata.json')
+    with MockJiraServer(issue_count=100, latency=args.latency) as server:
+        session = build_session(RetryingAdapter(rate_limiter=TokenBucket(1e9)))
+        client = Jira(url=server.url, username='bench', password='bench', session=session)
+        ops = workload(server, args.operations)
+
+        before, started = server.request_count, time.perf_counter()
+        run_uncached(client, ops)
+        uncached = (time.perf_counter() - started, server.request_count - before)
+
+        before, started = server.request_count, time.perf_counter()
+        cold = JiraMetadata(client, snapshot)
+        cold.refresh()
+        cold_load = time.perf_counter() - started
+        run_cached(cold, client, ops, server.state.project)
+        cold.save_snapshot()
+        cached = (time.perf_counter() - started, server.request_count - before)
+
+        before, started = server.request_count, time.perf_counter()
+        warm = JiraMetadata(client, snapshot)
+        warm_load = time.perf_counter() - started
+        run_cached(warm, client, ops, server.state.project)
+        warmed = (time.perf_counter() - started, server.request_count - before)
+
+    print(f"{'mode':<12}{'seconds':>10}{'requests':>10}")
+    print(f"{'uncached':<12}{uncached[0]:>10.2f}{uncached[1]:>10}")
+    print(f"{'cold cache':<12}{cached[0]:>10.2f}{cached[1]:>10}   (load {cold_load * 1000:.0f} ms)")
+    print(f"{'warm start':<12}{warmed[0]:>10.2f}{warmed[1]:>10}   (snapshot {warm_load * 1000:.1f} ms)")
+    print(f"stats: {cold.stats()}")
+
+
+if __name__ == '__main__':
+    main()
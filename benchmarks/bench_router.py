@@ -0,0 +1,129 @@
+"""Intent router precision/recall on the labeled corpus, and the LLM latency it saves.
+
+    python benchmarks/bench_router.py                      # corpus + estimated savings
+    python benchmarks/bench_router.py --live --latency 0.5 # real JiraAgent vs mock Jira + mock Ollama
+
+``router_corpus.jsonl`` holds one ``{"text", "intent", "tool_input"}`` per line; an
+``intent`` of null means the input must fall through to the LLM agent.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from intent_router import IntentRouter  # noqa: E402
+
+CORPUS = os.path.join(HERE, 'router_corpus.jsonl')
+
+
+def load_corpus(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate(router, corpus):
+    """Confusion counts; a route is only correct if intent *and* tool input match"""
+    correct, wrong, missed, mistakes = 0, 0, 0, []
+    for case in corpus:
+        route = router.route(case['text'])
+        if route is None:
+            if case['intent']:
+                missed += 1
+                mistakes.append(('missed', case['text'], case['intent'], None))
+            continue
+        if route.intent == case['intent'] and route.tool_input == case['tool_input']:
+            correct += 1
+        else:
+            wrong += 1
+            mistakes.append(('wrong', case['text'], case['intent'], f'{route.intent}: {route.tool_input}'))
+    routable = sum(1 for case in corpus if case['intent'])
+    return {
+        'cases': len(corpus),
+        'routable': routable,
+        'routed': correct + wrong,
+        'precision': correct / (correct + wrong) if correct + wrong else 1.0,
+        'recall': correct / routable if routable else 1.0,
+        'mistakes': mistakes,
+    }
+
+
+def router_overhead_us(router, corpus, repeat):
+    """Median router cost per input, in microseconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for case in corpus:
+            router.route(case['text'])
+        samples.append((time.perf_counter() - started) / len(corpus) * 1e6)
+    return statistics.median(samples)
+
+
+def run_live(corpus, latency):
+    """Time JiraAgent.run per routed input with and without the router"""
+    from mock_jira import MockJiraServer
+    from mock_ollama import MockOllamaServer
+    from jira_http import RetryingAdapter, TokenBucket, build_session
+
+    with MockJiraServer(issue_count=200, project='MFLP') as jira, \
+            MockOllamaServer(first_token_latency=latency) as ollama:
+        os.environ.update({'JIRA_URL': jira.url, 'JIRA_USERNAME': 'bench', 'JIRA_API_TOKEN': 'bench',
+                           'LLM_PROVIDER': 'ollama', 'OLLAMA_URL': ollama.url, 'OLLAMA_MODEL': 'mock:latest'})
+        os.environ.pop('JIRA_MIRROR_DB', None)
+        from jira_agent import JiraAgent
+
+        session = build_session(RetryingAdapter(rate_limiter=TokenBucket(1e9)))
+        routed_cases = [case['text'] for case in corpus if case['intent']]
+        results = {}
+        for label, use_router in (('agent', False), ('router', True)):
+            agent = JiraAgent(session=session, use_router=use_router)
+            llm_before = ollama.request_count
+            started = time.perf_counter()
+            for text in routed_cases:
+                agent.run(text)
+            results[label] = ((time.perf_counter() - started) / len(routed_cases), ollama.request_count - llm_before)
+        return results, len(routed_cases)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', default=CORPUS)
+    parser.add_argument('--repeat', type=int, default=200, help='router timing repetitions')
+    parser.add_argument('--llm-latency', type=float, default=1.5, help='seconds per LLM call for the estimate')
+    parser.add_argument('--agent-calls', type=int, default=2,
+                        help='LLM calls a ReAct run needs for one tool use (action + final answer)')
+    parser.add_argument('--live', action='store_true', help='also run JiraAgent against the mock servers')
+    parser.add_argument('--latency', type=float, default=0.5, help='mock LLM first-token latency for --live')
+    parser.add_argument('--min-precision', type=float, default=1.0, help='exit non-zero below this precision')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    result = evaluate(IntentRouter(), corpus)
+    overhead = router_overhead_us(IntentRouter(), corpus, args.repeat)
+
+    print(f"cases: {result['cases']}  routable: {result['routable']}  routed: {result['routed']}")
+    print(f"precision: {result['precision']:.3f}  recall: {result['recall']:.3f}")
+    for kind, text, expected, got in result['mistakes']:
+        print(f"  {kind:<7} {text!r} expected={expected} got={got}")
+    saved = args.agent_calls * args.llm_latency
+    print(f"router overhead: {overhead:.1f} us/input")
+    print(f"estimated saving: {saved:.2f}s per routed input "
+          f"({args.agent_calls} LLM calls x {args.llm_latency}s), "
+          f"{saved * result['routed']:.1f}s over this corpus")
+
+    if args.live:
+        timings, count = run_live(corpus, args.latency)
+        print(f"\n{'mode':<8}{'s/input':>10}{'LLM calls':>12}   ({count} routable inputs)")
+        for label, (seconds, calls) in timings.items():
+            print(f"{label:<8}{seconds:>10.3f}{calls:>12}")
+
+    if result['precision'] < args.min_precision:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
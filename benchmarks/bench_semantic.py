@@ -0,0 +1,161 @@
+"""Plain-language search quality and latency: keyword match vs embedding index vs hybrid.
+
+    python benchmarks/bench_semantic.py                                  # 100k issues, hashing embedder
+    python benchmarks/bench_semantic.py --issues 20000 --ann             # plus HNSW (needs hnswlib)
+    python benchmarks/bench_semantic.py --embedder sentence-transformers:all-MiniLM-L6-v2
+
+The corpus is synthetic: every issue belongs to one topic (login, performance,
+payments, ...) and the queries paraphrase a topic without reusing its wording,
+like a user who does not know how the reporter phrased the bug. precision@10 is
+the share of the top 10 hits that are on the query's topic. "keyword" stands in
+for `text ~` / the mirror's FTS (all query words must appear, newest first).
+ANN recall@10 is measured against the exact NumPy search.
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from issue_model import IssueSummary  # noqa: E402
+from semantic_index import SemanticIndex, make_embedder  # noqa: E402
+
+# topic -> (phrases reporters use, paraphrased queries)
+TOPICS = {
+    'auth': (['Users cannot log in after password reset', 'Login fails with invalid token error',
+              'SSO sign-in redirects in a loop', 'Session expires right after login'],
+             ['unable to sign in', 'authentication broken after resetting password']),
+    'performance': (['Dashboard loads slowly', 'Search latency above five seconds',
+                     'Report generation times out', 'API responses are slow under load'],
+                    ['slow page performance', 'requests timing out']),
+    'payments': (['Payment declined for valid cards', 'Checkout charges the customer twice',
+                  'Refund never issued to customer', 'Invoice total is wrong'],
+                 ['customers billed twice', 'refunds failing']),
+    'export': (['CSV export missing columns', 'Excel download is corrupt',
+                'Export job never finishes', 'PDF report has blank pages'],
+               ['downloaded spreadsheet broken', 'exporting data fails']),
+    'mobile': (['App crashes on Android startup', 'iOS app freezes during upload',
+                'Push notifications not delivered', 'Mobile layout broken on small screens'],
+               ['phone app crashing', 'notifications missing on phones']),
+    'email': (['Password reset email not sent', 'Email notifications delayed by hours',
+               'Emails land in spam', 'Digest email has broken links'],
+              ['mails not arriving', 'notification emails late']),
+}
+COMPONENTS = ['web', 'backend', 'gateway', 'worker', 'admin console', 'public api', 'scheduler']
+CONTEXTS = ['on the staging cluster', 'for enterprise tenants', 'since the last release',
+            'for some users in Europe', 'intermittently during peak hours']
+
+
+def corpus(count: int, seed: int = 7):
+    """(raw issue, topic) pairs, newest last"""
+    rng = random.Random(seed)
+    names = list(TOPICS)
+    for i in range(count):
+        topic = names[i % len(names)]
+        phrases = TOPICS[topic][0]
+        raw = {'key': f'SYN-{i + 1}', 'fields': {
+            'summary': f'{rng.choice(phrases)} ({rng.choice(COMPONENTS)})',
+            'description': f'{rng.choice(phrases)} {rng.choice(CONTEXTS)}. Seen in build {rng.randrange(1000)}.',
+            'status': {'name': 'To Do'}, 'priority': {'name': 'Medium'}, 'assignee': None,
+        }}
+        yield raw, topic
+
+
+class KeywordIndex:
+    """AND-of-words matching, newest first: roughly what `text ~` and FTS return"""
+
+    def __init__(self):
+        self.postings = {}
+        self.keys = []
+
+    def add(self, raw):
+        row = len(self.keys)
+        self.keys.append(raw['key'])
+        fields = raw['fields']
+        for word in set(re.findall(r'[a-z0-9]+', f"{fields['summary']} {fields['description']}".lower())):
+            self.postings.setdefault(word, []).append(row)
+
+    def search(self, query: str, k: int):
+        words = re.findall(r'[a-z0-9]+', query.lower())
+        rows = set(self.postings.get(words[0], [])) if words else set()
+        for word in words[1:]:
+            rows &= set(self.postings.get(word, []))
+        return [self.keys[row] for row in sorted(rows, reverse=True)[:k]]
+
+
+def percentile(values, q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+def build(args, issues, use_ann: bool):
+    index = SemanticIndex(make_embedder(args.embedder), use_ann=use_ann)
+    started = time.perf_counter()
+    index.upsert(raw for raw, _ in issues)
+    return index, time.perf_counter() - started
+
+
+def evaluate(name, search, queries, topic_of, k):
+    precision, latencies, results = [], [], {}
+    for query, topic in queries:
+        started = time.perf_counter()
+        keys = search(query, k)
+        latencies.append(time.perf_counter() - started)
+        results[query] = keys
+        precision.append(sum(1 for key in keys if topic_of[key] == topic) / k)
+    print(f"{name:<14}{statistics.mean(precision):>14.2f}{percentile(latencies, 50) * 1000:>10.2f}"
+          f"{percentile(latencies, 95) * 1000:>10.2f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--issues', type=int, default=100000)
+    parser.add_argument('--embedder', default='hashing', help='hashing, sentence-transformers:<model> or ollama:<model>')
+    parser.add_argument('--ann', action='store_true', help='also build an HNSW index (needs hnswlib)')
+    parser.add_argument('--repeat', type=int, default=5, help='passes over the query set')
+    parser.add_argument('-k', type=int, default=10)
+    args = parser.parse_args()
+
+    issues = list(corpus(args.issues))
+    topic_of = {raw['key']: topic for raw, topic in issues}
+    queries = [(query, topic) for topic, (_, paraphrases) in TOPICS.items() for query in paraphrases] * args.repeat
+
+    keyword = KeywordIndex()
+    for raw, _ in issues:
+        keyword.add(raw)
+    exact, seconds = build(args, issues, use_ann=False)
+    print(f"{args.issues} issues embedded in {seconds:.1f}s ({args.issues / seconds:,.0f}/s); "
+          f"index {exact.stats()}")
+
+    def semantic(query, k):
+        return [key for key, _ in exact.search(query, k)]
+
+    def hybrid(query, k):
+        lexical = [IssueSummary(key, '', '', '', '') for key in keyword.search(query, k)]
+        return [issue.key for issue in exact.hybrid(query, lexical, k)]
+
+    print(f"{'method':<14}{'precision@10':>14}{'p50 ms':>10}{'p95 ms':>10}")
+    evaluate('keyword', keyword.search, queries, topic_of, args.k)
+    truth = evaluate('semantic', semantic, queries, topic_of, args.k)
+    evaluate('hybrid', hybrid, queries, topic_of, args.k)
+
+    if args.ann:
+        ann, seconds = build(args, issues, use_ann=True)
+        if not ann.stats()['ann']:
+            print("hnswlib is not installed; skipping the ANN run")
+            return
+        print(f"HNSW build {seconds:.1f}s")
+        found = evaluate('semantic+hnsw', lambda q, k: [key for key, _ in ann.search(q, k)], queries, topic_of, args.k)
+        recall = statistics.mean(len(set(found[q]) & set(truth[q])) / args.k for q, _ in queries)
+        print(f"ANN recall@{args.k} vs exact: {recall:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""Load test for jira_server.py against the mock Jira and mock Ollama, for sizing instances.
+
+    python benchmarks/bench_server.py                                   # 8 workers, 20 users
+    python benchmarks/bench_server.py --workers 4,8,16 --queue 16 --clients 64 --duration 20
+    python benchmarks/bench_server.py --mix get=5,search=3,run=2 --llm-latency 0.5
+
+Each client thread logs in as one of ``--users`` distinct users and loops over the
+request mix for ``--duration`` seconds. Per worker count it reports throughput,
+p50/p95 per endpoint, 503 rejections (backpressure) and the server's own counters.
+"""
+import argparse
+import base64
+import http.client
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import quote, urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from mock_jira import MockJiraServer  # noqa: E402
+from mock_ollama import MockOllamaServer, react_responder  # noqa: E402
+
+
+def parse_mix(text: str):
+    weights = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        weights[name.strip()] = int(weight or 1)
+    return [name for name, weight in weights.items() for _ in range(weight)]
+
+
+def request(base: str, user: str, endpoint: str, key: str, project: str):
+    """One request; returns (status, seconds), reading streamed bodies to the end"""
+    host = urlsplit(base)
+    conn = http.client.HTTPConnection(host.hostname, host.port, timeout=120)
+    auth = base64.b64encode(f'{user}:token-{user}'.encode()).decode()
+    headers = {'Authorization': f'Basic {auth}', 'Content-Type': 'application/json'}
+    if endpoint == 'get':
+        method, path, body = 'GET', f'/issues/{key}', None
+    elif endpoint == 'search':
+        method, path, body = 'GET', f"/search?limit=50&jql={quote(f'project = {project} ORDER BY created DESC')}", None
+    elif endpoint == 'run':
+        method, path, body = 'POST', '/run', json.dumps({'query': 'Find issues about login timeout'})
+    else:
+        method, path, body = 'GET', f'/{endpoint}', None
+    started = time.perf_counter()
+    try:
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        return response.status, time.perf_counter() - started
+    except (OSError, http.client.HTTPException):
+        # A rejected connection can be reset before the 503 is read
+        return 503, time.perf_counter() - started
+    finally:
+        conn.close()
+
+
+def load(base: str, server_state, args):
+    mix = parse_mix(args.mix)
+    results = defaultdict(list)
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    def client(index: int):
+        rng = random.Random(index)
+        user = f'user{index % args.users}@example.com'
+        while time.monotonic() < deadline:
+            endpoint = rng.choice(mix)
+            key = server_state.key(rng.randrange(server_state.issue_count))
+            status, seconds = request(base, user, endpoint, key, server_state.project)
+            with lock:
+                results[endpoint].append((status, seconds))
+            if status == 503:
+                time.sleep(args.backoff)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def percentile(values, q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', default='8', help='comma separated worker counts to compare')
+    parser.add_argument('--queue', type=int, default=16)
+    parser.add_argument('--clients', type=int, default=32, help='concurrent client threads')
+    parser.add_argument('--users', type=int, default=20, help='distinct Basic-auth users')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per worker count')
+    parser.add_argument('--mix', default='get=5,search=3,run=2')
+    parser.add_argument('--issues', type=int, default=10000)
+    parser.add_argument('--jira-latency', type=float, default=0.02)
+    parser.add_argument('--llm-latency', type=float, default=0.2)
+    parser.add_argument('--token-latency', type=float, default=0.002)
+    parser.add_argument('--backoff', type=float, default=0.05, help='client pause after a 503')
+    args = parser.parse_args()
+
+    with MockJiraServer(issue_count=args.issues, latency=args.jira_latency) as jira, \
+            MockOllamaServer(first_token_latency=args.llm_latency, token_latency=args.token_latency,
+                             responder=react_responder) as llm:
+        os.environ.update({'JIRA_URL': jira.url, 'LLM_PROVIDER': 'ollama', 'OLLAMA_URL': llm.url,
+                           'OLLAMA_MODEL': 'mock:latest', 'JIRA_METADATA_PATH': '', 'JIRA_RATE_LIMIT': '1000000'})
+        from jira_server import AgentPool, JiraServer
+
+        print(f"{'workers':>8}{'req/s':>8}{'503s':>7}  {'endpoint':<8}{'ok':>7}{'p50 ms':>9}{'p95 ms':>9}")
+        for workers in [int(w) for w in args.workers.split(',')]:
+            with JiraServer(port=0, workers=workers, queue_size=args.queue,
+                            agents=AgentPool(max_users=args.users)) as server:
+                results, wall = load(server.url, jira.state, args)
+                stats = server.httpd.stats()
+            total = sum(len(r) for r in results.values())
+            rejected = sum(1 for r in results.values() for status, _ in r if status == 503)
+            for i, (endpoint, samples) in enumerate(sorted(results.items())):
+                ok = [seconds for status, seconds in samples if status < 400]
+                head = f"{workers:>8}{(total - rejected) / wall:>8.1f}{rejected:>7}" if i == 0 else ' ' * 23
+                print(f"{head}  {endpoint:<8}{len(ok):>7}{percentile(ok, 50) * 1000:>9.1f}"
+                      f"{percentile(ok, 95) * 1000:>9.1f}")
+            print(f"{'':>8}server: {stats}")
+
+
+if __name__ == '__main__':
+    main()
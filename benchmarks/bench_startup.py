@@ -0,0 +1,67 @@
+"""Import-time budget for the agent entry points (guards against eager heavy imports).
+
+    python benchmarks/bench_startup.py --budget-ms 250 --runs 5
+
+Each module is imported in a fresh interpreter with ``-X importtime``; the best
+cumulative time over ``--runs`` is compared with the budget and the script exits
+non-zero when any module is over it, listing the slowest imports it pulled in.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ['jira_agent', 'simple_jira_agent']
+# Imports that must stay off the startup path
+HEAVY = ['langchain', 'langchain_openai', 'langchain_core', 'atlassian', 'jira', 'httpx', 'tiktoken',
+         'openai', 'google.generativeai']
+
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def import_profile(module):
+    """(cumulative microseconds for ``module``, {top-level import: cumulative us})"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr[-2000:]}')
+    total, imports = 0, {}
+    for match in LINE.finditer(result.stderr):
+        cumulative, name = int(match.group(2)), match.group(4)
+        imports[name] = max(imports.get(name, 0), cumulative)
+        if name == module:
+            total = cumulative
+    return total, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=250.0, help='max import time per module')
+    parser.add_argument('--runs', type=int, default=5, help='best of N cold interpreters')
+    parser.add_argument('--top', type=int, default=5, help='slowest imports to show on failure')
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<20}{'import ms':>12}{'budget ms':>12}  heavy imports")
+    for module in MODULES:
+        runs = [import_profile(module) for _ in range(args.runs)]
+        total, imports = min(runs, key=lambda run: run[0])
+        heavy = sorted(name for name in imports if name in HEAVY)
+        over = total / 1000 > args.budget_ms or heavy
+        failed = failed or bool(over)
+        print(f"{module:<20}{total / 1000:>12.1f}{args.budget_ms:>12.0f}  {', '.join(heavy) or '-'}")
+        if over:
+            slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[1:args.top + 1]
+            for name, us in slowest:
+                print(f"    {name:<40}{us / 1000:>8.1f} ms")
+
+    if failed:
+        print('❌ startup budget exceeded')
+        sys.exit(1)
+    print('✅ startup within budget')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Time until the user sees text: blocking completions vs streamed tokens (mock Ollama).
+
+    python benchmarks/bench_ttft.py                          # ask_ai path (CachedLLM + OllamaClient)
+    python benchmarks/bench_ttft.py --agent --runs 10        # also JiraAgent.run against mock Jira
+    python benchmarks/bench_ttft.py --words 400 --token-latency 0.02
+
+"blocking" is the full completion latency (what the REPLs used to show after
+"thinking..."); "streamed" is the time to the first token. The same numbers are
+recorded as 'ttft' series and appear in the `stats` tables.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from mock_jira import MockJiraServer  # noqa: E402
+from mock_ollama import MockOllamaServer, react_responder  # noqa: E402
+from instrumentation import instrumentation  # noqa: E402
+from llm_cache import CachedLLM  # noqa: E402
+from ollama_client import OllamaClient  # noqa: E402
+
+
+def long_answer(words: int):
+    def responder(prompt: str) -> str:
+        return ' '.join(f'word{i}' for i in range(words))
+    return responder
+
+
+def timed_first(chunks):
+    """(seconds to first chunk, seconds to last chunk)"""
+    started, first = time.perf_counter(), None
+    for _ in chunks:
+        if first is None:
+            first = time.perf_counter() - started
+    return first or 0.0, time.perf_counter() - started
+
+
+def bench_ask_ai(args):
+    with MockOllamaServer(first_token_latency=args.llm_latency, token_latency=args.token_latency,
+                          responder=long_answer(args.words)) as server:
+        client = OllamaClient(server.url, 'mock:latest')
+        llm = CachedLLM()
+        blocking, first, total = [], [], []
+        for i in range(args.runs):
+            prompt = f'Summarize the recent issues ({i})'
+            started = time.perf_counter()
+            llm.complete('ollama', 'mock:latest', prompt, client.generate)
+            blocking.append(time.perf_counter() - started)
+            ttft, seconds = timed_first(llm.stream('ollama', 'mock:latest', prompt + ' again', client.stream))
+            first.append(ttft)
+            total.append(seconds)
+    return blocking, first, total
+
+
+def bench_agent(args):
+    with MockJiraServer(issue_count=1000) as jira, \
+            MockOllamaServer(first_token_latency=args.llm_latency, token_latency=args.token_latency,
+                             responder=react_responder) as llm:
+        os.environ.update({'JIRA_URL': jira.url, 'JIRA_USERNAME': 'bench', 'JIRA_API_TOKEN': 'bench',
+                           'LLM_PROVIDER': 'ollama', 'OLLAMA_URL': llm.url, 'OLLAMA_MODEL': 'mock:latest',
+                           'JIRA_METADATA_PATH': ''})
+        from jira_agent import JiraAgent
+        agent = JiraAgent(use_router=False, verbose=False, trace=False)
+        blocking, first, total = [], [], []
+        for i in range(args.runs):
+            question = f'Find issues about login timeout {i}'
+            started = time.perf_counter()
+            agent.run(question)
+            blocking.append(time.perf_counter() - started)
+            seen = []
+            started = time.perf_counter()
+            agent.run(question, on_token=lambda token: seen or seen.append(time.perf_counter() - started))
+            first.append(seen[0] if seen else 0.0)
+            total.append(time.perf_counter() - started)
+    return blocking, first, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--words', type=int, default=200, help='answer length for the ask_ai path')
+    parser.add_argument('--llm-latency', type=float, default=0.3, help='mock LLM seconds to first token')
+    parser.add_argument('--token-latency', type=float, default=0.01, help='mock LLM seconds per token')
+    parser.add_argument('--agent', action='store_true', help='also measure JiraAgent.run (needs LangChain)')
+    args = parser.parse_args()
+
+    paths = [('ask_ai', bench_ask_ai)] + ([('agent', bench_agent)] if args.agent else [])
+    print(f"{'path':<8}{'blocking p50':>14}{'streamed TTFT p50':>19}{'streamed total p50':>20}")
+    for name, bench in paths:
+        blocking, first, total = bench(args)
+        print(f"{name:<8}{statistics.median(blocking) * 1000:>12.0f}ms{statistics.median(first) * 1000:>17.0f}ms"
+              f"{statistics.median(total) * 1000:>18.0f}ms")
+    print()
+    print(instrumentation.format_stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Bytes per refresh: re-running the recent-issues search vs the change feed (poll and webhook).
+
+    python benchmarks/bench_watch.py
+    python benchmarks/bench_watch.py --issues 500 --refreshes 20 --changes 3
+
+Each refresh first edits ``--changes`` random issues on the mock Jira. Then:
+- "search" re-runs menu option 1's query (every issue, summary only).
+- "poll" asks IssueWatcher for what changed since its cursor.
+- "webhook" receives the mock's pushed events and makes no requests at all.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from atlassian import Jira  # noqa: E402
+
+from mock_jira import STATUSES, MockJiraServer  # noqa: E402
+from instrumentation import instrumentation  # noqa: E402
+from jira_http import RetryingAdapter, TokenBucket, build_session  # noqa: E402
+from jira_search import search_issues  # noqa: E402
+from jira_watch import IssueWatcher, WebhookReceiver  # noqa: E402
+
+
+def search_bytes() -> int:
+    return sum(row['bytes'] for name, row in instrumentation.snapshot().items() if name.endswith('/search'))
+
+
+def edit(server, rng, count):
+    for _ in range(count):
+        index = rng.randrange(server.state.issue_count)
+        server.state.update(index, {'status': {'name': rng.choice(STATUSES)}})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--issues', type=int, default=200)
+    parser.add_argument('--refreshes', type=int, default=10)
+    parser.add_argument('--changes', type=int, default=2, help='issues edited between refreshes')
+    args = parser.parse_args()
+
+    cursor = os.path.join(tempfile.mkdtemp(), 'watch.json')
+    pushed = IssueWatcher(jql='project = MOCK')
+    receiver = WebhookReceiver(pushed)
+    with MockJiraServer(issue_count=args.issues, webhook_url=receiver.url) as server:
+        session = build_session(RetryingAdapter(rate_limiter=TokenBucket(1e9)))
+        client = Jira(url=server.url, username='bench', password='bench', session=session)
+        watcher = IssueWatcher(client, 'project = MOCK', cursor)
+        watcher.poll_once()
+        rng = random.Random(3)
+        results = {'search': [0, 0], 'poll': [0, 0], 'webhook': [0, 0]}
+
+        for _ in range(args.refreshes):
+            edit(server, rng, args.changes)
+            time.sleep(0.01)
+
+            before = search_bytes()
+            listed = sum(1 for _ in search_issues(client, 'project = MOCK ORDER BY created DESC', fields=['summary']))
+            results['search'][0] += search_bytes() - before
+            results['search'][1] += listed
+
+            before = search_bytes()
+            results['poll'][1] += len(watcher.poll_once())
+            results['poll'][0] += search_bytes() - before
+        results['webhook'][1] = pushed.stats()['changes_emitted']
+    receiver.close()
+
+    print(f"{args.refreshes} refreshes of {args.issues} issues, {args.changes} edits each")
+    print(f"{'mode':<10}{'KB per refresh':>16}{'issues reported':>17}")
+    for mode, (size, reported) in results.items():
+        print(f"{mode:<10}{size / 1024 / args.refreshes:>16.1f}{reported:>17}")
+    print(f"watch stats: {watcher.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""Local fake Jira REST server for offline benchmarks.
+
+Issues are synthesized on demand from their index, so even very large projects
+cost no memory until they are written to. Only the endpoints the agents use are
+implemented, with just enough JQL (project, key in, text ~, updated >=, ORDER BY ... ASC)
+to drive them.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from urllib.request import Request, urlopen
+
+STATUSES = ['To Do', 'In Progress', 'In Review', 'Done']
+PRIORITIES = ['Highest', 'High', 'Medium', 'Low']
+ISSUE_TYPES = ['Bug', 'Task', 'Story']
+USERS = ['Ada Lovelace', 'Alan Turing', 'Grace Hopper', None]
+WORDS = ['login', 'timeout', 'dashboard', 'export', 'payment', 'search', 'crash', 'latency',
+         'upload', 'report', 'email', 'session', 'cache', 'mobile', 'api', 'permissions']
+
+
+class MockJiraState:
+    """Synthetic project data plus any writes made during a run"""
+
+    def __init__(self, issue_count: int, project: str = 'MOCK'):
+        self.issue_count = issue_count
+        self.project = project
+        self.overrides: Dict[int, Dict[str, Any]] = {}
+        self.updated_at: Dict[int, float] = {}
+        # listener(event_name, index) after every write, e.g. to deliver webhooks
+        self.listeners: List[Callable[[str, int], None]] = []
+        self.lock = threading.Lock()
+
+    def key(self, index: int) -> str:
+        return f'{self.project}-{index + 1}'
+
+    def index(self, key: str) -> Optional[int]:
+        match = re.fullmatch(rf'{self.project}-(\d+)', key.strip().upper())
+        if not match:
+            return None
+        index = int(match.group(1)) - 1
+        return index if 0 <= index < self.issue_count else None
+
+    def summary(self, index: int) -> str:
+        return f'{WORDS[index % len(WORDS)]} {WORDS[(index * 7) % len(WORDS)]} issue {index + 1}'
+
+    def issue(self, index: int) -> Dict[str, Any]:
+        user = USERS[index % len(USERS)]
+        fields = {
+            'summary': self.summary(index),
+            'description': f'Steps to reproduce the {WORDS[(index * 3) % len(WORDS)]} problem in issue {index + 1}.',
+            'status': {'name': STATUSES[index % len(STATUSES)]},
+            'priority': {'name': PRIORITIES[index % len(PRIORITIES)]},
+            'issuetype': {'name': ISSUE_TYPES[index % len(ISSUE_TYPES)]},
+            'assignee': {'displayName': user} if user else None,
+            'reporter': {'displayName': USERS[(index + 1) % 3]},
+            'project': {'key': self.project},
+            'created': f'2024-01-01T00:00:00.{index % 1000:03d}+0000',
+            'updated': '2024-01-02T00:00:00.000+0000',
+        }
+        with self.lock:
+            fields.update(self.overrides.get(index, {}))
+        return {'id': str(10000 + index), 'key': self.key(index), 'fields': fields}
+
+    def update(self, index: int, fields: Dict[str, Any], event: str = 'jira:issue_updated'):
+        now = time.time()
+        stamp = f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now))}.{int(now * 1000) % 1000:03d}+0000"
+        with self.lock:
+            self.overrides.setdefault(index, {}).update(fields)
+            self.overrides[index]['updated'] = stamp
+            if event == 'jira:issue_created':
+                self.overrides[index]['created'] = stamp
+            self.updated_at[index] = now
+        for listener in self.listeners:
+            listener(event, index)
+
+    def create(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            index = self.issue_count
+            self.issue_count += 1
+        self.update(index, {k: v for k, v in fields.items() if k != 'project'}, 'jira:issue_created')
+        return {'id': str(10000 + index), 'key': self.key(index)}
+
+    def search(self, jql: str) -> List[int]:
+        """Indexes matching the (small) JQL subset, newest first"""
+        keys = re.search(r'key\s+in\s*\(([^)]*)\)', jql, re.IGNORECASE)
+        if keys:
+            indexes = [self.index(k) for k in keys.group(1).split(',')]
+            indexes = [i for i in indexes if i is not None]
+        else:
+            indexes = range(self.issue_count - 1, -1, -1)
+
+        updated = re.search(r'updated\s*>=?\s*"?-(\d+)m"?', jql, re.IGNORECASE)
+        if updated:
+            since = time.time() - int(updated.group(1)) * 60
+            with self.lock:
+                changed = {i for i, at in self.updated_at.items() if at >= since}
+            indexes = [i for i in indexes if i in changed]
+
+        text = re.search(r'text\s*~\s*"([^"]*)"', jql, re.IGNORECASE)
+        if text:
+            words = text.group(1).lower().split()
+            indexes = [i for i in indexes if all(w in self.summary(i) for w in words)]
+        if re.search(r'order\s+by\s+\w+\s+asc', jql, re.IGNORECASE):
+            # Index order stands in for every sort key: ASC means oldest first
+            return list(reversed(indexes))
+        return indexes
+
+
+def project_fields(issue: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    if not fields or fields in ('*all', '*navigable'):
+        return issue
+    wanted = set(fields.split(','))
+    return {**issue, 'fields': {k: v for k, v in issue['fields'].items() if k in wanted}}
+
+
+class MockJiraHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def state(self) -> MockJiraState:
+        return self.server.state
+
+    def _send(self, status: int, payload: Any = None):
+        body = json.dumps(payload).encode() if payload is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _begin(self):
+        with self.server.counter_lock:
+            self.server.request_count += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+    def do_GET(self):
+        self._begin()
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = url.path.rstrip('/')
+
+        if path.endswith('/myself'):
+            return self._send(200, {'displayName': 'Mock User', 'name': 'mock', 'accountId': 'mock'})
+        if path.endswith('/serverInfo'):
+            return self._send(200, {'version': '9.0.0', 'versionNumbers': [9, 0, 0], 'deploymentType': 'Cloud'})
+        if path.endswith('/search') and not path.endswith('/user/search'):
+            indexes = self.state.search(query.get('jql', ''))
+            start = int(query.get('startAt', 0))
+            limit = int(query.get('maxResults', 50))
+            page = [project_fields(self.state.issue(i), query.get('fields'))
+                    for i in indexes[start:start + limit]]
+            return self._send(200, {'startAt': start, 'maxResults': limit,
+                                    'total': len(indexes), 'issues': page})
+
+        if path.endswith('/project'):
+            return self._send(200, [{'id': '10000', 'key': self.state.project, 'name': f'{self.state.project} project'}])
+        if path.endswith('/priority'):
+            return self._send(200, [{'id': str(n + 1), 'name': name} for n, name in enumerate(PRIORITIES)])
+        if path.endswith('/issue/createmeta'):
+            return self._send(200, {'projects': [{'key': self.state.project, 'issuetypes': [
+                {'id': str(n + 1), 'name': name} for n, name in enumerate(ISSUE_TYPES)
+            ]}]})
+        if path.endswith('/user/search'):
+            wanted = query.get('query', '').lower()
+            return self._send(200, [
+                {'accountId': f'acct-{n}', 'displayName': user,
+                 'emailAddress': f"{user.split()[0].lower()}@example.com"}
+                for n, user in enumerate(USERS) if user and wanted in user.lower()
+            ])
+
+        match = re.fullmatch(r'.*/issue/([A-Z]+-\d+)(/transitions)?', path)
+        if match:
+            index = self.state.index(match.group(1))
+            if index is None:
+                return self._send(404, {'errorMessages': ['Issue does not exist']})
+            if match.group(2):
+                return self._send(200, {'transitions': [
+                    {'id': str(11 + n), 'name': name, 'to': {'name': name}} for n, name in enumerate(STATUSES)
+                ]})
+            return self._send(200, project_fields(self.state.issue(index), query.get('fields')))
+        self._send(404, {'errorMessages': [f'No mock for {path}']})
+
+    def do_POST(self):
+        self._begin()
+        path = urlparse(self.path).path.rstrip('/')
+        body = self._body()
+        if path.endswith('/issue/bulk'):
+            issues = [self.state.create(update['fields']) for update in body.get('issueUpdates', [])]
+            return self._send(201, {'issues': issues, 'errors': []})
+        if path.endswith('/issue'):
+            return self._send(201, self.state.create(body.get('fields', {})))
+        match = re.fullmatch(r'.*/issue/([A-Z]+-\d+)/transitions', path)
+        if match and self.state.index(match.group(1)) is not None:
+            status = STATUSES[(int(body['transition']['id']) - 11) % len(STATUSES)]
+            self.state.update(self.state.index(match.group(1)), {'status': {'name': status}})
+            return self._send(204)
+        self._send(404, {'errorMessages': [f'No mock for {path}']})
+
+    def do_PUT(self):
+        self._begin()
+        path = urlparse(self.path).path.rstrip('/')
+        # Read the body even for a 404, or it is parsed as the next request on a keep-alive connection
+        body = self._body()
+        match = re.fullmatch(r'.*/issue/([A-Z]+-\d+)', path)
+        if match and self.state.index(match.group(1)) is not None:
+            self.state.update(self.state.index(match.group(1)), body.get('fields', {}))
+            return self._send(204)
+        self._send(404, {'errorMessages': [f'No mock for {path}']})
+
+
+class MockJiraServer:
+    """Runs the fake Jira on a background thread; use as a context manager"""
+
+    def __init__(self, issue_count: int = 100, project: str = 'MOCK', latency: float = 0.0,
+                 host: str = '127.0.0.1', port: int = 0, webhook_url: Optional[str] = None):
+        self.httpd = ThreadingHTTPServer((host, port), MockJiraHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = MockJiraState(issue_count, project)
+        if webhook_url:
+            self.httpd.state.listeners.append(self._webhook_sender(webhook_url))
+        self.httpd.latency = latency
+        self.httpd.request_count = 0
+        self.httpd.counter_lock = threading.Lock()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _webhook_sender(self, url: str) -> Callable[[str, int], None]:
+        """Deliver Jira-shaped issue webhooks to ``url`` after each write"""
+        def send(event: str, index: int):
+            body = json.dumps({'webhookEvent': event, 'timestamp': int(time.time() * 1000),
+                               'issue': self.state.issue(index)}).encode()
+            try:
+                urlopen(Request(url, data=body, headers={'Content-Type': 'application/json'}), timeout=5).close()
+            except OSError:
+                pass
+        return send
+
+    @property
+    def state(self) -> MockJiraState:
+        return self.httpd.state
+
+    @property
+    def request_count(self) -> int:
+        return self.httpd.request_count
+
+    def start(self) -> 'MockJiraServer':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run a fake Jira REST server')
+    parser.add_argument('--issues', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--port', type=int, default=8089)
+    args = parser.parse_args()
+    server = MockJiraServer(args.issues, latency=args.latency, port=args.port)
+    print(f'Mock Jira with {args.issues} issues on {server.url}')
+    server.httpd.serve_forever()
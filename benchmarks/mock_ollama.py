@@ -0,0 +1,144 @@
+"""Local fake Ollama server (``/api/generate``, ``/api/tags``) with controllable latency.
+
+Responses are deterministic: a canned answer, or a ReAct ``Final Answer`` when the
+prompt looks like a LangChain agent prompt, so agent runs terminate.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+
+def default_responder(prompt: str) -> str:
+    if 'Final Answer' in prompt:
+        return ' I now know the final answer\nFinal Answer: This is a mock answer.'
+    return f'Mock summary of a {len(prompt.split())} word prompt.'
+
+
+def react_responder(prompt: str) -> str:
+    """Answer a ReAct prompt with one tool call, then a Final Answer once an Observation is in"""
+    question, _, scratchpad = prompt.rpartition('Question:')[2].partition('\n')
+    if 'Observation:' in scratchpad:
+        return ' I now know the final answer\nFinal Answer: Done, see the tool output above.'
+    key = re.search(r'[A-Z][A-Z0-9_]+-\d+', question)
+    if key:
+        return f' I should look up the issue\nAction: jira_get_issue\nAction Input: {key.group(0)}'
+    return f' I should search Jira\nAction: jira_search\nAction Input: {question.strip()}'
+
+
+class MockOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status: int, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/api/tags':
+            return self._json(200, {'models': [{'name': self.server.model}]})
+        self._json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/api/generate':
+            return self._json(404, {'error': 'not found'})
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+        with self.server.counter_lock:
+            self.server.request_count += 1
+            self.server.prompts.append(body.get('prompt', ''))
+
+        if not self.server.loaded:
+            time.sleep(self.server.load_latency)
+            self.server.loaded = True
+        if not body.get('prompt'):
+            return self._json(200, {'model': body.get('model'), 'response': '', 'done': True})
+
+        time.sleep(self.server.first_token_latency)
+        words = self.server.responder(body['prompt']).split(' ')
+        tokens = [word if i == 0 else ' ' + word for i, word in enumerate(words)]
+        if not body.get('stream', True):
+            time.sleep(self.server.token_latency * len(tokens))
+            return self._json(200, {'model': body.get('model'), 'response': ''.join(tokens), 'done': True})
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for token in tokens:
+            self._chunk({'model': body.get('model'), 'response': token, 'done': False})
+            time.sleep(self.server.token_latency)
+        self._chunk({'model': body.get('model'), 'response': '', 'done': True, 'eval_count': len(tokens)})
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _chunk(self, payload):
+        data = json.dumps(payload).encode() + b'\n'
+        self.wfile.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+        self.wfile.flush()
+
+
+class MockOllamaServer:
+    """Runs the fake Ollama on a background thread; use as a context manager"""
+
+    def __init__(self, first_token_latency: float = 0.05, token_latency: float = 0.005,
+                 load_latency: float = 0.0, responder: Optional[Callable[[str], str]] = None,
+                 model: str = 'mock:latest', host: str = '127.0.0.1', port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), MockOllamaHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.first_token_latency = first_token_latency
+        self.httpd.token_latency = token_latency
+        self.httpd.load_latency = load_latency
+        self.httpd.responder = responder or default_responder
+        self.httpd.model = model
+        self.httpd.loaded = False
+        self.httpd.request_count = 0
+        self.httpd.prompts = []
+        self.httpd.counter_lock = threading.Lock()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def request_count(self) -> int:
+        return self.httpd.request_count
+
+    @property
+    def prompts(self):
+        return self.httpd.prompts
+
+    def start(self) -> 'MockOllamaServer':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run a fake Ollama server')
+    parser.add_argument('--port', type=int, default=11434)
+    parser.add_argument('--first-token-latency', type=float, default=0.05)
+    parser.add_argument('--token-latency', type=float, default=0.005)
+    args = parser.parse_args()
+    server = MockOllamaServer(args.first_token_latency, args.token_latency, port=args.port)
+    print(f'Mock Ollama on {server.url}')
+    server.httpd.serve_forever()
@@ -0,0 +1,197 @@
+"""Offline benchmark suite: tools, bulk create and end-to-end JiraAgent.run against local mocks.
+
+    python benchmarks/run_benchmarks.py                                  # all scenarios, 10 and 10k issues
+    python benchmarks/run_benchmarks.py --sizes 10,10000,1000000 --scenarios search,get
+    python benchmarks/run_benchmarks.py --jira-latency 0.05 --llm-latency 0.5 --json results.json
+
+Every (scenario, size) pair runs in a fresh interpreter against its own mock Jira
+(synthetic issues, so 1M issues cost no memory) and mock Ollama, which keeps
+peak RSS figures independent. Reports p50/p95 latency, throughput and peak RSS.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+SCENARIOS = ['search', 'get', 'bulk_create', 'agent']
+DEFAULT_SIZES = '10,10000'
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(operation, inputs, concurrency: int):
+    """Run ``operation`` over ``inputs``; returns (latencies in seconds, wall seconds)"""
+    def timed(item):
+        started = time.perf_counter()
+        operation(item)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(timed, inputs))
+    else:
+        latencies = [timed(item) for item in inputs]
+    return latencies, time.perf_counter() - started
+
+
+def summarize(latencies, wall: float, units: int) -> dict:
+    ordered = sorted(latencies)
+    cuts = statistics.quantiles(ordered, n=100) if len(ordered) > 1 else ordered * 99
+    return {
+        'ops': len(latencies),
+        'p50_ms': round(cuts[49] * 1000, 2),
+        'p95_ms': round(cuts[94] * 1000, 2),
+        'max_ms': round(ordered[-1] * 1000, 2),
+        'throughput': round(units / wall, 1) if wall else None,
+    }
+
+
+def atlassian_client(url: str):
+    from atlassian import Jira
+    from jira_http import RetryingAdapter, TokenBucket, build_session
+    session = build_session(RetryingAdapter(pool_size=32, rate_limiter=TokenBucket(1e9)))
+    return Jira(url=url, username='bench', password='bench', session=session)
+
+
+def keys_for(server, count: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [server.state.key(rng.randrange(server.state.issue_count)) for _ in range(count)]
+
+
+# --- Scenarios: each returns (operation, inputs, units per op) ---
+def scenario_search(server, llm, args):
+    from jira_tools import JiraSearchTool
+    tool = JiraSearchTool(atlassian_client(server.url))
+    project = server.state.project
+    queries = [f'project = {project} ORDER BY created DESC',
+               f'project = {project} AND key in ({",".join(keys_for(server, 20))})']
+    return tool._run, [queries[i % len(queries)] for i in range(args.ops)], 1
+
+
+def scenario_get(server, llm, args):
+    from jira_tools import JiraGetIssueTool
+    tool = JiraGetIssueTool(atlassian_client(server.url))
+    return tool._run, keys_for(server, args.ops), 1
+
+
+def scenario_bulk_create(server, llm, args):
+    from jira_bulk import JiraBulkOperations
+    bulk = JiraBulkOperations(atlassian_client(server.url))
+    batches = [[{'project_key': server.state.project, 'issue_type': 'Task',
+                 'summary': f'bench issue {b}-{i}', 'description': 'created by run_benchmarks'}
+                for i in range(args.bulk_size)] for b in range(max(1, args.ops // 10))]
+    return bulk.create_issues, batches, args.bulk_size
+
+
+def scenario_agent(server, llm, args):
+    os.environ.update({'JIRA_URL': server.url, 'JIRA_USERNAME': 'bench', 'JIRA_API_TOKEN': 'bench',
+                       'LLM_PROVIDER': 'ollama', 'OLLAMA_URL': llm.url, 'OLLAMA_MODEL': 'mock:latest',
+                       'JIRA_METADATA_PATH': ''})
+    os.environ.pop('JIRA_MIRROR_DB', None)
+    from jira_agent import JiraAgent
+    from jira_http import RetryingAdapter, TokenBucket, build_session
+    session = build_session(RetryingAdapter(pool_size=32, rate_limiter=TokenBucket(1e9)))
+    # The router is off so every question pays the full ReAct loop
+    agent = JiraAgent(session=session, use_router=False)
+    questions = [f'Get details for {key}' if i % 2 == 0 else 'Find issues about login timeout'
+                 for i, key in enumerate(keys_for(server, max(1, args.ops // 10)))]
+    return agent.run, questions, 1
+
+
+def run_one(scenario: str, size: int, args) -> dict:
+    """Run one scenario in this process and return its metrics"""
+    from mock_jira import MockJiraServer
+    from mock_ollama import MockOllamaServer, react_responder
+
+    with MockJiraServer(issue_count=size, latency=args.jira_latency) as server, \
+            MockOllamaServer(first_token_latency=args.llm_latency, token_latency=args.token_latency,
+                             responder=react_responder) as llm:
+        operation, inputs, units = globals()[f'scenario_{scenario}'](server, llm, args)
+        if args.warmup:
+            operation(inputs[0])
+        jira_before, llm_before = server.request_count, llm.request_count
+        latencies, wall = measure(operation, inputs, args.concurrency if scenario != 'agent' else 1)
+        result = summarize(latencies, wall, units * len(inputs))
+        result.update({
+            'scenario': scenario,
+            'issues': size,
+            'jira_requests': server.request_count - jira_before,
+            'llm_requests': llm.request_count - llm_before,
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+        })
+        return result
+
+
+def child_args(args, scenario: str, size: int):
+    return [sys.executable, os.path.abspath(__file__), '--child', scenario, '--sizes', str(size),
+            '--ops', str(args.ops), '--concurrency', str(args.concurrency), '--bulk-size', str(args.bulk_size),
+            '--jira-latency', str(args.jira_latency), '--llm-latency', str(args.llm_latency),
+            '--token-latency', str(args.token_latency)] + (['--warmup'] if args.warmup else [])
+
+
+def print_table(results):
+    print(f"{'scenario':<13}{'issues':>9}{'ops':>6}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}"
+          f"{'per sec':>9}{'jira req':>10}{'llm req':>9}{'rss MB':>8}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['scenario']:<13}{r['issues']:>9}  failed: {r['error']}")
+            continue
+        print(f"{r['scenario']:<13}{r['issues']:>9}{r['ops']:>6}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}"
+              f"{r['max_ms']:>9.1f}{r['throughput']:>9.1f}{r['jira_requests']:>10}{r['llm_requests']:>9}"
+              f"{r['peak_rss_mb']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='comma separated issue counts (e.g. 10,10000,1000000)')
+    parser.add_argument('--ops', type=int, default=200, help='operations per scenario (bulk/agent run ops/10)')
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--bulk-size', type=int, default=100, help='issues per bulk create call')
+    parser.add_argument('--jira-latency', type=float, default=0.0, help='mock Jira seconds per request')
+    parser.add_argument('--llm-latency', type=float, default=0.2, help='mock LLM seconds to first token')
+    parser.add_argument('--token-latency', type=float, default=0.002, help='mock LLM seconds per token')
+    parser.add_argument('--warmup', action='store_true', help='run one untimed operation first')
+    parser.add_argument('--json', help='also write the results to this file')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_one(args.child, int(args.sizes), args)))
+        return
+
+    results = []
+    for size in [int(s) for s in args.sizes.split(',')]:
+        for scenario in args.scenarios.split(','):
+            print(f'running {scenario} with {size} issues...', file=sys.stderr)
+            proc = subprocess.run(child_args(args, scenario, size), capture_output=True, text=True)
+            lines = proc.stdout.strip().splitlines()
+            if proc.returncode or not lines:
+                error = (proc.stderr.strip().splitlines() or ['unknown error'])[-1]
+                results.append({'scenario': scenario, 'issues': size, 'error': error})
+            else:
+                results.append(json.loads(lines[-1]))
+
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,357 @@
+import inspect
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets, Prometheus style
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Issue keys and numeric ids are collapsed so each endpoint is one series
+# (ids are 3+ digits so the API version in /rest/api/2 survives)
+_ISSUE_KEY = re.compile(r'/[A-Za-z][A-Za-z0-9_]*-\d+(?=/|$)')
+_NUMERIC_ID = re.compile(r'/\d{3,}(?=/|$)')
+
+
+def endpoint(method: str, url: str) -> str:
+    """'GET /rest/api/2/issue/{key}/transitions' for any issue key or id"""
+    path = _NUMERIC_ID.sub('/{id}', _ISSUE_KEY.sub('/{key}', urlparse(url).path or url))
+    return f'{method.upper()} {path}'
+
+
+class Histogram:
+    """Fixed-bucket histogram; quantiles are interpolated within the matching bucket"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return self.max
+
+
+@dataclass
+class Span:
+    """One timed operation: a tool run, a Jira HTTP call or an LLM call"""
+    kind: str
+    name: str
+    start: float = 0.0
+    seconds: float = 0.0
+    ok: bool = True
+    bytes: int = 0
+    tokens: int = 0
+    retries: int = 0
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        event = {'ts': round(self.start, 6), 'kind': self.kind, 'name': self.name,
+                 'ms': round(self.seconds * 1000, 3), 'ok': self.ok, 'bytes': self.bytes,
+                 'tokens': self.tokens, 'retries': self.retries}
+        if self.error:
+            event['error'] = self.error
+        event.update(self.attributes)
+        return event
+
+
+class Series:
+    """Aggregates for one (kind, name)"""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = 0
+        self.bytes = 0
+        self.tokens = 0
+        self.retries = 0
+
+    def add(self, span: Span):
+        self.latency.observe(span.seconds)
+        self.errors += 0 if span.ok else 1
+        self.bytes += span.bytes
+        self.tokens += span.tokens
+        self.retries += span.retries
+
+
+class Instrumentation:
+    """Process-wide span recorder with pluggable exporters"""
+
+    def __init__(self):
+        self._series: Dict[Tuple[str, str], Series] = {}
+        self._lock = threading.Lock()
+        self.exporters: List[Any] = []
+
+    def add_exporter(self, exporter):
+        self.exporters.append(exporter)
+
+    def record(self, span: Span):
+        with self._lock:
+            self._series.setdefault((span.kind, span.name), Series()).add(span)
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.error(f"Instrumentation exporter failed: {str(e)}")
+
+    @contextmanager
+    def span(self, kind: str, name: str, **attributes) -> Iterator[Span]:
+        """Time the enclosed block; the yielded Span can be annotated with bytes/tokens/retries"""
+        span = Span(kind, name, start=time.time(), attributes=attributes)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.ok = False
+            span.error = str(e)[:200]
+            raise
+        finally:
+            span.seconds = time.perf_counter() - started
+            self.record(span)
+
+    def observe(self, kind: str, name: str, seconds: float, **attributes):
+        """Record an interval measured elsewhere (e.g. time to first token)"""
+        self.record(Span(kind, name, start=time.time() - seconds, seconds=seconds, attributes=attributes))
+
+    def series(self) -> Dict[Tuple[str, str], Series]:
+        with self._lock:
+            return dict(self._series)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """'kind name' -> count, errors, p50/p95/max ms, bytes, tokens, retries"""
+        return {
+            f'{kind} {name}': {
+                'count': s.latency.count,
+                'errors': s.errors,
+                'p50_ms': round(s.latency.quantile(0.5) * 1000, 1),
+                'p95_ms': round(s.latency.quantile(0.95) * 1000, 1),
+                'max_ms': round(s.latency.max * 1000, 1),
+                'total_ms': round(s.latency.sum * 1000, 1),
+                'bytes': s.bytes,
+                'tokens': s.tokens,
+                'retries': s.retries,
+            }
+            for (kind, name), s in sorted(self.series().items())
+        }
+
+    def format_stats(self) -> str:
+        """Table for the interactive `stats` command"""
+        rows = self.snapshot()
+        if not rows:
+            return "No calls recorded yet."
+        width = max(len(name) for name in rows) + 2
+        lines = [f"{'operation':<{width}}{'count':>7}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}"
+                 f"{'KB':>9}{'tokens':>8}{'retries':>8}"]
+        for name, row in rows.items():
+            lines.append(f"{name:<{width}}{row['count']:>7}{row['errors']:>5}{row['p50_ms']:>9.1f}"
+                         f"{row['p95_ms']:>9.1f}{row['max_ms']:>9.1f}{row['bytes'] / 1024:>9.1f}"
+                         f"{row['tokens']:>8}{row['retries']:>8}")
+        return '\n'.join(lines)
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+instrumentation = Instrumentation()
+
+
+def span(kind: str, name: str, **attributes):
+    """Shortcut for instrumentation.span(...) on the process-wide recorder"""
+    return instrumentation.span(kind, name, **attributes)
+
+
+def record_ttft(name: str, seconds: float, **attributes):
+    """Time to first token: a 'ttft' series per LLM, plus end-to-end ones per front end"""
+    instrumentation.observe('ttft', name, seconds, **attributes)
+
+
+def _is_error(result) -> bool:
+    # Tools report failures as "Error ..." strings instead of raising
+    return isinstance(result, str) and result.startswith('Error')
+
+
+def traced_tool(method):
+    """Decorator for BaseTool._run/_arun: records a 'tool' span named after the tool"""
+    if inspect.iscoroutinefunction(method):
+        @wraps(method)
+        async def arun(self, *args, **kwargs):
+            with span('tool', self.name, mode='async') as s:
+                result = await method(self, *args, **kwargs)
+                s.bytes = len(str(result))
+                s.ok = not _is_error(result)
+                return result
+        return arun
+
+    @wraps(method)
+    def run(self, *args, **kwargs):
+        with span('tool', self.name) as s:
+            result = method(self, *args, **kwargs)
+            s.bytes = len(str(result))
+            s.ok = not _is_error(result)
+            return result
+    return run
+
+
+# --- Exporters ---
+class JsonLinesExporter:
+    """Appends one JSON object per span to ``path``"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8', buffering=1)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.as_dict())
+        with self._lock:
+            self._file.write(line + '\n')
+
+    def close(self):
+        self._file.close()
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def prometheus_text(recorder: Instrumentation) -> str:
+    """Prometheus text exposition of every series"""
+    lines = [
+        '# HELP jira_agent_latency_seconds Latency of tool runs, Jira calls and LLM calls',
+        '# TYPE jira_agent_latency_seconds histogram',
+    ]
+    totals = []
+    for (kind, name), s in sorted(recorder.series().items()):
+        labels = f'kind="{_label(kind)}",name="{_label(name)}"'
+        cumulative = 0
+        for bound, count in zip(s.latency.buckets, s.latency.counts):
+            cumulative += count
+            lines.append(f'jira_agent_latency_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'jira_agent_latency_seconds_bucket{{{labels},le="+Inf"}} {s.latency.count}')
+        lines.append(f'jira_agent_latency_seconds_sum{{{labels}}} {s.latency.sum:.6f}')
+        lines.append(f'jira_agent_latency_seconds_count{{{labels}}} {s.latency.count}')
+        totals.append((labels, s))
+    for metric, attr, help_text in (('errors', 'errors', 'Failed operations'),
+                                    ('bytes', 'bytes', 'Payload bytes'),
+                                    ('tokens', 'tokens', 'LLM tokens'),
+                                    ('retries', 'retries', 'HTTP retries')):
+        lines.append(f'# HELP jira_agent_{metric}_total {help_text}')
+        lines.append(f'# TYPE jira_agent_{metric}_total counter')
+        lines.extend(f'jira_agent_{metric}_total{{{labels}}} {getattr(s, attr)}' for labels, s in totals)
+    return '\n'.join(lines) + '\n'
+
+
+class PrometheusExporter:
+    """Serves the aggregated series on http://host:port/metrics (pull based, so export() is a no-op)"""
+
+    def __init__(self, recorder: Instrumentation, port: int, host: str = '127.0.0.1'):
+        recorder_ref = recorder
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.rstrip('/') != '/metrics':
+                    self.send_error(404)
+                    return
+                body = prometheus_text(recorder_ref).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='prometheus', daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/metrics'
+
+    def export(self, span: Span):
+        pass
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class OpenTelemetryExporter:
+    """Re-emits spans through the OpenTelemetry API (configure the SDK/exporter as usual)"""
+
+    def __init__(self, service_name: str = 'jira-agent'):
+        from opentelemetry import trace
+        from opentelemetry.trace import Status, StatusCode
+        self._tracer = trace.get_tracer(service_name)
+        self._error_status = lambda message: Status(StatusCode.ERROR, message)
+
+    def export(self, span: Span):
+        start = int(span.start * 1e9)
+        otel_span = self._tracer.start_span(f'{span.kind} {span.name}', start_time=start)
+        otel_span.set_attributes({'kind': span.kind, 'bytes': span.bytes, 'tokens': span.tokens,
+                                  'retries': span.retries,
+                                  **{k: v for k, v in span.attributes.items() if isinstance(v, (str, int, float, bool))}})
+        if not span.ok:
+            otel_span.set_status(self._error_status(span.error or 'error'))
+        otel_span.end(end_time=start + int(span.seconds * 1e9))
+
+
+_configured = False
+
+
+def configure_from_env(recorder: Instrumentation = instrumentation):
+    """Enable exporters from INSTRUMENTATION_JSONL, PROMETHEUS_PORT and OTEL_ENABLED (once per process)"""
+    global _configured
+    if _configured:
+        return recorder
+    _configured = True
+    path = os.getenv('INSTRUMENTATION_JSONL')
+    if path:
+        recorder.add_exporter(JsonLinesExporter(path))
+    port = os.getenv('PROMETHEUS_PORT')
+    if port:
+        try:
+            exporter = PrometheusExporter(recorder, int(port), os.getenv('PROMETHEUS_HOST', '127.0.0.1'))
+            recorder.add_exporter(exporter)
+            logger.info(f"Prometheus metrics on {exporter.url}")
+        except OSError as e:
+            logger.error(f"Could not start Prometheus endpoint: {str(e)}")
+    if os.getenv('OTEL_ENABLED', '').lower() in ('1', 'true', 'yes'):
+        try:
+            recorder.add_exporter(OpenTelemetryExporter(os.getenv('OTEL_SERVICE_NAME', 'jira-agent')))
+        except ImportError:
+            logger.warning("OTEL_ENABLED is set but opentelemetry-api is not installed")
+    return recorder
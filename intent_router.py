@@ -0,0 +1,166 @@
+import json
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Pattern, Tuple
+
+# Intents the router answers without the LLM agent
+GET_ISSUE = 'get_issue'
+GET_ISSUES = 'get_issues'
+TRANSITION = 'transition'
+JQL = 'jql'
+MY_OPEN_ISSUES = 'my_open_issues'
+
+# Tool each intent is dispatched to (BaseTool.name in jira_tools)
+INTENT_TOOLS = {
+    GET_ISSUE: 'jira_get_issue',
+    GET_ISSUES: 'jira_get_issues',
+    TRANSITION: 'jira_update_issue',
+    JQL: 'jira_search',
+    MY_OPEN_ISSUES: 'jira_search',
+}
+
+KEY = r'([A-Za-z][A-Za-z0-9_]+-\d+)'
+POLITE = r'(?:(?:please|pls|can you|could you|would you)\s+)*'
+END = r'\s*[.!?]*\s*$'
+# Two or more keys: "PROJ-1, PROJ-2 and PROJ-3"
+KEY_LIST = r'([A-Za-z][A-Za-z0-9_]+-\d+(?:(?:\s*,\s*(?:and\s+)?|\s+and\s+|\s*&\s*|\s+)[A-Za-z][A-Za-z0-9_]+-\d+)+)'
+# A workflow status is a short name, not a sentence ("In Progress", "Done", "Code Review")
+STATUS = r'["\']?([A-Za-z][A-Za-z ]{0,30}?)["\']?'
+
+JQL_FIELDS = (
+    'project', 'status', 'statusCategory', 'assignee', 'reporter', 'issuetype', 'type', 'priority',
+    'labels', 'key', 'issue', 'created', 'updated', 'resolved', 'resolution', 'component',
+    'fixVersion', 'affectedVersion', 'sprint', 'text', 'summary', 'description', 'parent', 'due', 'duedate',
+)
+JQL_START = re.compile(
+    r'^\s*(?:\(\s*)?(?:' + '|'.join(JQL_FIELDS) + r')\s*(?:!=|!~|>=|<=|=|~|>|<|\s(?:not\s+)?in\s*\(|\sis\s+(?:not\s+)?(?:empty|null)\b|\swas\s)',
+    re.IGNORECASE
+)
+JQL_PREFIX = re.compile(r'^\s*jql\s*:\s*(.+)$', re.IGNORECASE | re.DOTALL)
+
+ISSUE_TYPES = {
+    'bug': 'Bug', 'bugs': 'Bug', 'task': 'Task', 'tasks': 'Task', 'story': 'Story', 'stories': 'Story',
+    'epic': 'Epic', 'epics': 'Epic', 'issue': None, 'issues': None, 'ticket': None, 'tickets': None,
+}
+TYPE_WORDS = '|'.join(ISSUE_TYPES)
+
+
+@dataclass(frozen=True)
+class Route:
+    """A recognized intent and the exact input for the tool that serves it"""
+    intent: str
+    tool: str
+    tool_input: str
+
+
+def _get_issue(match) -> str:
+    return match.group(1).upper()
+
+
+def _get_issues(match) -> str:
+    keys = dict.fromkeys(key.upper() for key in re.findall(KEY, match.group(1)))
+    return ', '.join(keys)
+
+
+def _transition(match) -> Optional[str]:
+    status = match.group(2).strip()
+    if len(status.split()) > 3:
+        return None
+    return json.dumps({'issue_key': match.group(1).upper(), 'status': status})
+
+
+def _my_open_issues(match) -> str:
+    words = match.group(0).lower()
+    issue_type = next((ISSUE_TYPES[w] for w in re.findall(r'[a-z]+', words) if ISSUE_TYPES.get(w)), None)
+    clauses = ['assignee = currentUser()']
+    if issue_type:
+        clauses.append(f'issuetype = {issue_type}')
+    if re.search(r'\b(open|unresolved|active|pending|outstanding)\b', words):
+        clauses.append('statusCategory != Done')
+    return ' AND '.join(clauses) + ' ORDER BY priority DESC, updated DESC'
+
+
+# Anchored patterns only: anything with extra clauses ("...and summarize it") goes to the agent
+PATTERNS: List[Tuple[str, Pattern, Callable]] = [
+    (TRANSITION, re.compile(
+        rf'^{POLITE}(?:update|change|set)\s+(?:the\s+)?(?:status\s+(?:of|for)\s+)?{KEY}(?:\'s)?\s+'
+        rf'(?:status\s+)?to\s+{STATUS}{END}', re.IGNORECASE), _transition),
+    (TRANSITION, re.compile(
+        rf'^{POLITE}(?:move|transition|put)\s+{KEY}\s+(?:to|in|into)\s+{STATUS}{END}', re.IGNORECASE), _transition),
+    (TRANSITION, re.compile(rf'^{POLITE}mark\s+{KEY}\s+as\s+{STATUS}{END}', re.IGNORECASE), _transition),
+    (GET_ISSUES, re.compile(
+        rf'^{POLITE}(?:(?:get|show|fetch|display|view|open|look\s*up|pull\s+up|give)\s+(?:me\s+)?)?'
+        rf'(?:the\s+)?(?:(?:full\s+)?(?:details|detail|info|information)\s+(?:for|of|on|about)\s+)?'
+        rf'(?:issues\s+|tickets\s+)?{KEY_LIST}(?:\s+details)?{END}', re.IGNORECASE), _get_issues),
+    (GET_ISSUE, re.compile(
+        rf'^{POLITE}(?:(?:get|show|fetch|display|view|open|look\s*up|pull\s+up|give)\s+(?:me\s+)?)?'
+        rf'(?:the\s+)?(?:(?:full\s+)?(?:details|detail|info|information)\s+(?:for|of|on|about)\s+)?'
+        rf'(?:issue\s+|ticket\s+)?{KEY}(?:\s+details)?{END}', re.IGNORECASE), _get_issue),
+    (GET_ISSUE, re.compile(rf'^(?:what\s+is|what\'s|whats)\s+(?:issue\s+)?{KEY}{END}', re.IGNORECASE), _get_issue),
+    (MY_OPEN_ISSUES, re.compile(
+        rf'^{POLITE}(?:(?:show|list|find|get|give)\s+(?:me\s+)?)?(?:all\s+)?(?:of\s+)?'
+        rf'my\s+(?:(?:open|unresolved|active|pending|outstanding)\s+)?(?:{TYPE_WORDS}){END}', re.IGNORECASE),
+        _my_open_issues),
+    (MY_OPEN_ISSUES, re.compile(
+        rf'^{POLITE}(?:(?:show|list|find|get|give)\s+(?:me\s+)?)?(?:all\s+)?(?:(?:the\s+)?)?'
+        rf'(?:(?:open|unresolved|active|pending|outstanding)\s+)?(?:{TYPE_WORDS})\s+'
+        rf'(?:that\s+are\s+)?assigned\s+to\s+me{END}', re.IGNORECASE), _my_open_issues),
+]
+
+
+def _balanced(text: str) -> bool:
+    return text.count('(') == text.count(')') and text.count('"') % 2 == 0
+
+
+def looks_like_jql(text: str) -> bool:
+    """True for input that starts with a JQL clause, e.g. 'created >= -7d ORDER BY updated'"""
+    return bool(JQL_START.match(text)) and _balanced(text)
+
+
+class IntentRouter:
+    """Deterministic pre-dispatch for structured requests.
+
+    ``route`` returns a Route for inputs that map unambiguously onto one tool call,
+    and None for everything else (which then goes through the LLM agent).
+    """
+
+    def __init__(self, patterns: Optional[List[Tuple[str, Pattern, Callable]]] = None):
+        self.patterns = PATTERNS if patterns is None else patterns
+        self.routed = 0
+        self.fallthrough = 0
+
+    def _jql(self, text: str) -> Optional[str]:
+        prefixed = JQL_PREFIX.match(text)
+        if prefixed:
+            return prefixed.group(1).strip()
+        if looks_like_jql(text):
+            return text.strip()
+        return None
+
+    def _match(self, text: str) -> Optional[Route]:
+        jql = self._jql(text)
+        if jql:
+            return Route(JQL, INTENT_TOOLS[JQL], jql)
+        for intent, pattern, build in self.patterns:
+            match = pattern.match(text)
+            if match:
+                tool_input = build(match)
+                if tool_input:
+                    return Route(intent, INTENT_TOOLS[intent], tool_input)
+        return None
+
+    def route(self, text: str) -> Optional[Route]:
+        route = self._match(' '.join(text.split()))
+        if route:
+            self.routed += 1
+        else:
+            self.fallthrough += 1
+        return route
+
+    def stats(self):
+        total = self.routed + self.fallthrough
+        return {
+            'routed': self.routed,
+            'fallthrough': self.fallthrough,
+            'routed_rate': round(self.routed / total, 3) if total else 0.0,
+        }
@@ -0,0 +1,136 @@
+import json
+import sys
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Slotted dataclasses need Python 3.10; older interpreters fall back to plain ones
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Long descriptions are cut for LLM observations; the full text stays in Jira
+DESCRIPTION_LIMIT = 1500
+TSV_COLUMNS = ('key', 'status', 'priority', 'assignee', 'summary')
+
+
+def loads(data) -> Any:
+    """Parse JSON bytes/str, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> str:
+    """Compact JSON text, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def _raw(issue) -> Dict[str, Any]:
+    # REST dicts from atlassian/httpx/the mirror, or jira.JIRA resources
+    return issue if isinstance(issue, dict) else issue.raw
+
+
+def _name(value, attr: str = 'name') -> Optional[str]:
+    return value.get(attr) if isinstance(value, dict) else value
+
+
+def _clean(text: Optional[str]) -> str:
+    """Single-line, tab-free text for TSV cells"""
+    return ' '.join((text or '').split())
+
+
+def _day(timestamp: Optional[str]) -> str:
+    # '2024-01-31T09:15:00.000+0000' -> '2024-01-31 09:15'
+    return timestamp[:16].replace('T', ' ') if timestamp else ''
+
+
+@dataclass(frozen=True, **_SLOTS)
+class IssueSummary:
+    """The fields a search result needs, parsed once from a REST payload"""
+    key: str
+    summary: str
+    status: str
+    assignee: str
+    priority: str
+
+    @classmethod
+    def from_raw(cls, issue) -> 'IssueSummary':
+        raw = _raw(issue)
+        fields = raw.get('fields') or {}
+        return cls(
+            key=raw['key'],
+            summary=fields.get('summary') or '',
+            status=_name(fields.get('status')) or '',
+            assignee=_name(fields.get('assignee'), 'displayName') or 'Unassigned',
+            priority=_name(fields.get('priority')) or 'None',
+        )
+
+    def line(self) -> str:
+        """KEY | status | priority | assignee | summary"""
+        return ' | '.join((self.key, self.status, self.priority, self.assignee, _clean(self.summary)))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class IssueDetail:
+    """Everything JiraGetIssueTool reports about one issue"""
+    key: str
+    summary: str
+    status: str
+    assignee: str
+    priority: str
+    issue_type: str
+    reporter: str
+    created: str
+    updated: str
+    description: str
+
+    @classmethod
+    def from_raw(cls, issue) -> 'IssueDetail':
+        raw = _raw(issue)
+        fields = raw.get('fields') or {}
+        return cls(
+            key=raw['key'],
+            summary=fields.get('summary') or '',
+            status=_name(fields.get('status')) or '',
+            assignee=_name(fields.get('assignee'), 'displayName') or 'Unassigned',
+            priority=_name(fields.get('priority')) or 'None',
+            issue_type=_name(fields.get('issuetype')) or '',
+            reporter=_name(fields.get('reporter'), 'displayName') or 'Unknown',
+            created=fields.get('created') or '',
+            updated=fields.get('updated') or '',
+            description=fields.get('description') or '',
+        )
+
+    def text(self, description_limit: int = DESCRIPTION_LIMIT) -> str:
+        """A few short labelled lines instead of pretty-printed JSON"""
+        description = (self.description or 'No description').strip()
+        if len(description) > description_limit:
+            description = description[:description_limit - 3] + '...'
+        return (
+            f"{self.key} [{self.issue_type}] {_clean(self.summary)}\n"
+            f"status: {self.status} | priority: {self.priority} | assignee: {self.assignee} | reporter: {self.reporter}\n"
+            f"created: {_day(self.created)} | updated: {_day(self.updated)}\n"
+            f"description: {description}"
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def parse_summaries(issues: Iterable[Any]) -> List[IssueSummary]:
+    return [issue if isinstance(issue, IssueSummary) else IssueSummary.from_raw(issue) for issue in issues]
+
+
+def summary_table(issues: Iterable[IssueSummary]) -> str:
+    """TSV with a header row: column names are paid for once, not once per issue"""
+    rows = ['\t'.join(TSV_COLUMNS)]
+    rows.extend('\t'.join((i.key, i.status, i.priority, i.assignee, _clean(i.summary))) for i in issues)
+    return '\n'.join(rows)
@@ -1,18 +1,14 @@
 import os
 import logging
-from typing import Optional, List, Dict, Any, Type
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from langchain.agents import initialize_agent, AgentType
-from langchain_openai import OpenAI
-from langchain.tools import BaseTool
-from langchain.schema import AgentAction, AgentFinish
-from pydantic import BaseModel, Field
-from atlassian import Jira
-import json
-
-# DEBUG: Check if file is being executed
-print("🚀 Starting JIRA Agent...")
-print("Python is working!")
+from jira_cache import IssueCache, jira_changed_keys
+from jql_cache import JqlResultCache
+from jira_mirror import JiraMirror
+from jira_metadata import JiraMetadata
+from intent_router import IntentRouter
+from instrumentation import configure_from_env, instrumentation
 
 # Load environment variables
 load_dotenv()
@@ -21,258 +17,395 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# LangChain, atlassian, httpx and the tools are imported on first use so the
+# prompt appears before they finish loading
+_TOOL_EXPORTS = {
+    'OllamaLLM', 'TokenStreamHandler', 'ObservationRecorder', 'JiraSearchTool', 'JiraCreateIssueTool', 'JiraUpdateIssueTool',
+    'JiraBulkCreateIssuesTool', 'JiraBulkUpdateIssuesTool', 'JiraGetIssueTool', 'JiraGetIssuesTool',
+    'JiraParallelTool',
+}
+
+def __getattr__(name):
+    """Keep `from jira_agent import JiraSearchTool` working without an eager import"""
+    if name in _TOOL_EXPORTS:
+        import jira_tools
+        return getattr(jira_tools, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 class JiraConfig:
     """Configuration class for JIRA connection"""
-    def __init__(self):
+    def __init__(self, jira_username: str = None, jira_api_token: str = None):
         self.jira_url = os.getenv('JIRA_URL')
-        self.jira_username = os.getenv('JIRA_USERNAME')
-        self.jira_api_token = os.getenv('JIRA_API_TOKEN')
+        # Explicit credentials (e.g. per server user) override the .env ones
+        self.jira_username = jira_username or os.getenv('JIRA_USERNAME')
+        self.jira_api_token = jira_api_token or os.getenv('JIRA_API_TOKEN')
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
+        # 'openai' (default) or 'ollama' for a local model
+        self.llm_provider = os.getenv('LLM_PROVIDER', 'openai').lower()
+        self.ollama_url = os.getenv('OLLAMA_URL')
+        self.ollama_model = os.getenv('OLLAMA_MODEL')
+        # Optional offline mirror: answer searches/lookups from local SQLite
+        self.mirror_db = os.getenv('JIRA_MIRROR_DB')
+        self.mirror_project = os.getenv('JIRA_MIRROR_PROJECT', 'MFLP')
+        # Metadata snapshot for a warm start (empty to disable) and its refresh interval
+        self.metadata_path = os.getenv('JIRA_METADATA_PATH', '.jira_metadata.json') or None
+        self.metadata_refresh = float(os.getenv('JIRA_METADATA_REFRESH', '3600'))
+        # Change feed scope and its persisted cursor (empty path keeps it in memory)
+        self.watch_jql = os.getenv('JIRA_WATCH_JQL', f'project = {self.mirror_project}')
+        self.watch_cursor = os.getenv('JIRA_WATCH_CURSOR', '.jira_watch.json') or None
+        # Local embedding index for plain-language searches (unset disables it)
+        self.semantic_index = os.getenv('JIRA_SEMANTIC_INDEX') or None
+        self.semantic_embedder = os.getenv('SEMANTIC_EMBEDDER', 'hashing')
+        self.semantic_mode = os.getenv('JIRA_SEMANTIC_MODE', 'hybrid')
+        self.semantic_ann = os.getenv('JIRA_SEMANTIC_ANN', '').lower() in ('1', 'true', 'yes')
+        # Conversation memory across run() calls, summarized past this many tokens (0 disables it)
+        self.memory_tokens = int(os.getenv('JIRA_MEMORY_TOKENS', '600'))
+        # ReAct steps per question, and whether the agent may run independent tool calls in one step
+        self.max_iterations = int(os.getenv('JIRA_AGENT_MAX_ITERATIONS', '3'))
+        self.parallel_tools = os.getenv('JIRA_PARALLEL_TOOLS', 'true').lower() in ('1', 'true', 'yes')
+        # Search results per normalized JQL, kept for this many seconds and persisted (empty path keeps them in memory)
+        self.jql_cache_path = os.getenv('JIRA_JQL_CACHE', '.jira_jql_cache.json') or None
+        self.jql_cache_ttl = float(os.getenv('JIRA_JQL_CACHE_TTL', '120'))
         
-        if not all([self.jira_url, self.jira_username, self.jira_api_token, self.openai_api_key]):
+        llm_key = self.openai_api_key if self.llm_provider == 'openai' else True
+        if not all([self.jira_url, self.jira_username, self.jira_api_token, llm_key]):
             raise ValueError("Missing required environment variables. Check your .env file.")
 
-class JiraSearchTool(BaseTool):
-    """Tool for searching JIRA issues"""
-    name: str = "jira_search"
-    description: str = "Search for JIRA issues using JQL (JIRA Query Language). Use this to find specific issues, bugs, or tasks."
+class JiraAgent:
+    """Main JIRA Agent class"""
     
-    def __init__(self, jira_client):
-        super().__init__()
-        self._jira_client = jira_client
+    def __init__(self, session=None, background: bool = False, use_router: bool = True,
+                 config: JiraConfig = None, llm=None, metadata: JiraMetadata = None, verbose: bool = None,
+                 trace: bool = True):
+        self._verbose = (not background) if verbose is None else verbose
+        # verbose=False (server mode) also silences the connection-failure hints
+        self._quiet = verbose is False
+        if not self._quiet:
+            print("📋 Loading configuration...")
+        self.config = config or JiraConfig()
+        self._session = session
+        # A server shares one LLM client across its users' agents (metadata can be shared by single-account callers)
+        self._shared_llm = llm
+        self._shared_metadata = metadata
+        # LangChain's step-by-step trace; front ends that stream tokens turn it off
+        self._trace = trace
+        # Structured requests ("Get details for PROJ-123") skip the LLM entirely
+        self.router = IntentRouter() if use_router else None
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jira-agent-startup")
+        self.connection_check = None
+        self.watcher = None
+        if background:
+            # Heavy imports and agent construction run while the user types
+            self._ready = self._executor.submit(self._initialize)
+        else:
+            self._ready = None
+            self._initialize()
     
-    @property
-    def jira_client(self):
-        return self._jira_client
+    def _step(self, message: str):
+        if self._verbose:
+            print(message)
     
-    def _run(self, query: str) -> str:
-        """Search JIRA issues"""
-        try:
-            # If query doesn't look like JQL, create a simple text search
-            if not any(keyword in query.lower() for keyword in ['project', 'status', 'assignee', 'summary']):
-                jql = f'text ~ "{query}" ORDER BY created DESC'
-            else:
-                jql = query
-            
-            issues = self.jira_client.jql(jql, limit=10)
-            
-            if not issues['issues']:
-                return "No issues found matching your search criteria."
-            
-            result = []
-            for issue in issues['issues']:
-                result.append({
-                    'key': issue['key'],
-                    'summary': issue['fields']['summary'],
-                    'status': issue['fields']['status']['name'],
-                    'assignee': issue['fields']['assignee']['displayName'] if issue['fields']['assignee'] else 'Unassigned',
-                    'priority': issue['fields']['priority']['name'] if issue['fields']['priority'] else 'None'
-                })
-            
-            return json.dumps(result, indent=2)
-        except Exception as e:
-            logger.error(f"Error searching JIRA: {str(e)}")
-            return f"Error searching JIRA: {str(e)}"
-
-class JiraCreateIssueTool(BaseTool):
-    """Tool for creating JIRA issues"""
-    name: str = "jira_create_issue"
-    description: str = "Create a new JIRA issue. Provide project key, issue type, summary, and description."
+    def _initialize(self):
+        """Build clients, caches, LLM, tools and the LangChain agent"""
+        from jira_bulk import JiraBulkOperations
+        from jira_async import AsyncJiraClient
+        
+        self._step("🔗 Connecting to JIRA...")
+        self.jira_client = self._initialize_jira_client(self._session)
+        # The round trip to verify credentials doesn't block startup
+        self.connection_check = self._executor.submit(self._check_connection)
+        # Shared by every async conversation on the event loop (one connection pool)
+        self.async_client = AsyncJiraClient(self.config.jira_url, self.config.jira_username,
+                                            self.config.jira_api_token)
+        self.jql_cache = JqlResultCache(self.config.jql_cache_path, ttl=self.config.jql_cache_ttl)
+        # Any write may move issues in or out of a cached search result
+        self.issue_cache = IssueCache(changed_keys=jira_changed_keys(self.jira_client),
+                                      on_invalidate=self.jql_cache.clear)
+        self.mirror = self._initialize_mirror()
+        self.semantic = self._initialize_semantic()
+        self.metadata = self._shared_metadata or self._initialize_metadata()
+        self.bulk = JiraBulkOperations(self.jira_client, on_write=self._invalidate_issue, metadata=self.metadata)
+        self._step("🤖 Initializing AI...")
+        self.llm = self._shared_llm or self._initialize_llm()
+        self._step("🛠️ Setting up tools...")
+        self.tools = self._initialize_tools()
+        self.tools_by_name = {tool.name: tool for tool in self.tools}
+        self.memory = self._initialize_memory()
+        self._step("⚡ Starting agent...")
+        self.agent = self._initialize_agent()
+        self._step("✅ JIRA Agent ready!")
     
-    def __init__(self, jira_client):
-        super().__init__()
-        self._jira_client = jira_client
+    def wait_ready(self):
+        """Block until background initialization has finished (re-raising its error)"""
+        if self._ready:
+            self._ready.result()
     
-    @property
-    def jira_client(self):
-        return self._jira_client
+    def _initialize_jira_client(self, session=None):
+        """Initialize JIRA client on the shared pooled, rate-limited transport"""
+        from atlassian import Jira
+        from jira_http import build_session
+        
+        return Jira(
+            url=self.config.jira_url,
+            username=self.config.jira_username,
+            password=self.config.jira_api_token,
+            session=session or build_session()
+        )
     
-    def _run(self, issue_data: str) -> str:
-        """Create a new JIRA issue"""
+    def _check_connection(self):
+        """Test connection"""
         try:
-            # Parse the issue data (expect JSON format)
-            data = json.loads(issue_data)
-            
-            issue_dict = {
-                'project': {'key': data.get('project_key', 'TEST')},
-                'summary': data.get('summary', 'New Issue'),
-                'description': data.get('description', ''),
-                'issuetype': {'name': data.get('issue_type', 'Task')},
-            }
-            
-            if data.get('assignee'):
-                issue_dict['assignee'] = {'name': data['assignee']}
-            
-            if data.get('priority'):
-                issue_dict['priority'] = {'name': data['priority']}
-            
-            new_issue = self.jira_client.issue_create(fields=issue_dict)
-            return f"Successfully created issue: {new_issue['key']}"
-            
-        except json.JSONDecodeError:
-            return "Error: Please provide issue data in JSON format"
+            user_info = self.jira_client.myself()
+            logger.info(f"Successfully connected to JIRA as {user_info.get('displayName', 'User')}")
+            return True
         except Exception as e:
-            logger.error(f"Error creating JIRA issue: {str(e)}")
-            return f"Error creating JIRA issue: {str(e)}"
-
-class JiraUpdateIssueTool(BaseTool):
-    """Tool for updating JIRA issues"""
-    name: str = "jira_update_issue"
-    description: str = "Update an existing JIRA issue. Provide issue key and fields to update."
+            logger.error(f"Failed to connect to JIRA: {str(e)}")
+            if not self._quiet:
+                print(f"\n❌ JIRA connection failed: {str(e)}")
+                print("💡 Check your .env file credentials!")
+            return False
     
-    def __init__(self, jira_client):
-        super().__init__()
-        self._jira_client = jira_client
+    def _initialize_llm(self):
+        """Initialize the hosted OpenAI LLM or a local Ollama model"""
+        from jira_tools import InstrumentationCallback
+        if self.config.llm_provider == 'ollama':
+            from ollama_client import OllamaClient
+            from jira_tools import OllamaLLM
+            client = OllamaClient(self.config.ollama_url, self.config.ollama_model, options={'temperature': 0})
+            logger.info(f"Using local Ollama model {client.model} at {client.base_url}")
+            return OllamaLLM(client, callbacks=[InstrumentationCallback(f"ollama:{client.model}")])
+        from langchain_openai import OpenAI
+        return OpenAI(openai_api_key=self.config.openai_api_key, temperature=0, streaming=True,
+                      callbacks=[InstrumentationCallback("openai")])
     
-    @property
-    def jira_client(self):
-        return self._jira_client
+    def _initialize_metadata(self):
+        """Metadata cache with a warm-start snapshot and background refresh"""
+        metadata = JiraMetadata(self.jira_client, self.config.metadata_path)
+        metadata.start_background_refresh(self.config.metadata_refresh)
+        return metadata
     
-    def _run(self, update_data: str) -> str:
-        """Update a JIRA issue"""
+    def _initialize_mirror(self):
+        """Open and sync the offline mirror if JIRA_MIRROR_DB is set"""
+        if not self.config.mirror_db:
+            return None
+        self._step(f"🗄️ Syncing offline mirror of {self.config.mirror_project}...")
+        mirror = JiraMirror(self.config.mirror_db, self.config.mirror_project)
         try:
-            data = json.loads(update_data)
-            issue_key = data.get('issue_key')
-            
-            if not issue_key:
-                return "Error: issue_key is required"
-            
-            update_fields = {}
-            
-            if data.get('summary'):
-                update_fields['summary'] = data['summary']
-            if data.get('description'):
-                update_fields['description'] = data['description']
-            if data.get('assignee'):
-                update_fields['assignee'] = {'name': data['assignee']}
-            if data.get('status'):
-                # For status updates, we need to use transitions
-                return self._transition_issue(issue_key, data['status'])
-            
-            if update_fields:
-                self.jira_client.issue_update(issue_key, fields=update_fields)
-                return f"Successfully updated issue: {issue_key}"
-            else:
-                return "No valid fields provided for update"
-                
-        except json.JSONDecodeError:
-            return "Error: Please provide update data in JSON format"
+            mirror.sync(self.jira_client)
         except Exception as e:
-            logger.error(f"Error updating JIRA issue: {str(e)}")
-            return f"Error updating JIRA issue: {str(e)}"
+            logger.error(f"Mirror sync failed, serving possibly stale data: {str(e)}")
+        return mirror
     
-    def _transition_issue(self, issue_key: str, new_status: str) -> str:
-        """Transition issue to new status"""
+    def _initialize_semantic(self):
+        """Load the embedding index if JIRA_SEMANTIC_INDEX is set and refresh it in the background"""
+        if not self.config.semantic_index:
+            return None
+        from semantic_index import SemanticIndex, make_embedder
+        index = SemanticIndex(make_embedder(self.config.semantic_embedder), self.config.semantic_index,
+                              use_ann=self.config.semantic_ann)
+        self._executor.submit(self._sync_semantic, index)
+        return index
+    
+    def _sync_semantic(self, index):
+        """Embed new or edited issues (unchanged text is skipped) and save the index"""
+        from jira_search import search_issues
+        from semantic_index import INDEX_FIELDS
+        started = time.time()
         try:
-            transitions = self.jira_client.get_issue_transitions(issue_key)
-            
-            for transition in transitions['transitions']:
-                if transition['name'].lower() == new_status.lower():
-                    self.jira_client.issue_transition(issue_key, transition['id'])
-                    return f"Successfully transitioned {issue_key} to {new_status}"
-            
-            return f"Status '{new_status}' not available for issue {issue_key}"
+            if self.mirror:
+                issues = self.mirror.recent()
+            else:
+                # A saved index only needs the issues edited since it was last synced
+                jql = index.sync_jql(self.config.watch_jql, started)
+                issues = search_issues(self.jira_client, jql, fields=INDEX_FIELDS)
+            embedded = index.upsert(issues)
+            index.synced_at = started
+            logger.info(f"Semantic index: {embedded} issues embedded, {len(index)} indexed")
+            index.save()
         except Exception as e:
-            return f"Error transitioning issue: {str(e)}"
-
-class JiraGetIssueTool(BaseTool):
-    """Tool for getting detailed information about a specific JIRA issue"""
-    name: str = "jira_get_issue"
-    description: str = "Get detailed information about a specific JIRA issue by its key (e.g., PROJ-123)."
+            logger.error(f"Semantic index sync failed, searching what is indexed: {str(e)}")
     
-    def __init__(self, jira_client):
-        super().__init__()
-        self._jira_client = jira_client
+    def _invalidate_issue(self, issue_key: str):
+        """Drop cached copies of an issue written by a bulk operation"""
+        self.issue_cache.invalidate(issue_key)
+        if self.mirror:
+            self.mirror.forget(issue_key)
     
-    @property
-    def jira_client(self):
-        return self._jira_client
+    def watch(self, on_change=None, interval: float = None, jql: str = None):
+        """Change feed for JIRA_WATCH_JQL (created once); polls in the background if ``interval`` is set.
+        
+        Changed issues are dropped from the caches before subscribers hear about them.
+        """
+        from jira_watch import WATCH_FIELDS, IssueWatcher
+        self.wait_ready()
+        if self.watcher is None:
+            # The embedding index needs descriptions to re-embed edited issues
+            fields = WATCH_FIELDS + ['description'] if self.semantic else WATCH_FIELDS
+            self.watcher = IssueWatcher(self.jira_client, jql or self.config.watch_jql, self.config.watch_cursor,
+                                        fields=fields)
+            self.watcher.subscribe(self._on_change)
+            if self.semantic:
+                self.watcher.subscribe(self.semantic.on_change)
+        if on_change:
+            self.watcher.subscribe(on_change)
+        if interval:
+            self.watcher.start(interval)
+        return self.watcher
     
-    def _run(self, issue_key: str) -> str:
-        """Get detailed issue information"""
-        try:
-            issue = self.jira_client.issue(issue_key)
-            
-            issue_info = {
-                'key': issue['key'],
-                'summary': issue['fields']['summary'],
-                'description': issue['fields']['description'] or 'No description',
-                'status': issue['fields']['status']['name'],
-                'assignee': issue['fields']['assignee']['displayName'] if issue['fields']['assignee'] else 'Unassigned',
-                'reporter': issue['fields']['reporter']['displayName'],
-                'priority': issue['fields']['priority']['name'] if issue['fields']['priority'] else 'None',
-                'created': issue['fields']['created'],
-                'updated': issue['fields']['updated'],
-                'issue_type': issue['fields']['issuetype']['name']
-            }
-            
-            return json.dumps(issue_info, indent=2)
-            
-        except Exception as e:
-            logger.error(f"Error getting JIRA issue: {str(e)}")
-            return f"Error getting JIRA issue: {str(e)}"
-
-class JiraAgent:
-    """Main JIRA Agent class"""
+    def _on_change(self, change):
+        self._invalidate_issue(change.key)
+        # A changed issue may be in another status, so its transitions may differ too
+        self.metadata.transitioned(change.key)
     
-    def __init__(self):
-        print("📋 Loading configuration...")
-        self.config = JiraConfig()
-        print("🔗 Connecting to JIRA...")
-        self.jira_client = self._initialize_jira_client()
-        print("🤖 Initializing AI...")
-        self.llm = OpenAI(openai_api_key=self.config.openai_api_key, temperature=0)
-        print("🛠️ Setting up tools...")
-        self.tools = self._initialize_tools()
-        print("⚡ Starting agent...")
-        self.agent = self._initialize_agent()
-        print("✅ JIRA Agent ready!")
+    def _initialize_memory(self):
+        """Conversation memory whose older turns are summarized by the agent's LLM"""
+        if self.config.memory_tokens <= 0:
+            return None
+        from agent_memory import ConversationMemory
+        return ConversationMemory(summarize=self.llm.invoke, token_budget=self.config.memory_tokens)
     
-    def _initialize_jira_client(self):
-        """Initialize JIRA client"""
-        try:
-            jira = Jira(
-                url=self.config.jira_url,
-                username=self.config.jira_username,
-                password=self.config.jira_api_token
-            )
-            # Test connection
-            user_info = jira.myself()
-            logger.info(f"Successfully connected to JIRA as {user_info.get('displayName', 'User')}")
-            return jira
-        except Exception as e:
-            logger.error(f"Failed to connect to JIRA: {str(e)}")
-            print(f"❌ JIRA connection failed: {str(e)}")
-            print("💡 Check your .env file credentials!")
-            raise
+    def _remember(self, query: str, response: str, steps):
+        """Record a finished turn; older turns are summarized off the request path"""
+        if self.memory and self.memory.record(query, response, steps):
+            self._executor.submit(self.memory.compact)
+    
+    def _callbacks(self, on_token):
+        """Streaming callbacks plus an observation recorder for the memory"""
+        from jira_tools import ObservationRecorder
+        recorder = ObservationRecorder() if self.memory else None
+        callbacks = (self._stream_callbacks(on_token) or []) + ([recorder] if recorder else [])
+        return callbacks or None, recorder
+    
+    def reset_memory(self):
+        """Start a new conversation"""
+        if self.memory:
+            self.memory.clear()
     
     def _initialize_tools(self):
         """Initialize all JIRA tools"""
-        return [
-            JiraSearchTool(self.jira_client),
-            JiraCreateIssueTool(self.jira_client),
-            JiraUpdateIssueTool(self.jira_client),
-            JiraGetIssueTool(self.jira_client)
+        from jira_tools import (JiraSearchTool, JiraCreateIssueTool, JiraUpdateIssueTool, JiraGetIssueTool,
+                                JiraGetIssuesTool, JiraBulkCreateIssuesTool, JiraBulkUpdateIssuesTool,
+                                JiraParallelTool)
+        tools = [
+            JiraSearchTool(self.jira_client, self.mirror, self.async_client, self.semantic, self.jql_cache,
+                           semantic_mode=self.config.semantic_mode),
+            JiraCreateIssueTool(self.jira_client, self.issue_cache, self.async_client, self.metadata),
+            JiraUpdateIssueTool(self.jira_client, self.issue_cache, self.mirror, self.async_client, self.metadata),
+            JiraGetIssueTool(self.jira_client, self.issue_cache, self.mirror, self.async_client),
+            JiraGetIssuesTool(self.jira_client, self.issue_cache, self.mirror, self.async_client),
+            JiraBulkCreateIssuesTool(self.bulk),
+            JiraBulkUpdateIssuesTool(self.bulk)
         ]
+        if self.config.parallel_tools:
+            # Lets one ReAct step dispatch several independent calls instead of one per iteration
+            tools.append(JiraParallelTool(tools))
+        return tools
     
     def _initialize_agent(self):
         """Initialize the LangChain agent"""
+        from langchain.agents import initialize_agent, AgentType
         return initialize_agent(
             tools=self.tools,
             llm=self.llm,
             agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
-            verbose=True,
-            max_iterations=3
+            verbose=self._trace,
+            max_iterations=self.config.max_iterations
         )
     
-    def run(self, query: str) -> str:
-        """Run the agent with a query"""
+    def _route(self, query: str):
+        """Tool and input for a query the router recognizes, or None to use the agent"""
+        route = self.router.route(query) if self.router else None
+        if route is None:
+            return None
+        logger.info(f"Routed to {route.tool} ({route.intent}) without the LLM")
+        return self.tools_by_name[route.tool], route.tool_input
+    
+    def stats(self) -> dict:
+        """Counters of the transport and cache layers"""
+        from jira_http import session_stats
+        self.wait_ready()
+        return {
+            'http': session_stats(self.jira_client.session),
+            'async_http': {'requests': self.async_client.requests, 'retries': self.async_client.retries},
+            'issue_cache': self.issue_cache.stats(),
+            'jql_cache': self.jql_cache.stats(),
+            'metadata': self.metadata.stats(),
+            'router': self.router.stats() if self.router else {},
+            'watch': self.watcher.stats() if self.watcher else {},
+            'semantic': self.semantic.stats() if self.semantic else {},
+            'memory': self.memory.stats() if self.memory else {},
+        }
+    
+    def stats_report(self) -> str:
+        """Latency/size/token table per tool, Jira endpoint and LLM, followed by layer counters"""
+        lines = [instrumentation.format_stats(), ""]
+        lines.extend(f"{name}: {values}" for name, values in self.stats().items())
+        return "\n".join(lines)
+    
+    def _stream_callbacks(self, on_token):
+        """Per-run callbacks sending tokens to ``on_token`` (None when not streaming)"""
+        if on_token is None:
+            return None
+        from jira_tools import TokenStreamHandler
+        return [TokenStreamHandler(on_token)]
+    
+    def run(self, query: str, on_token=None) -> str:
+        """Run the agent with a query, passing LLM tokens to ``on_token`` as they arrive"""
+        try:
+            self.wait_ready()
+            # "assign it to me" -> "assign PROJ-123 to me" when PROJ-123 is the issue under discussion
+            query = self.memory.resolve(query) if self.memory else query
+            routed = self._route(query)
+            if routed:
+                tool, tool_input = routed
+                response = tool._run(tool_input)
+                self._remember(query, response, [(tool.name, tool_input, response)])
+                return response
+            callbacks, recorder = self._callbacks(on_token)
+            agent_input = self.memory.prompt(query) if self.memory else query
+            response = self.agent.run(agent_input, callbacks=callbacks)
+            self._remember(query, response, recorder.steps if recorder else [])
+            return response
+        except Exception as e:
+            logger.error(f"Error running agent: {str(e)}")
+            return f"Error: {str(e)}"
+    
+    async def arun(self, query: str, on_token=None) -> str:
+        """Run the agent with a query on the event loop (tools use their _arun paths)"""
+        import asyncio
         try:
-            response = self.agent.run(query)
+            await asyncio.to_thread(self.wait_ready)
+            query = self.memory.resolve(query) if self.memory else query
+            routed = self._route(query)
+            if routed:
+                tool, tool_input = routed
+                response = await tool._arun(tool_input)
+                self._remember(query, response, [(tool.name, tool_input, response)])
+                return response
+            callbacks, recorder = self._callbacks(on_token)
+            agent_input = self.memory.prompt(query) if self.memory else query
+            response = await self.agent.arun(agent_input, callbacks=callbacks)
+            self._remember(query, response, recorder.steps if recorder else [])
             return response
         except Exception as e:
             logger.error(f"Error running agent: {str(e)}")
             return f"Error: {str(e)}"
+    
+    def close(self):
+        """Stop the startup/connection-check and metadata threads and save the embedding index and search results"""
+        self._executor.shutdown(wait=False)
+        if self._shared_metadata is None and getattr(self, 'metadata', None):
+            self.metadata.stop()
+        if getattr(self, 'jql_cache', None):
+            self.jql_cache.save()
+        if getattr(self, 'semantic', None):
+            self.semantic.save()
+    
+    async def aclose(self):
+        """Close the async Jira connection pool"""
+        import asyncio
+        await asyncio.to_thread(self.wait_ready)
+        await self.async_client.aclose()
 
 def main():
     """Main function to run the JIRA agent"""
@@ -281,8 +414,10 @@ def main():
         print("🤖 JIRA AI AGENT")
         print("=" * 50)
         
-        # Initialize the agent
-        agent = JiraAgent()
+        configure_from_env()
+        # Initialize the agent in the background so the prompt shows immediately;
+        # tokens are streamed below, so LangChain's own trace would print everything twice
+        agent = JiraAgent(background=True, trace=False)
         
         print("\n" + "=" * 50)
         print("🎉 JIRA Agent is ready!")
@@ -292,6 +427,9 @@ def main():
         print("💡 Get issue details: 'Get details for PROJ-123'") 
         print("💡 Create issues: 'Create a new task for user authentication'")
         print("💡 Update issues: 'Update PROJ-123 status to In Progress'")
+        print("💡 Follow up naturally: 'Now assign it to me' - type 'reset' to start over")
+        print("💡 Type 'changes' to see what changed in Jira since you last looked")
+        print("💡 Type 'stats' for timings of tools, Jira calls and LLM calls")
         print("💡 Type 'quit' to exit")
         print("=" * 50 + "\n")
         
@@ -304,11 +442,27 @@ def main():
             
             if not user_input:
                 continue
+            
+            if user_input.lower() == 'stats':
+                print(agent.stats_report())
+                continue
+            
+            if user_input.lower() == 'reset':
+                agent.reset_memory()
+                print("🧹 Conversation memory cleared")
+                continue
+            
+            if user_input.lower() == 'changes':
+                changes = agent.watch().poll_once()
+                for change in changes:
+                    print(f"  {change.kind:<8} {change.describe()}")
+                print(f"🔔 {len(changes)} change(s)")
+                continue
                 
             print("\n🤖 Agent is thinking...")
             print("-" * 30)
-            response = agent.run(user_input)
-            print(f"\n💬 Response: {response}")
+            response = agent.run(user_input, on_token=lambda token: print(token, end="", flush=True))
+            print(f"\n\n💬 Response: {response}")
             print("\n" + "=" * 50)
     
     except KeyboardInterrupt:
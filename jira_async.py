@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import random
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import httpx
+
+from jira_http import (DEFAULT_BACKOFF, DEFAULT_MAX_RETRIES, DEFAULT_POOL_SIZE, MAX_BACKOFF,
+                       RETRY_STATUSES, TokenBucket, retry_after_seconds, shared_rate_limiter)
+from jira_search import DEFAULT_PAGE_SIZE
+from instrumentation import endpoint, span
+from issue_model import loads
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncJiraClient:
+    """Minimal asyncio Jira REST client covering the calls the agent tools make.
+
+    Method names and return shapes follow atlassian.Jira so tools can share their
+    formatting code between ``_run`` and ``_arun``. One instance holds a single
+    httpx connection pool that all concurrent conversations on the loop share.
+    """
+
+    def __init__(self, url: str, username: str, api_token: str,
+                 pool_size: int = DEFAULT_POOL_SIZE, max_retries: int = DEFAULT_MAX_RETRIES,
+                 rate_limiter: Optional[TokenBucket] = None, timeout: float = 30.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or shared_rate_limiter()
+        self.requests = 0
+        self.retries = 0
+        self._client = httpx.AsyncClient(
+            base_url=url.rstrip('/'),
+            auth=(username, api_token),
+            headers={'Accept': 'application/json', 'Accept-Encoding': 'gzip, deflate'},
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=timeout,
+            transport=transport
+        )
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def request(self, method: str, path: str, **kwargs) -> Any:
+        """Send a request with rate limiting and 429/503 backoff, returning decoded JSON"""
+        with span('jira', endpoint(method, '/' + path.lstrip('/')), mode='async') as s:
+            response = await self._send_with_retries(method, path, s, **kwargs)
+            s.bytes = len(response.content)
+            s.ok = response.status_code < 400
+            s.attributes['status'] = response.status_code
+            response.raise_for_status()
+            return loads(response.content) if response.content else None
+
+    async def _send_with_retries(self, method: str, path: str, s, **kwargs) -> httpx.Response:
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire_async()
+            response = await self._client.request(method, '/' + path.lstrip('/'), **kwargs)
+            self.requests += 1
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = DEFAULT_BACKOFF * (2 ** attempt) * (0.5 + random.random())
+                delay = min(delay, MAX_BACKOFF)
+                logger.warning(f"Jira returned {response.status_code} for {method} {path}, "
+                               f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+                self.retries += 1
+                s.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            return response
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        return await self.request('GET', path, params=params)
+
+    async def post(self, path: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        return await self.request('POST', path, json=data)
+
+    async def put(self, path: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        return await self.request('PUT', path, json=data)
+
+    # --- atlassian.Jira compatible helpers ---
+    async def myself(self) -> Dict[str, Any]:
+        return await self.get('rest/api/2/myself')
+
+    async def jql(self, jql: str, fields: Optional[str] = None, start: int = 0,
+                  limit: Optional[int] = None) -> Dict[str, Any]:
+        params = {'jql': jql, 'startAt': start}
+        if limit is not None:
+            params['maxResults'] = limit
+        if fields:
+            params['fields'] = fields
+        return await self.get('rest/api/2/search', params=params)
+
+    async def issue(self, key: str, fields: Optional[str] = None) -> Dict[str, Any]:
+        return await self.get(f'rest/api/2/issue/{key}', params={'fields': fields} if fields else None)
+
+    async def issue_create(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.post('rest/api/2/issue', data={'fields': fields})
+
+    async def issue_update(self, issue_key: str, fields: Dict[str, Any]) -> Any:
+        return await self.put(f'rest/api/2/issue/{issue_key}', data={'fields': fields})
+
+    async def get_issue_transitions(self, issue_key: str) -> Dict[str, Any]:
+        return await self.get(f'rest/api/2/issue/{issue_key}/transitions')
+
+    async def post_transition(self, issue_key: str, transition_id) -> Any:
+        return await self.post(f'rest/api/2/issue/{issue_key}/transitions',
+                               data={'transition': {'id': str(transition_id)}})
+
+
+class AsyncIssueStream:
+    """Async counterpart of jira_search.IssueStream: pages lazily, prefetching the next page as a task"""
+
+    def __init__(self, client: AsyncJiraClient, jql: str, fields: Optional[Sequence[str]] = None,
+                 limit: Optional[int] = None, page_size: int = DEFAULT_PAGE_SIZE):
+        self.client = client
+        self.jql = jql
+        self.fields = ','.join(fields) if fields else None
+        self.limit = limit
+        self.page_size = page_size
+        self.total: Optional[int] = None
+
+    def _page_size_at(self, start_at: int) -> int:
+        if self.limit is None:
+            return self.page_size
+        return max(0, min(self.page_size, self.limit - start_at))
+
+    async def _fetch_page(self, start_at: int):
+        page = await self.client.jql(self.jql, fields=self.fields, start=start_at,
+                                     limit=self._page_size_at(start_at))
+        return page.get('issues', []), page.get('total', 0)
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        if self._page_size_at(0) == 0:
+            return
+        start_at = 0
+        pending = asyncio.ensure_future(self._fetch_page(start_at))
+        try:
+            while True:
+                issues, total = await pending
+                self.total = total
+                next_start = start_at + len(issues)
+                has_more = bool(issues) and next_start < total and self._page_size_at(next_start) > 0
+                if has_more:
+                    pending = asyncio.ensure_future(self._fetch_page(next_start))
+                for issue in issues:
+                    yield issue
+                if not has_more:
+                    return
+                start_at = next_start
+        finally:
+            if not pending.done():
+                pending.cancel()
+
+
+async def collect(stream: AsyncIssueStream) -> List[Dict[str, Any]]:
+    return [issue async for issue in stream]
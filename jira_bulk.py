@@ -0,0 +1,269 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from jira_search import search_issues
+
+logger = logging.getLogger(__name__)
+
+# Jira rejects bulk create requests with more than 50 issues
+BULK_CREATE_CHUNK_SIZE = 50
+DEFAULT_MAX_WORKERS = 8
+KEY_BATCH_SIZE = 100
+
+
+def build_issue_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map the tools' JSON issue format onto Jira create fields"""
+    fields = {
+        'project': {'key': data.get('project_key', 'TEST')},
+        'summary': data.get('summary', 'New Issue'),
+        'description': data.get('description', ''),
+        'issuetype': {'name': data.get('issue_type', 'Task')},
+    }
+    if data.get('assignee'):
+        fields['assignee'] = {'name': data['assignee']}
+    if data.get('priority'):
+        fields['priority'] = {'name': data['priority']}
+    return fields
+
+
+def build_update_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map the tools' JSON update format onto Jira edit fields (status is handled separately)"""
+    fields = {}
+    if data.get('summary'):
+        fields['summary'] = data['summary']
+    if data.get('description'):
+        fields['description'] = data['description']
+    if data.get('assignee'):
+        fields['assignee'] = {'name': data['assignee']}
+    return fields
+
+
+def transition_list(transitions) -> List[Dict[str, Any]]:
+    """Normalize get_issue_transitions output (raw REST dict or atlassian's flattened list)"""
+    if isinstance(transitions, dict):
+        return transitions.get('transitions', [])
+    return transitions or []
+
+
+def post_transition(client, issue_key: str, transition_id) -> None:
+    """Transition by id directly, without the client re-listing transitions"""
+    client.post(f'rest/api/2/issue/{issue_key}/transitions',
+                data={'transition': {'id': str(transition_id)}})
+
+
+def _stats(results: List[Dict[str, Any]], started: float) -> Dict[str, Any]:
+    seconds = time.perf_counter() - started
+    succeeded = sum(1 for r in results if r['ok'])
+    return {
+        'count': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'seconds': round(seconds, 3),
+        'items_per_sec': round(len(results) / seconds, 1) if seconds > 0 else None,
+    }
+
+
+class TransitionCache:
+    """Memoizes transition name -> id per (project, issue type, current status)"""
+
+    def __init__(self):
+        self._transitions: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+
+    def peek(self, scope: Tuple[str, str, str]) -> Optional[Dict[str, str]]:
+        with self._lock:
+            cached = self._transitions.get(scope)
+            if cached is not None:
+                self.hits += 1
+            return cached
+
+    def put(self, scope: Tuple[str, str, str], transitions) -> Dict[str, str]:
+        """Store a get_issue_transitions result (any shape) and return it as name -> id"""
+        names = {t['name'].lower(): t['id'] for t in transition_list(transitions)}
+        with self._lock:
+            self.lookups += 1
+            self._transitions[scope] = names
+        return names
+
+    def forget(self, scope: Tuple[str, str, str]):
+        with self._lock:
+            self._transitions.pop(scope, None)
+
+    def snapshot(self) -> Dict[Tuple[str, str, str], Dict[str, str]]:
+        with self._lock:
+            return dict(self._transitions)
+
+    def restore(self, entries: Dict[Tuple[str, str, str], Dict[str, str]]):
+        with self._lock:
+            self._transitions.update(entries)
+
+    def get(self, client, issue_key: str, scope: Tuple[str, str, str]) -> Dict[str, str]:
+        cached = self.peek(scope)
+        if cached is not None:
+            return cached
+        return self.put(scope, client.get_issue_transitions(issue_key))
+
+
+class JiraBulkOperations:
+    """Batch create/update/transition with per-item results and throughput stats"""
+
+    def __init__(self, jira_client, max_workers: int = DEFAULT_MAX_WORKERS,
+                 chunk_size: int = BULK_CREATE_CHUNK_SIZE,
+                 on_write: Optional[Callable[[str], None]] = None, metadata=None):
+        self.jira_client = jira_client
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.on_write = on_write
+        # Optional jira_metadata.JiraMetadata: validates names locally and shares its transition cache
+        self.metadata = metadata
+        self.transitions = metadata.transitions if metadata else TransitionCache()
+
+    def _written(self, issue_key: str):
+        if self.on_write:
+            self.on_write(issue_key)
+
+    def _resolve(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return self.metadata.resolve_fields(fields) if self.metadata and fields else fields
+
+    def _map(self, fn, items: Sequence[Any]) -> List[Dict[str, Any]]:
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='jira-bulk') as pool:
+            return list(pool.map(fn, range(len(items)), items))
+
+    # --- Create ---
+    def create_issues(self, items: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create issues through /rest/api/2/issue/bulk, one request per chunk"""
+        started = time.perf_counter()
+        chunks = [list(range(i, min(i + self.chunk_size, len(items))))
+                  for i in range(0, len(items), self.chunk_size)]
+
+        def create_chunk(_, indexes):
+            return self._create_chunk(items, indexes)
+
+        results = [r for chunk in self._map(create_chunk, chunks) for r in chunk]
+        return {'results': results, 'stats': _stats(results, started)}
+
+    def _create_chunk(self, items, indexes: List[int]) -> List[Dict[str, Any]]:
+        results = {}
+        payload = []
+        for index in indexes:
+            try:
+                payload.append((index, {'fields': self._resolve(build_issue_fields(items[index]))}))
+            except Exception as e:
+                results[index] = {'index': index, 'ok': False, 'error': str(e)}
+
+        try:
+            response = self.jira_client.post('rest/api/2/issue/bulk',
+                                             data={'issueUpdates': [p for _, p in payload]}) or {}
+        except Exception as e:
+            logger.error(f"Bulk create chunk failed: {str(e)}")
+            for index, _ in payload:
+                results[index] = {'index': index, 'ok': False, 'error': str(e)}
+            return [results[i] for i in indexes]
+
+        # Jira reports failures by position within the submitted chunk
+        failed = {}
+        for error in response.get('errors', []):
+            position = error.get('failedElementNumber')
+            details = error.get('elementErrors', {})
+            failed[position] = '; '.join(list(details.get('errorMessages', [])) +
+                                         [f"{k}: {v}" for k, v in details.get('errors', {}).items()]) or 'Unknown error'
+
+        created = iter(response.get('issues', []))
+        for position, (index, _) in enumerate(payload):
+            if position in failed:
+                results[index] = {'index': index, 'ok': False, 'error': failed[position]}
+                continue
+            issue = next(created, None)
+            if issue is None:
+                results[index] = {'index': index, 'ok': False, 'error': 'No issue returned by bulk create'}
+                continue
+            self._written(issue['key'])
+            results[index] = {'index': index, 'ok': True, 'issue_key': issue['key']}
+        return [results[i] for i in indexes]
+
+    # --- Update / transition ---
+    def update_issues(self, items: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply field edits and status transitions concurrently"""
+        started = time.perf_counter()
+        scopes = self._transition_scopes(
+            [item.get('issue_key') for item in items if item.get('status') and item.get('issue_key')]
+        )
+        results = self._map(lambda index, item: self._update_one(index, item, scopes), items)
+        stats = _stats(results, started)
+        stats['transition_lookups'] = self.transitions.lookups
+        stats['transition_cache_hits'] = self.transitions.hits
+        return {'results': results, 'stats': stats}
+
+    def transition_issues(self, items: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """Transition many issues, items look like {"issue_key": ..., "status": ...}"""
+        return self.update_issues([{'issue_key': i.get('issue_key'), 'status': i.get('status')} for i in items])
+
+    def _transition_scopes(self, issue_keys: List[str]) -> Dict[str, Tuple[str, str, str]]:
+        """Fetch project/type/status for all keys with batched JQL instead of per-issue GETs"""
+        scopes = {}
+        keys = sorted({key.upper() for key in issue_keys})
+        for i in range(0, len(keys), KEY_BATCH_SIZE):
+            batch = keys[i:i + KEY_BATCH_SIZE]
+            try:
+                self._add_scopes(scopes, f'key in ({",".join(batch)})')
+            except Exception as e:
+                # Jira rejects the whole query when one key does not exist or is not visible
+                logger.info(f"Batched scope lookup failed ({str(e)}), looking up {len(batch)} keys one by one")
+                for key in batch:
+                    try:
+                        self._add_scopes(scopes, f'key = {key}')
+                    except Exception as e:
+                        # No scope: the item itself reports the bad key
+                        logger.info(f"No transition scope for {key}: {str(e)}")
+        return scopes
+
+    def _add_scopes(self, scopes: Dict[str, Tuple[str, str, str]], jql: str):
+        for issue in search_issues(self.jira_client, jql, fields=['project', 'issuetype', 'status']):
+            fields = issue['fields']
+            scopes[issue['key']] = (fields['project']['key'], fields['issuetype']['name'],
+                                    fields['status']['name'])
+
+    def _update_one(self, index: int, item: Dict[str, Any], scopes) -> Dict[str, Any]:
+        issue_key = item.get('issue_key')
+        result = {'index': index, 'issue_key': issue_key, 'ok': False}
+        if not issue_key:
+            result['error'] = 'issue_key is required'
+            return result
+        updated = False
+        try:
+            fields = self._resolve(build_update_fields(item))
+            if fields:
+                self.jira_client.issue_update(issue_key, fields=fields)
+                updated = True
+            if item.get('status'):
+                self._transition(issue_key, item['status'], scopes.get(issue_key.upper()))
+            elif not fields:
+                result['error'] = 'No valid fields provided for update'
+                return result
+            self._written(issue_key)
+            result['ok'] = True
+        except Exception as e:
+            result['error'] = str(e)
+            if updated:
+                # The field edit went through even though the transition failed
+                self._written(issue_key)
+        return result
+
+    def _transition(self, issue_key: str, status: str, scope: Optional[Tuple[str, str, str]]):
+        scope = scope or ('', '', issue_key.upper())
+        transition_id = self.transitions.get(self.jira_client, issue_key, scope).get(status.lower())
+        if transition_id is None:
+            # Workflow conditions can differ per issue - check this one before giving up
+            transitions = {t['name'].lower(): t['id']
+                           for t in transition_list(self.jira_client.get_issue_transitions(issue_key))}
+            transition_id = transitions.get(status.lower())
+            if transition_id is None:
+                raise ValueError(f"Status '{status}' not available for issue {issue_key}")
+        post_transition(self.jira_client, issue_key, transition_id)
+        if self.metadata:
+            self.metadata.transitioned(issue_key)
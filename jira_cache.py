@@ -0,0 +1,176 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from jira_search import search_issues
+
+logger = logging.getLogger(__name__)
+
+# JQL "key in (...)" lists are kept short so the query string stays well under URL limits
+REVALIDATE_BATCH_SIZE = 100
+
+# changed_keys(keys, since_epoch_seconds) -> keys updated on the server since then
+ChangedKeys = Callable[[Iterable[str], float], Set[str]]
+
+
+def _issue_key(issue) -> str:
+    return issue['key'] if isinstance(issue, dict) else issue.key
+
+
+def jira_changed_keys(client) -> ChangedKeys:
+    """Build a ChangedKeys callable that asks Jira which keys changed, one JQL per batch"""
+    def changed_keys(keys: Iterable[str], since: float) -> Set[str]:
+        keys = sorted(set(keys))
+        # Relative JQL dates sidestep server/user timezone differences; round up so
+        # minute granularity never hides an edit
+        minutes = max(1, math.ceil((time.time() - since) / 60) + 1)
+        changed = set()
+        for i in range(0, len(keys), REVALIDATE_BATCH_SIZE):
+            batch = keys[i:i + REVALIDATE_BATCH_SIZE]
+            jql = f'key in ({",".join(batch)}) AND updated >= "-{minutes}m"'
+            for issue in search_issues(client, jql, fields=['updated'], prefetch=False):
+                changed.add(_issue_key(issue))
+        return changed
+    return changed_keys
+
+
+class IssueCache:
+    """Bounded LRU + TTL cache for issue payloads, shared by both agents.
+
+    Entries older than ``ttl`` seconds are not refetched one by one; instead every
+    stale entry is revalidated with a single batched ``key in (...) AND updated``
+    JQL and only the issues that actually changed are dropped.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 300,
+                 changed_keys: Optional[ChangedKeys] = None,
+                 clock: Callable[[], float] = time.time,
+                 on_invalidate: Optional[Callable[[], None]] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.changed_keys = changed_keys
+        self.clock = clock
+        # Called after every write-driven invalidation (e.g. to drop cached search results)
+        self.on_invalidate = on_invalidate
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _normalize(key: str) -> str:
+        return key.strip().upper()
+
+    def get(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Return the cached payload for ``key``, calling ``fetch()`` on a miss"""
+        key = self._normalize(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            stale = entry is not None and self.clock() - entry[1] >= self.ttl
+        if stale:
+            # Outside the lock: the JQL round trip must not block other readers
+            self._revalidate_stale()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and self.clock() - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        payload = fetch()
+        self.put(key, payload)
+        return payload
+
+    def lookup(self, key: str) -> Optional[Any]:
+        """A fresh entry served as a read, without fetching or revalidating (used by async callers)"""
+        key = self._normalize(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and self.clock() - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def peek(self, key: str) -> Optional[Any]:
+        """A fresh entry for internal use (e.g. transition scopes); leaves hit/miss stats and LRU order alone"""
+        key = self._normalize(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and self.clock() - entry[1] < self.ttl:
+                return entry[0]
+            return None
+
+    def put(self, key: str, payload: Any):
+        """Store a freshly fetched payload"""
+        key = self._normalize(key)
+        with self._lock:
+            self._entries[key] = (payload, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: str):
+        """Drop entries after a write so the next read goes to the server"""
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(self._normalize(key), None) is not None:
+                    self.invalidations += 1
+        if self.on_invalidate:
+            self.on_invalidate()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _revalidate_stale(self):
+        """Snapshot stale entries under the lock, ask Jira without it, then apply the answer"""
+        with self._lock:
+            now = self.clock()
+            stale = {key: fetched_at for key, (_, fetched_at) in self._entries.items()
+                     if now - fetched_at >= self.ttl}
+            if not stale:
+                return
+            if not self.changed_keys:
+                for key in stale:
+                    del self._entries[key]
+                return
+
+        try:
+            changed = self.changed_keys(stale.keys(), min(stale.values()))
+        except Exception as e:
+            logger.error(f"Error revalidating issue cache: {str(e)}")
+            changed = set(stale)
+
+        with self._lock:
+            self.revalidations += 1
+            for key, fetched_at in stale.items():
+                entry = self._entries.get(key)
+                # Refetched or invalidated while Jira was answering: that newer state wins
+                if entry is None or entry[1] != fetched_at:
+                    continue
+                if key in changed:
+                    del self._entries[key]
+                else:
+                    self._entries[key] = (entry[0], now)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'revalidations': self.revalidations,
+                'invalidations': self.invalidations,
+            }
@@ -0,0 +1,325 @@
+import csv
+import importlib.util
+import json
+import logging
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from instrumentation import span
+from jira_search import DEFAULT_PAGE_SIZE, PageFetcher, page_fetcher
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FIELDS = ['summary', 'status', 'priority', 'issuetype', 'assignee', 'reporter', 'project',
+                 'created', 'updated', 'resolutiondate', 'labels', 'components', 'fixVersions', 'description']
+# Written as UTC timestamps in Parquet (ISO strings in CSV)
+DATE_FIELDS = ('created', 'updated', 'resolutiondate')
+DEFAULT_WORKERS = 4
+ROW_GROUP_SIZE = 5_000
+ROWS_PER_PART = 100_000
+STATE_FILE = '_export_state.json'
+
+
+def flatten(value: Any) -> Optional[str]:
+    """One cell for a Jira field value: names for objects, ';'-joined lists, JSON for anything else"""
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        for attr in ('displayName', 'name', 'value', 'key'):
+            if isinstance(value.get(attr), str):
+                return value[attr]
+        return json.dumps(value, sort_keys=True)
+    if isinstance(value, list):
+        return ';'.join(cell for cell in (flatten(item) for item in value) if cell)
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def flatten_issue(issue, fields: Sequence[str]) -> Dict[str, Optional[str]]:
+    raw = issue if isinstance(issue, dict) else issue.raw
+    values = raw.get('fields') or {}
+    row = {'key': raw['key'], 'id': raw.get('id')}
+    row.update((name, flatten(values.get(name))) for name in fields)
+    return row
+
+
+def _timestamp(text: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.strptime(text, '%Y-%m-%dT%H:%M:%S.%f%z')
+    except (TypeError, ValueError):
+        return None
+
+
+class CsvPartWriter:
+    extension = 'csv'
+
+    def __init__(self, path: str, columns: Sequence[str]):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=list(columns))
+        self._writer.writeheader()
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetPartWriter:
+    """One Parquet file, one row group per ``write`` (needs pyarrow)"""
+    extension = 'parquet'
+
+    def __init__(self, path: str, columns: Sequence[str]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self.schema = pa.schema([(name, pa.timestamp('ms', tz='UTC') if name in DATE_FIELDS else pa.string())
+                                 for name in columns])
+        self._writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+
+    def write(self, rows: List[Dict[str, Any]]):
+        columns = {}
+        for name in self.schema.names:
+            values = [row.get(name) for row in rows]
+            columns[name] = [_timestamp(v) for v in values] if name in DATE_FIELDS else values
+        self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def writer_class(fmt: str = 'auto'):
+    """Part writer for 'parquet', 'csv' or 'auto' (Parquet when pyarrow is installed)"""
+    if fmt == 'csv':
+        return CsvPartWriter
+    if importlib.util.find_spec('pyarrow') is None:
+        if fmt == 'parquet':
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow), or use CSV")
+        logger.warning("pyarrow is not installed, exporting CSV instead of Parquet")
+        return CsvPartWriter
+    return ParquetPartWriter
+
+
+class JiraExporter:
+    """Streams a JQL search into columnar part files under ``out_dir``.
+
+    Pages are fetched by ``workers`` threads with a bounded window of requests in
+    flight and written in order, one row group at a time, so memory stays flat
+    however large the project. After every finished part the offset is
+    checkpointed in ``_export_state.json``: an interrupted export resumes from the
+    last part, and re-running a finished one appends issues created since.
+    """
+
+    def __init__(self, client, jql: str, out_dir: str, fields: Sequence[str] = EXPORT_FIELDS,
+                 fmt: str = 'auto', workers: int = DEFAULT_WORKERS, page_size: int = DEFAULT_PAGE_SIZE,
+                 row_group_size: int = ROW_GROUP_SIZE, rows_per_part: int = ROWS_PER_PART):
+        # Offsets only line up across runs with a stable order; new issues then land at the end
+        self.jql = jql if re.search(r'\border\s+by\b', jql, re.IGNORECASE) else f'{jql} ORDER BY created ASC, key ASC'
+        self.client = client
+        self.out_dir = out_dir
+        self.fields = list(fields)
+        self.columns = ['key', 'id'] + self.fields
+        self.fmt = fmt
+        self.writer = writer_class(fmt)
+        self.workers = workers
+        self.page_size = page_size
+        self.row_group_size = row_group_size
+        self.rows_per_part = rows_per_part
+        self.total: Optional[int] = None
+        self.pages = 0
+
+    @property
+    def state_path(self) -> str:
+        return os.path.join(self.out_dir, STATE_FILE)
+
+    # --- Checkpoint ---
+    def _new_state(self) -> Dict[str, Any]:
+        return {'jql': self.jql, 'fields': self.fields, 'format': self.writer.extension,
+                'next_start': 0, 'rows': 0, 'parts': []}
+
+    def load_state(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.state_path):
+            return None
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable export state: {str(e)}")
+            return None
+        if (self.fmt == 'auto' and (state.get('jql'), state.get('fields')) == (self.jql, self.fields)
+                and state.get('format') in ('csv', 'parquet')):
+            # 'auto' continues in whatever format the earlier run picked
+            self.writer = writer_class(state.get('format'))
+        if (state.get('jql'), state.get('fields'), state.get('format')) != (self.jql, self.fields,
+                                                                            self.writer.extension):
+            raise ValueError(f"{self.out_dir} holds a different export ({state.get('format')} of "
+                             f"{state.get('jql')}); use another directory, or --restart (resume=False) "
+                             f"to discard it")
+        return state
+
+    def _save_state(self, state: Dict[str, Any]):
+        tmp = f'{self.state_path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    # --- Fetching ---
+    def _pages(self, fetch: PageFetcher, start: int) -> Iterator[Tuple[int, List[Any]]]:
+        """(offset, issues) in order, with up to 2 x workers pages requested ahead"""
+        issues, total = fetch(start, self.page_size)
+        self.total = total
+        self.pages += 1
+        page_size = self.page_size
+        if issues and len(issues) < page_size and start + len(issues) < total:
+            # The server capped maxResults; follow its page size or offsets would skip issues
+            page_size = len(issues)
+        yield start, issues
+        if not issues:
+            return
+        offsets = iter(range(start + len(issues), total, page_size))
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='jira-export')
+        try:
+            window = deque()
+            for offset in offsets:
+                window.append((offset, pool.submit(fetch, offset, page_size)))
+                if len(window) == 2 * self.workers:
+                    break
+            while window:
+                offset, future = window.popleft()
+                issues, _ = future.result()
+                following = next(offsets, None)
+                if following is not None:
+                    window.append((following, pool.submit(fetch, following, page_size)))
+                self.pages += 1
+                yield offset, issues
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # --- Export ---
+    def run(self, resume: bool = True) -> Dict[str, Any]:
+        """Export (or continue exporting) and return throughput stats"""
+        os.makedirs(self.out_dir, exist_ok=True)
+        state = (self.load_state() if resume else None) or self._new_state()
+        if not resume:
+            self._remove_parts()
+        started = time.perf_counter()
+        first_row = state['rows']
+        with span('export', self.writer.extension) as export_span:
+            self._export(state)
+            export_span.attributes['rows'] = state['rows'] - first_row
+        seconds = time.perf_counter() - started
+        exported = state['rows'] - first_row
+        return {
+            'rows': exported,
+            'total_rows': state['rows'],
+            'parts': len(state['parts']),
+            'pages': self.pages,
+            'format': self.writer.extension,
+            'seconds': round(seconds, 2),
+            'issues_per_second': round(exported / seconds, 1) if seconds else 0.0,
+        }
+
+    def _export(self, state: Dict[str, Any]):
+        fetch = page_fetcher(self.client, self.jql, self.fields)
+        writer, path, part_rows, group = None, None, 0, []
+        end = state['next_start']
+        try:
+            for offset, issues in self._pages(fetch, state['next_start']):
+                group.extend(flatten_issue(issue, self.fields) for issue in issues)
+                end = offset + len(issues)
+                if len(group) < self.row_group_size:
+                    continue
+                if writer is None:
+                    path = os.path.join(self.out_dir, f"part-{len(state['parts']):05d}.{self.writer.extension}")
+                    writer = self.writer(f'{path}.tmp', self.columns)
+                writer.write(group)
+                part_rows += len(group)
+                group = []
+                if part_rows >= self.rows_per_part:
+                    self._finish_part(writer, path, state, end, part_rows)
+                    writer, part_rows = None, 0
+            if group:
+                if writer is None:
+                    path = os.path.join(self.out_dir, f"part-{len(state['parts']):05d}.{self.writer.extension}")
+                    writer = self.writer(f'{path}.tmp', self.columns)
+                writer.write(group)
+                part_rows += len(group)
+            if writer:
+                self._finish_part(writer, path, state, end, part_rows)
+                writer = None
+        finally:
+            if writer:
+                # Unfinished part: dropped, the next run rewrites it from the checkpoint
+                writer.close()
+                try:
+                    os.remove(f'{path}.tmp')
+                except OSError:
+                    pass
+
+    def _finish_part(self, writer, path: str, state: Dict[str, Any], next_start: int, rows: int):
+        writer.close()
+        os.replace(f'{path}.tmp', path)
+        state['parts'].append(os.path.basename(path))
+        state['rows'] += rows
+        state['next_start'] = next_start
+        self._save_state(state)
+        logger.info(f"Export: {os.path.basename(path)} written ({state['rows']} of {self.total} issues)")
+
+    def _remove_parts(self):
+        for name in os.listdir(self.out_dir):
+            if name.startswith('part-') or name == STATE_FILE:
+                os.remove(os.path.join(self.out_dir, name))
+
+
+def export_project(client, project: str, out_dir: str, **kwargs) -> Dict[str, Any]:
+    """Export every issue of ``project``; see JiraExporter for the options"""
+    return JiraExporter(client, f'project = {project}', out_dir, **kwargs).run()
+
+
+def iter_rows(out_dir: str) -> Iterator[Dict[str, Any]]:
+    """Rows of a finished export, part by part (Parquet rows need pyarrow)"""
+    with open(os.path.join(out_dir, STATE_FILE), encoding='utf-8') as f:
+        parts = json.load(f)['parts']
+    for name in parts:
+        path = os.path.join(out_dir, name)
+        if name.endswith('.csv'):
+            with open(path, newline='', encoding='utf-8') as f:
+                yield from csv.DictReader(f)
+        else:
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(path).iter_batches():
+                yield from batch.to_pylist()
+
+
+def main():
+    import argparse
+    from dotenv import load_dotenv
+    from atlassian import Jira
+    from jira_http import build_session
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description='Export Jira issues to Parquet/CSV part files')
+    parser.add_argument('jql', help='e.g. "project = MFLP"')
+    parser.add_argument('out_dir')
+    parser.add_argument('--format', default='auto', choices=['auto', 'parquet', 'csv'],
+                        help='auto: Parquet when pyarrow is installed, or the format of the export being resumed; '
+                             'an explicit format must match it (or use --restart)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--restart', action='store_true', help='discard earlier parts instead of resuming')
+    args = parser.parse_args()
+    client = Jira(url=os.getenv('JIRA_URL'), username=os.getenv('JIRA_USERNAME'),
+                  password=os.getenv('JIRA_API_TOKEN'), session=build_session())
+    stats = JiraExporter(client, args.jql, args.out_dir, fmt=args.format, workers=args.workers).run(
+        resume=not args.restart)
+    print(f"📦 {stats['rows']} issues exported to {args.out_dir} ({stats['issues_per_second']:.0f} issues/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+import asyncio
+import email.utils
+import logging
+import math
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from instrumentation import endpoint, span
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 503)
+DEFAULT_POOL_SIZE = 20
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 0.5
+MAX_BACKOFF = 60.0
+
+
+class TokenBucket:
+    """Thread-safe client-side rate limiter (``rate`` requests/second, bursts up to ``capacity``)"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+
+    def _take(self, tokens: float) -> float:
+        """Take tokens if available, otherwise return how long to wait for them"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def _record_wait(self, waited: float) -> float:
+        if waited:
+            with self._lock:
+                self.waited_seconds += waited
+        return waited
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available; returns the time spent waiting"""
+        waited = 0.0
+        while True:
+            delay = self._take(tokens)
+            if not delay:
+                return self._record_wait(waited)
+            time.sleep(delay)
+            waited += delay
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Like acquire(), but yields to the event loop instead of blocking the thread"""
+        waited = 0.0
+        while True:
+            delay = self._take(tokens)
+            if not delay:
+                return self._record_wait(waited)
+            await asyncio.sleep(delay)
+            waited += delay
+
+
+def retry_after_seconds(response) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date)"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        # Proxies sometimes send junk; the caller then falls back to its own backoff
+        try:
+            parsed = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, parsed.timestamp() - time.time()) if parsed else None
+    return max(0.0, seconds) if math.isfinite(seconds) else None
+
+
+class RetryingAdapter(HTTPAdapter):
+    """Pooled keep-alive adapter that rate limits every attempt and retries 429/503 with backoff.
+
+    Backoff is exponential with jitter, but a server-sent ``Retry-After`` always wins.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, rate_limiter: Optional[TokenBucket] = None):
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.retry_limit = max_retries
+        self.backoff = backoff
+        self.rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+
+    def send(self, request, **kwargs):
+        with span('jira', endpoint(request.method, request.url)) as s:
+            response = self._send_with_retries(request, s, **kwargs)
+            # The body is read later by the session, so use the declared length
+            s.bytes = int(response.headers.get('Content-Length') or 0)
+            s.ok = response.status_code < 400
+            s.attributes['status'] = response.status_code
+            return response
+
+    def _send_with_retries(self, request, s, **kwargs):
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                s.attributes['rate_limited_s'] = round(self.rate_limiter.acquire(), 3)
+            response = super().send(request, **kwargs)
+            with self._lock:
+                self.requests += 1
+            if response.status_code not in RETRY_STATUSES or attempt >= self.retry_limit:
+                return response
+
+            delay = retry_after_seconds(response)
+            if delay is None:
+                delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+            delay = min(delay, MAX_BACKOFF)
+            logger.warning(f"Jira returned {response.status_code} for {request.method} {request.url}, "
+                           f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.retry_limit})")
+            response.close()
+            with self._lock:
+                self.retries += 1
+            s.retries += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'rate_limited_seconds': round(self.rate_limiter.waited_seconds, 3) if self.rate_limiter else 0.0,
+            }
+
+
+_shared_limiter: Optional[TokenBucket] = None
+_shared_adapter: Optional[RetryingAdapter] = None
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter() -> TokenBucket:
+    """Process-wide token bucket so every client and tool shares one Jira quota"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            rate = float(os.getenv('JIRA_RATE_LIMIT', '10'))
+            burst = float(os.getenv('JIRA_RATE_BURST', str(rate * 2)))
+            _shared_limiter = TokenBucket(rate, burst)
+        return _shared_limiter
+
+
+def shared_adapter() -> RetryingAdapter:
+    """Process-wide adapter, so both Jira clients draw from one connection pool"""
+    global _shared_adapter
+    limiter = shared_rate_limiter()
+    with _shared_lock:
+        if _shared_adapter is None:
+            _shared_adapter = RetryingAdapter(
+                pool_size=int(os.getenv('JIRA_POOL_SIZE', str(DEFAULT_POOL_SIZE))),
+                max_retries=int(os.getenv('JIRA_MAX_RETRIES', str(DEFAULT_MAX_RETRIES))),
+                rate_limiter=limiter
+            )
+        return _shared_adapter
+
+
+def configure_session(session: requests.Session,
+                      adapter: Optional[RetryingAdapter] = None) -> requests.Session:
+    """Mount the pooled retrying adapter on an existing session (e.g. jira.JIRA's)"""
+    adapter = adapter or shared_adapter()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'})
+    return session
+
+
+def build_session(adapter: Optional[RetryingAdapter] = None) -> requests.Session:
+    """New requests.Session tuned for Jira; pass to atlassian.Jira(session=...)"""
+    return configure_session(requests.Session(), adapter)
+
+
+def session_stats(session: requests.Session) -> Dict[str, Any]:
+    """Request/retry counters of the adapter mounted on ``session``"""
+    adapter = session.get_adapter('https://')
+    return adapter.stats() if isinstance(adapter, RetryingAdapter) else {}
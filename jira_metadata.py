@@ -0,0 +1,322 @@
+import difflib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jira_bulk import TransitionCache
+
+logger = logging.getLogger(__name__)
+
+# Projects, issue types and priorities change rarely; a snapshot this old is refreshed
+DEFAULT_TTL = 6 * 60 * 60
+DEFAULT_REFRESH_INTERVAL = 60 * 60
+# An unknown name triggers at most one reload per this many seconds before it is rejected
+MISS_REFRESH_INTERVAL = 60
+
+
+def rest_get(client, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """GET rest/api/2/<path> with either client library"""
+    if hasattr(client, 'jql'):
+        return client.get(f'rest/api/2/{path}', params=params)
+    return client._get_json(path, params=params)
+
+
+def _closest(value: str, choices) -> str:
+    matches = difflib.get_close_matches(value, list(choices), n=1, cutoff=0.6)
+    return f" Did you mean '{matches[0]}'?" if matches else ''
+
+
+def _scope_key(scope: Tuple[str, str, str]) -> str:
+    return '|'.join(scope)
+
+
+class JiraMetadata:
+    """In-memory projects, issue types, priorities, users and transitions.
+
+    Loaded with three REST calls (or from the JSON snapshot at ``snapshot_path``
+    for a warm start) and refreshed in the background, so create/update inputs are
+    validated and resolved to canonical names locally instead of failing server-side.
+    """
+
+    def __init__(self, client=None, snapshot_path: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.time):
+        self.client = client
+        self.snapshot_path = snapshot_path
+        self.ttl = ttl
+        self.clock = clock
+        self.transitions = TransitionCache()
+        self._projects: Dict[str, Dict[str, Any]] = {}
+        self._issue_types: Dict[str, List[str]] = {}
+        self._priorities: List[str] = []
+        self._users: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        self.loaded_at: Optional[float] = None
+        self._refresh_started: Optional[float] = None
+        self.server_calls = 0
+        self.hits = 0
+        # Hits that answered something the agents used to ask Jira for (project list, users)
+        self.saved_hits = 0
+        self.rejected = 0
+        if snapshot_path:
+            self.load_snapshot()
+
+    # --- Loading ---
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        with self._lock:
+            self.server_calls += 1
+        return rest_get(self.client, path, params)
+
+    @property
+    def stale(self) -> bool:
+        return self.loaded_at is None or self.clock() - self.loaded_at >= self.ttl
+
+    def refresh(self):
+        """Reload projects, priorities and per-project issue types from Jira"""
+        with self._lock:
+            self._refresh_started = self.clock()
+        projects = self._get('project') or []
+        priorities = self._get('priority') or []
+        try:
+            createmeta = self._get('issue/createmeta', {'expand': 'projects.issuetypes'}) or {}
+        except Exception as e:
+            # Needs create permission (and is gone on newer Jira): issue types are then left to Jira
+            logger.warning(f"Could not load issue types, not validating them: {str(e)}")
+            createmeta = {}
+        issue_types = {p['key']: [t['name'] for t in p.get('issuetypes', [])]
+                       for p in createmeta.get('projects', [])}
+        with self._lock:
+            self._projects = {p['key']: {'key': p['key'], 'name': p.get('name', p['key']), 'id': p.get('id')}
+                              for p in projects}
+            self._priorities = [p['name'] for p in priorities]
+            self._issue_types = issue_types
+            self.loaded_at = self.clock()
+        logger.info(f"Loaded Jira metadata: {len(projects)} projects, {len(priorities)} priorities")
+        self.save_snapshot()
+
+    def ensure_loaded(self):
+        if self.loaded_at is None:
+            self.refresh()
+
+    def _refresh_on_miss(self) -> bool:
+        """Reload before rejecting a name that may have been added since the snapshot"""
+        with self._lock:
+            if self._refresh_started is not None and self.clock() - self._refresh_started < MISS_REFRESH_INTERVAL:
+                return False
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Metadata refresh failed, keeping previous data: {str(e)}")
+            return False
+        return True
+
+    def start_background_refresh(self, interval: float = DEFAULT_REFRESH_INTERVAL):
+        """Refresh now if the snapshot is stale, then every ``interval`` seconds"""
+        def loop():
+            wait = 0 if self.stale else interval
+            while not self._stop.wait(wait):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"Metadata refresh failed, keeping previous data: {str(e)}")
+                wait = interval
+
+        if self._refresher is None:
+            self._refresher = threading.Thread(target=loop, name='jira-metadata', daemon=True)
+            self._refresher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # --- Snapshot ---
+    def load_snapshot(self) -> bool:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable metadata snapshot: {str(e)}")
+            return False
+        with self._lock:
+            self._projects = data.get('projects', {})
+            self._issue_types = data.get('issue_types', {})
+            self._priorities = data.get('priorities', [])
+            self._users = data.get('users', {})
+            self.loaded_at = data.get('loaded_at')
+        self.transitions.restore({tuple(scope.split('|')): names
+                                  for scope, names in data.get('transitions', {}).items()})
+        return True
+
+    def save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        transitions = self.transitions.snapshot()
+        with self._lock:
+            data = {
+                'loaded_at': self.loaded_at,
+                'projects': self._projects,
+                'issue_types': self._issue_types,
+                'priorities': self._priorities,
+                'users': self._users,
+                # Per-issue entries (no project in the scope) go stale on the next transition
+                'transitions': {_scope_key(scope): names for scope, names in transitions.items() if scope[0]},
+            }
+        tmp = f'{self.snapshot_path}.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.snapshot_path)
+        except OSError as e:
+            logger.error(f"Could not write metadata snapshot: {str(e)}")
+
+    # --- Lookups ---
+    def _hit(self, saved: bool = False):
+        with self._lock:
+            self.hits += 1
+            if saved:
+                self.saved_hits += 1
+
+    def _reject(self, message: str):
+        with self._lock:
+            self.rejected += 1
+        raise ValueError(message)
+
+    def projects(self) -> List[Dict[str, Any]]:
+        self.ensure_loaded()
+        self._hit(saved=True)
+        with self._lock:
+            return sorted(self._projects.values(), key=lambda p: p['key'])
+
+    def resolve_project(self, key: str) -> str:
+        """Canonical project key, matching case-insensitively"""
+        self.ensure_loaded()
+        for retry in (False, True):
+            if retry and not self._refresh_on_miss():
+                break
+            with self._lock:
+                keys = list(self._projects)
+            for known in keys:
+                if known.upper() == key.strip().upper():
+                    self._hit()
+                    return known
+        self._reject(f"Unknown project '{key}'.{_closest(key.upper(), keys)}")
+
+    def resolve_issue_type(self, name: str, project_key: Optional[str] = None) -> str:
+        def names():
+            with self._lock:
+                if project_key and project_key in self._issue_types:
+                    return list(self._issue_types[project_key])
+                return sorted({n for types in self._issue_types.values() for n in types})
+        return self._resolve_name('issue type', name, names)
+
+    def resolve_priority(self, name: str) -> str:
+        def names():
+            with self._lock:
+                return list(self._priorities)
+        return self._resolve_name('priority', name, names)
+
+    def _resolve_name(self, kind: str, name: str, load_names: Callable[[], List[str]]) -> str:
+        self.ensure_loaded()
+        for retry in (False, True):
+            if retry and not self._refresh_on_miss():
+                break
+            names = load_names()
+            if not names:
+                # Nothing loaded for this kind (e.g. no createmeta permission): let Jira decide
+                return name
+            for known in names:
+                if known.lower() == name.strip().lower():
+                    self._hit()
+                    return known
+        self._reject(f"Unknown {kind} '{name}'.{_closest(name, names)} Valid: {', '.join(names)}")
+
+    def resolve_user(self, query: str) -> Dict[str, Any]:
+        """User for a name, email or account id; each distinct query is looked up once"""
+        cache_key = query.strip().lower()
+        with self._lock:
+            cached = self._users.get(cache_key)
+        if cached:
+            self._hit(saved=True)
+            return cached
+        users = self._get('user/search', {'query': query}) or []
+        exact = [u for u in users if cache_key in (str(u.get('displayName', '')).lower(),
+                                                   str(u.get('emailAddress', '')).lower(),
+                                                   str(u.get('name', '')).lower(),
+                                                   str(u.get('accountId', '')).lower())]
+        matches = exact or users
+        if len(matches) != 1:
+            found = ', '.join(u.get('displayName', '?') for u in matches[:5])
+            self._reject(f"No user matches '{query}'" if not matches else f"'{query}' matches several users: {found}")
+        user = {k: matches[0][k] for k in ('accountId', 'name', 'displayName', 'emailAddress') if matches[0].get(k)}
+        with self._lock:
+            self._users[cache_key] = user
+        return user
+
+    def resolve_fields(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate create/edit fields and swap in canonical names; raises ValueError listing every problem"""
+        resolved, errors = dict(fields), []
+        project_key = None
+
+        def attempt(name, resolve):
+            try:
+                resolved[name] = resolve()
+            except ValueError as e:
+                errors.append(str(e))
+
+        if 'project' in fields:
+            attempt('project', lambda: {'key': self.resolve_project(fields['project']['key'])})
+            project_key = resolved['project']['key'] if not errors else None
+        if 'issuetype' in fields:
+            attempt('issuetype', lambda: {'name': self.resolve_issue_type(fields['issuetype']['name'], project_key)})
+        if 'priority' in fields:
+            attempt('priority', lambda: {'name': self.resolve_priority(fields['priority']['name'])})
+        if 'assignee' in fields:
+            def assignee():
+                user = self.resolve_user(fields['assignee']['name'])
+                # Cloud identifies users by accountId, Server/DC by username
+                return {'accountId': user['accountId']} if user.get('accountId') else {'name': user['name']}
+            attempt('assignee', assignee)
+        if errors:
+            raise ValueError(' '.join(errors))
+        return resolved
+
+    # --- Transitions ---
+    def transition_id(self, client, issue_key: str, status: str,
+                      scope: Optional[Tuple[str, str, str]] = None) -> str:
+        """Transition id for moving ``issue_key`` to ``status``, using cached workflow data"""
+        scope = scope or ('', '', issue_key.upper())
+        transitions = self.transitions.get(client, issue_key, scope)
+        return self.match_transition(issue_key, status, transitions)
+
+    def match_transition(self, issue_key: str, status: str, transitions: Dict[str, str]) -> str:
+        transition_id = transitions.get(status.strip().lower())
+        if transition_id is None:
+            names = sorted(transitions)
+            self._reject(f"Status '{status}' not available for issue {issue_key}.{_closest(status.lower(), names)}")
+        return transition_id
+
+    def transitioned(self, issue_key: str):
+        """Forget per-issue transitions once the issue has moved to another status"""
+        self.transitions.forget(('', '', issue_key.upper()))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'projects': len(self._projects),
+                'priorities': len(self._priorities),
+                'users': len(self._users),
+                'server_calls': self.server_calls,
+                'local_hits': self.hits,
+                'rejected_locally': self.rejected,
+                'transition_lookups': self.transitions.lookups,
+                'transition_cache_hits': self.transitions.hits,
+                # Only answers that replace a request the agents used to make; validation
+                # hits are not counted because nothing was sent before validation existed
+                'calls_saved': self.saved_hits + self.rejected + self.transitions.hits,
+                'age_seconds': round(self.clock() - self.loaded_at, 1) if self.loaded_at else None,
+            }
@@ -0,0 +1,208 @@
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from issue_model import dumps, loads
+from jira_search import search_issues
+from jql_cache import normalize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROJECT = 'MFLP'
+
+# Everything the agents render - keeps mirrored payloads small
+MIRROR_FIELDS = ['summary', 'description', 'status', 'assignee', 'priority',
+                 'issuetype', 'reporter', 'created', 'updated', 'project']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY,
+    project TEXT,
+    summary TEXT,
+    description TEXT,
+    status TEXT,
+    assignee TEXT,
+    priority TEXT,
+    created TEXT,
+    updated TEXT,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_issues_project_created ON issues (project, created);
+CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(key UNINDEXED, summary, description);
+CREATE TABLE IF NOT EXISTS sync_state (
+    project TEXT PRIMARY KEY,
+    last_sync REAL NOT NULL,
+    issue_count INTEGER NOT NULL
+);
+"""
+
+
+def _raw(issue) -> Dict[str, Any]:
+    # atlassian.Jira returns dicts, jira.JIRA returns resources wrapping the same JSON
+    return issue if isinstance(issue, dict) else issue.raw
+
+
+def _name(value, attr='name'):
+    return value.get(attr) if isinstance(value, dict) else None
+
+
+# The only JQL shape a mirror can answer on its own: one project, one text phrase
+_SCOPED_TEXT = re.compile(r'project = "?([A-Za-z][A-Za-z0-9_]*)"? AND text ~ "((?:[^"\\]|\\.)*)"'
+                          r'(?: ORDER BY created DESC)?', re.IGNORECASE)
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into a safe FTS5 query (every word quoted, all must match)"""
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"' for word in words)
+
+
+class JiraMirror:
+    """Local SQLite mirror of a Jira project with FTS5 search over summary/description.
+
+    The first ``sync`` pulls the whole project; later calls only fetch issues whose
+    ``updated`` is newer than the previous sync.
+    """
+
+    def __init__(self, db_path: str, project: str = DEFAULT_PROJECT):
+        self.db_path = db_path
+        self.project = project.upper()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    # --- Sync ---
+    def last_sync(self) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute('SELECT last_sync FROM sync_state WHERE project = ?',
+                                     (self.project,)).fetchone()
+        return row['last_sync'] if row else None
+
+    def sync(self, client, full: bool = False) -> Dict[str, Any]:
+        """Bring the mirror up to date and return sync stats"""
+        started = time.time()
+        last_sync = None if full else self.last_sync()
+        if last_sync is None:
+            jql = f'project = {self.project} ORDER BY updated ASC'
+        else:
+            # Relative dates avoid timezone mismatches; overlap by a minute so nothing is missed
+            minutes = max(1, math.ceil((started - last_sync) / 60) + 1)
+            jql = f'project = {self.project} AND updated >= "-{minutes}m" ORDER BY updated ASC'
+
+        synced = 0
+        for issue in search_issues(client, jql, fields=MIRROR_FIELDS):
+            self.upsert(issue, commit=False)
+            synced += 1
+            if synced % 1000 == 0:
+                with self._lock:
+                    self._conn.commit()
+
+        with self._lock, self._conn:
+            count = self._conn.execute('SELECT COUNT(*) FROM issues WHERE project = ?',
+                                       (self.project,)).fetchone()[0]
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sync_state (project, last_sync, issue_count) VALUES (?, ?, ?)',
+                (self.project, started, count)
+            )
+
+        stats = {
+            'project': self.project,
+            'mode': 'full' if last_sync is None else 'incremental',
+            'synced': synced,
+            'total': count,
+            'seconds': round(time.time() - started, 3),
+        }
+        logger.info(f"Mirror sync complete: {stats}")
+        return stats
+
+    def upsert(self, issue, commit: bool = True):
+        """Insert or replace one issue (dict or jira resource)"""
+        raw = _raw(issue)
+        fields = raw.get('fields', {})
+        key = raw['key']
+        project = _name(fields.get('project'), 'key') or key.rsplit('-', 1)[0]
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO issues (key, project, summary, description, status, assignee, '
+                'priority, created, updated, raw) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, project, fields.get('summary'), fields.get('description'),
+                 _name(fields.get('status')), _name(fields.get('assignee'), 'displayName'),
+                 _name(fields.get('priority')), fields.get('created'), fields.get('updated'),
+                 dumps(raw))
+            )
+            self._conn.execute('DELETE FROM issues_fts WHERE key = ?', (key,))
+            self._conn.execute('INSERT INTO issues_fts (key, summary, description) VALUES (?, ?, ?)',
+                               (key, fields.get('summary') or '', fields.get('description') or ''))
+            if commit:
+                self._conn.commit()
+
+    def forget(self, key: str):
+        """Remove an issue that is known to be stale (e.g. after a write)"""
+        key = key.strip().upper()
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM issues WHERE key = ?', (key,))
+            self._conn.execute('DELETE FROM issues_fts WHERE key = ?', (key,))
+
+    # --- Queries (all return raw REST-shaped issue dicts) ---
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute('SELECT raw FROM issues WHERE key = ?',
+                                     (key.strip().upper(),)).fetchone()
+        return loads(row['raw']) if row else None
+
+    def recent(self, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Issues in the mirrored project, newest first"""
+        sql = 'SELECT raw FROM issues WHERE project = ? ORDER BY created DESC'
+        params = [self.project]
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        for row in rows:
+            yield loads(row['raw'])
+
+    def scoped_text(self, jql: str) -> Optional[str]:
+        """The search phrase when ``jql`` is a text search of the mirrored project, else None.
+
+        Anything wider (no project, another project, extra clauses) has matches the
+        mirror does not hold and must go to Jira.
+        """
+        match = _SCOPED_TEXT.fullmatch(normalize(jql))
+        if not match or match.group(1).upper() != self.project:
+            return None
+        return re.sub(r'\\(.)', r'\1', match.group(2))
+
+    def search_text(self, text: str, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Full-text search over summary/description of the mirrored project, newest first"""
+        query = fts_query(text)
+        if not query:
+            return
+        sql = ('SELECT i.raw FROM issues_fts f JOIN issues i ON i.key = f.key '
+               'WHERE issues_fts MATCH ? AND i.project = ? ORDER BY i.created DESC')
+        params = [query, self.project]
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        for row in rows:
+            yield loads(row['raw'])
+
+    def get_or_fetch(self, key: str, fetch) -> Any:
+        """Answer from the mirror, falling back to ``fetch()`` (and mirroring the result) on a miss"""
+        issue = self.get(key)
+        if issue is not None:
+            return issue
+        issue = fetch()
+        self.upsert(issue)
+        return _raw(issue)
@@ -0,0 +1,128 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Jira Cloud caps maxResults at 100 for most searches
+DEFAULT_PAGE_SIZE = 100
+
+# Fields the search tools actually read - avoids pulling full issue payloads
+SUMMARY_FIELDS = ['summary', 'status', 'assignee', 'priority']
+
+# fetch(start_at, max_results) -> (issues, total)
+PageFetcher = Callable[[int, int], Tuple[List[Any], int]]
+
+
+def atlassian_fetcher(client, jql: str, fields: Optional[Sequence[str]] = None) -> PageFetcher:
+    """Page fetcher for atlassian.Jira clients (returns raw issue dicts)"""
+    def fetch(start_at: int, max_results: int):
+        kwargs = {'start': start_at, 'limit': max_results}
+        if fields:
+            kwargs['fields'] = ','.join(fields)
+        page = client.jql(jql, **kwargs)
+        return page.get('issues', []), page.get('total', 0)
+    return fetch
+
+
+def jira_fetcher(client, jql: str, fields: Optional[Sequence[str]] = None) -> PageFetcher:
+    """Page fetcher for jira.JIRA clients (returns Issue resources)"""
+    def fetch(start_at: int, max_results: int):
+        page = client.search_issues(
+            jql,
+            startAt=start_at,
+            maxResults=max_results,
+            fields=','.join(fields) if fields else None
+        )
+        return list(page), getattr(page, 'total', len(page))
+    return fetch
+
+
+def page_fetcher(client, jql: str, fields: Optional[Sequence[str]] = None) -> PageFetcher:
+    """Pick the right page fetcher for whichever Jira client is in use"""
+    if hasattr(client, 'jql'):
+        return atlassian_fetcher(client, jql, fields)
+    return jira_fetcher(client, jql, fields)
+
+
+def count_issues(client, jql: str) -> int:
+    """Server-side total for ``jql`` without fetching any issue (maxResults=0)"""
+    if hasattr(client, 'jql'):
+        return client.jql(jql, fields='key', limit=0).get('total', 0)
+    # jira.JIRA fetches every page when maxResults is falsy, unless it returns the raw JSON
+    return client.search_issues(jql, maxResults=0, fields='key', json_result=True).get('total', 0)
+
+
+class IssueStream:
+    """Lazily pages through a JQL search, prefetching the next page in the background.
+
+    Only the page being consumed and the one being prefetched are held in memory,
+    so arbitrarily large result sets stream at constant memory. ``total`` is
+    populated once the first page has arrived.
+    """
+
+    def __init__(self, fetch: PageFetcher, page_size: int = DEFAULT_PAGE_SIZE,
+                 limit: Optional[int] = None, prefetch: bool = True):
+        self.fetch = fetch
+        self.page_size = page_size
+        self.limit = limit
+        self.prefetch = prefetch
+        self.total: Optional[int] = None
+        self.pages_fetched = 0
+
+    def _page_size_at(self, start_at: int) -> int:
+        if self.limit is None:
+            return self.page_size
+        return max(0, min(self.page_size, self.limit - start_at))
+
+    def _fetch_page(self, start_at: int):
+        issues, total = self.fetch(start_at, self._page_size_at(start_at))
+        self.pages_fetched += 1
+        return issues, total
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._page_size_at(0) == 0:
+            return
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jql-prefetch') if self.prefetch else None
+        try:
+            start_at = 0
+            pending = self._submit(executor, start_at)
+            while True:
+                issues, total = pending.result()
+                self.total = total
+                next_start = start_at + len(issues)
+                has_more = bool(issues) and next_start < total and self._page_size_at(next_start) > 0
+
+                # Kick off the next request before handing this page to the caller
+                if has_more and executor:
+                    pending = executor.submit(self._fetch_page, next_start)
+
+                yield from issues
+
+                if not has_more:
+                    return
+                if not executor:
+                    pending = self._submit(None, next_start)
+                start_at = next_start
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, executor: Optional[ThreadPoolExecutor], start_at: int) -> Future:
+        if executor:
+            return executor.submit(self._fetch_page, start_at)
+        future: Future = Future()
+        try:
+            future.set_result(self._fetch_page(start_at))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def search_issues(client, jql: str, fields: Optional[Sequence[str]] = None,
+                  limit: Optional[int] = None, page_size: int = DEFAULT_PAGE_SIZE,
+                  prefetch: bool = True) -> IssueStream:
+    """Stream issues matching ``jql`` from either Jira client"""
+    logger.debug(f"Streaming JQL search: {jql} (fields={fields}, limit={limit})")
+    return IssueStream(page_fetcher(client, jql, fields), page_size=page_size,
+                       limit=limit, prefetch=prefetch)
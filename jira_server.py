@@ -0,0 +1,483 @@
+"""HTTP server exposing JiraAgent and the simple-agent operations to many users.
+
+    python jira_server.py                       # JIRA_SERVER_HOST/PORT, default 127.0.0.1:8080
+    curl -u you@example.com:$JIRA_API_TOKEN localhost:8080/run -d '{"query": "Get details for PROJ-1"}'
+
+Each user authenticates with HTTP Basic using their own Jira email and API token.
+Agents are built per user (their own Jira client, issue cache and metadata, so
+nobody sees another user's data) but share one connection pool and rate limiter
+and one LLM client. Requests run on a bounded worker pool; when every
+worker is busy and the queue is full the server answers 503 with Retry-After
+instead of piling up threads.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qs
+
+from instrumentation import configure_from_env, instrumentation, span
+from issue_model import IssueDetail, IssueSummary, dumps, loads
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+DEFAULT_QUEUE_SIZE = 32
+DEFAULT_MAX_USERS = 100
+# Seconds a client may take to send its request before its worker is freed
+REQUEST_TIMEOUT = 30
+RETRY_AFTER_SECONDS = 1
+ISSUE_KEY = r'[A-Za-z][A-Za-z0-9_]+-\d+'
+
+
+class AgentPool:
+    """One JiraAgent per user (LRU-bounded), all sharing transport and LLM"""
+
+    def __init__(self, max_users: int = DEFAULT_MAX_USERS, adapter=None):
+        self.max_users = max_users
+        self._adapter = adapter
+        self.llm = None
+        self._agents: 'OrderedDict[Tuple[str, str], Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.built = 0
+        self.evicted = 0
+        self.rejected_logins = 0
+
+    @property
+    def adapter(self):
+        if self._adapter is None:
+            from jira_http import shared_adapter
+            self._adapter = shared_adapter()
+        return self._adapter
+
+    def get(self, username: str, api_token: str):
+        """The user's agent, building (and verifying the credentials of) a new one on first use"""
+        # Tokens are only kept hashed in the key; a changed token builds a fresh agent
+        key = (username.lower(), hashlib.sha256(api_token.encode('utf-8')).hexdigest())
+        with self._lock:
+            entry = self._agents.get(key)
+            owner = entry is None
+            if owner:
+                entry = self._agents[key] = {'ready': threading.Event(), 'agent': None, 'error': None}
+            else:
+                self._agents.move_to_end(key)
+        if owner:
+            # Concurrent first requests from the same user wait for this one build
+            try:
+                entry['agent'] = self._build(username, api_token)
+            except Exception as e:
+                entry['error'] = e
+                with self._lock:
+                    self._agents.pop(key, None)
+            finally:
+                entry['ready'].set()
+            self._evict()
+        entry['ready'].wait()
+        if entry['error'] is not None:
+            raise entry['error']
+        return entry['agent']
+
+    def _build(self, username: str, api_token: str):
+        from jira_agent import JiraAgent, JiraConfig
+        from jira_http import build_session
+
+        config = JiraConfig(username, api_token)
+        # The offline mirror and embedding index are single-user: they hold one account's issues
+        config.mirror_db = None
+        config.semantic_index = None
+        # Each agent only sees one account's results and projects, so neither is written to a shared file
+        config.jql_cache_path = None
+        config.metadata_path = None
+        # Requests are independent (and may run concurrently for one user), so no conversation memory
+        config.memory_tokens = 0
+        # Metadata stays per user: project lists and create validation depend on what the account can see
+        agent = JiraAgent(session=build_session(self.adapter), config=config, llm=self.llm,
+                          verbose=False, trace=False)
+        if not agent.connection_check.result():
+            self._close(agent)
+            with self._lock:
+                self.rejected_logins += 1
+            raise PermissionError(f"Jira rejected the credentials for {username}")
+        with self._lock:
+            self.built += 1
+            self.llm = self.llm or agent.llm
+        return agent
+
+    def _evict(self):
+        with self._lock:
+            evicted = []
+            while len(self._agents) > self.max_users:
+                _, entry = self._agents.popitem(last=False)
+                evicted.append(entry)
+                self.evicted += 1
+        for entry in evicted:
+            if entry['agent'] is not None:
+                self._close(entry['agent'])
+
+    @staticmethod
+    def _close(agent):
+        """Stop the agent's threads and close its async (httpx) connection pool"""
+        agent.close()
+        try:
+            asyncio.run(agent.aclose())
+        except Exception as e:
+            logger.error(f"Error closing agent connections: {str(e)}")
+
+    def close(self):
+        """Close every user's agent (metadata refresh threads and connection pools)"""
+        with self._lock:
+            entries = list(self._agents.values())
+            self._agents.clear()
+        for entry in entries:
+            if entry['agent'] is not None:
+                self._close(entry['agent'])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'users': len(self._agents), 'built': self.built, 'evicted': self.evicted,
+                    'rejected_logins': self.rejected_logins}
+
+    def metadata_stats(self) -> Dict[str, Any]:
+        """Metadata counters summed over the users' agents"""
+        with self._lock:
+            agents = [entry['agent'] for entry in self._agents.values() if entry['agent'] is not None]
+        totals: Dict[str, Any] = {}
+        for agent in agents:
+            for name, value in agent.metadata.stats().items():
+                if isinstance(value, int) and name not in ('projects', 'priorities', 'users'):
+                    totals[name] = totals.get(name, 0) + value
+        return totals
+
+
+class WorkerPoolHTTPServer(HTTPServer):
+    """HTTPServer handling connections on ``workers`` threads with at most ``queue_size`` waiting.
+
+    Beyond that a connection is answered 503 straight from the accept loop, so load
+    shows up as fast rejections clients can retry rather than unbounded latency.
+    """
+
+    def __init__(self, address, handler, workers: int = DEFAULT_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE):
+        super().__init__(address, handler)
+        self.workers = workers
+        self.queue_size = queue_size
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='jira-server')
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            self._reject(request)
+            return
+        with self._lock:
+            self.accepted += 1
+            self.in_flight += 1
+        self._pool.submit(self._work, request, client_address)
+
+    def _work(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def _reject(self, request):
+        body = b'{"error": "server busy, retry later"}'
+        try:
+            request.sendall(b'HTTP/1.1 503 Service Unavailable\r\n'
+                            b'Content-Type: application/json\r\n'
+                            + f'Retry-After: {RETRY_AFTER_SECONDS}\r\nContent-Length: {len(body)}\r\n'.encode()
+                            + b'Connection: close\r\n\r\n' + body)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self.in_flight
+            return {
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'active': min(in_flight, self.workers),
+                'queued': max(0, in_flight - self.workers),
+                'accepted': self.accepted,
+                'rejected': self.rejected,
+            }
+
+
+class JiraRequestHandler(BaseHTTPRequestHandler):
+    """JSON API; ``/search`` streams NDJSON as Jira pages arrive"""
+    protocol_version = 'HTTP/1.1'
+    server_version = 'JiraAgentServer/1.0'
+    timeout = REQUEST_TIMEOUT
+
+    ROUTES = [
+        ('GET', re.compile(r'/health'), 'health'),
+        ('GET', re.compile(r'/stats'), 'stats'),
+        ('POST', re.compile(r'/run'), 'run'),
+        ('GET', re.compile(r'/projects'), 'projects'),
+        ('GET', re.compile(r'/search'), 'search'),
+        ('POST', re.compile(r'/issues'), 'create_issue'),
+        ('GET', re.compile(rf'/issues/(?P<key>{ISSUE_KEY})'), 'get_issue'),
+        ('POST', re.compile(rf'/issues/(?P<key>{ISSUE_KEY})'), 'update_issue'),
+    ]
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    # --- Plumbing ---
+    def _dispatch(self, method: str):
+        path, _, query = self.path.partition('?')
+        self.query = {k: v[-1] for k, v in parse_qs(query).items()}
+        # Every response closes the connection so an idle keep-alive client never pins a worker
+        self.close_connection = True
+        for route_method, pattern, name in self.ROUTES:
+            match = pattern.fullmatch(path.rstrip('/') or '/')
+            if match and route_method == method:
+                break
+        else:
+            self._json(404, {'error': f'no route for {method} {path}'})
+            return
+        with span('server', f'{method} {name}') as s:
+            try:
+                status = getattr(self, f'_{name}')(**match.groupdict())
+            except PermissionError as e:
+                status = self._unauthorized(str(e))
+            except ValueError as e:
+                status = self._json(400, {'error': str(e)})
+            except Exception as e:
+                logger.error(f"Error handling {method} {path}: {str(e)}")
+                status = self._json(500, {'error': str(e)})
+            s.ok = status < 500
+            s.attributes['status'] = status
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            data = loads(self.rfile.read(length))
+        except ValueError:
+            raise ValueError('request body must be JSON')
+        if not isinstance(data, dict):
+            raise ValueError('request body must be a JSON object')
+        return data
+
+    def _json(self, status: int, payload) -> int:
+        body = dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+        return status
+
+    def _stream(self, status: int, items: Iterable[Any]) -> int:
+        """Chunked NDJSON, one line per item, flushed as each is produced"""
+        self._start_stream(status)
+        try:
+            for item in items:
+                self._chunk(item)
+        except Exception as e:
+            # Headers are already sent: report the failure in-band as the last line
+            logger.error(f"Error while streaming response: {str(e)}")
+            self._chunk({'error': str(e)})
+        self._end_stream()
+        return status
+
+    def _start_stream(self, status: int):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+
+    def _end_stream(self):
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _chunk(self, item):
+        data = dumps(item).encode('utf-8') + b'\n'
+        self.wfile.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+        self.wfile.flush()
+
+    def _unauthorized(self, message: str = 'Jira credentials required (HTTP Basic: email and API token)') -> int:
+        body = dumps({'error': message}).encode('utf-8')
+        self.send_response(401)
+        self.send_header('WWW-Authenticate', 'Basic realm="jira"')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+        return 401
+
+    def _agent(self):
+        """The caller's agent, from their HTTP Basic credentials"""
+        header = self.headers.get('Authorization', '')
+        scheme, _, encoded = header.partition(' ')
+        if scheme.lower() != 'basic':
+            raise PermissionError('Jira credentials required (HTTP Basic: email and API token)')
+        try:
+            username, _, api_token = base64.b64decode(encoded).decode('utf-8').partition(':')
+        except ValueError:
+            raise PermissionError('Malformed Basic credentials')
+        if not username or not api_token:
+            raise PermissionError('Malformed Basic credentials')
+        return self.server.agents.get(username, api_token)
+
+    @staticmethod
+    def _tool_status(result: str, success: int = 200) -> int:
+        # "Error: ..." is input the tool rejected; any other error came from Jira or the tool itself
+        if result.startswith('Error:'):
+            return 400
+        return 502 if result.startswith('Error') else success
+
+    # --- Endpoints ---
+    def _health(self) -> int:
+        return self._json(200, {'status': 'ok', **self.server.stats()})
+
+    def _stats(self) -> int:
+        from jira_http import RetryingAdapter
+        adapter = self.server.agents.adapter
+        return self._json(200, {
+            'server': self.server.stats(),
+            'agents': self.server.agents.stats(),
+            'http': adapter.stats() if isinstance(adapter, RetryingAdapter) else {},
+            'metadata': self.server.agents.metadata_stats(),
+            'spans': instrumentation.snapshot(),
+        })
+
+    def _run(self) -> int:
+        body = self._body()
+        query = str(body.get('query', '')).strip()
+        if not query:
+            raise ValueError("'query' is required")
+        agent = self._agent()
+        if not body.get('stream'):
+            response = agent.run(query)
+            # The agent reports its own failures (LLM or Jira) as "Error: ..."
+            return self._json(500 if response.startswith('Error') else 200, {'response': response})
+        # {"token": ...} lines while the agent works, then {"response": ...}
+        self._start_stream(200)
+        response = agent.run(query, on_token=lambda token: self._chunk({'token': token}))
+        self._chunk({'response': response})
+        self._end_stream()
+        return 200
+
+    def _projects(self) -> int:
+        return self._json(200, {'projects': self._agent().metadata.projects()})
+
+    def _search(self) -> int:
+        from jira_search import SUMMARY_FIELDS, search_issues
+        jql = self.query.get('jql', '').strip()
+        if not jql:
+            raise ValueError("'jql' query parameter is required")
+        limit = int(self.query['limit']) if self.query.get('limit') else None
+        agent = self._agent()
+        issues = search_issues(agent.jira_client, jql, fields=SUMMARY_FIELDS, limit=limit)
+        return self._stream(200, (IssueSummary.from_raw(issue).as_dict() for issue in issues))
+
+    def _get_issue(self, key: str) -> int:
+        agent = self._agent()
+        key = key.upper()
+        issue = agent.issue_cache.get(key, lambda: agent.jira_client.issue(key))
+        return self._json(200, IssueDetail.from_raw(issue).as_dict())
+
+    def _create_issue(self) -> int:
+        data = self._body()
+        agent = self._agent()
+        result = agent.tools_by_name['jira_create_issue']._run(json.dumps(data))
+        return self._json(self._tool_status(result, 201), {'result': result})
+
+    def _update_issue(self, key: str) -> int:
+        data = dict(self._body(), issue_key=key.upper())
+        agent = self._agent()
+        result = agent.tools_by_name['jira_update_issue']._run(json.dumps(data))
+        return self._json(self._tool_status(result), {'result': result})
+
+
+class JiraServer:
+    """Wires the agent pool into a WorkerPoolHTTPServer; ``start()`` serves on a background thread"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8080, workers: int = DEFAULT_WORKERS,
+                 queue_size: int = DEFAULT_QUEUE_SIZE, agents: Optional[AgentPool] = None):
+        self.httpd = WorkerPoolHTTPServer((host, port), JiraRequestHandler, workers, queue_size)
+        self.httpd.agents = agents or AgentPool()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'JiraServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='jira-server-accept', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.httpd.agents.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    configure_from_env()
+    server = JiraServer(
+        host=os.getenv('JIRA_SERVER_HOST', '127.0.0.1'),
+        port=int(os.getenv('JIRA_SERVER_PORT', '8080')),
+        workers=int(os.getenv('JIRA_SERVER_WORKERS', str(DEFAULT_WORKERS))),
+        queue_size=int(os.getenv('JIRA_SERVER_QUEUE', str(DEFAULT_QUEUE_SIZE))),
+        agents=AgentPool(max_users=int(os.getenv('JIRA_SERVER_MAX_USERS', str(DEFAULT_MAX_USERS)))),
+    )
+    print(f"🌐 JIRA agent server on {server.url} "
+          f"({server.httpd.workers} workers, queue {server.httpd.queue_size})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nGoodbye! 👋")
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,863 @@
+# LangChain tools and LLM wrappers used by JiraAgent (imported lazily by jira_agent)
+import re
+import json
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List
+from langchain.tools import BaseTool
+from langchain_core.language_models.llms import LLM
+from langchain_core.callbacks import BaseCallbackHandler
+from jira_search import search_issues, SUMMARY_FIELDS
+from jira_cache import IssueCache
+from jira_mirror import MIRROR_FIELDS, JiraMirror
+from jira_metadata import JiraMetadata
+from jira_bulk import (JiraBulkOperations, build_issue_fields, build_update_fields,
+                       post_transition, transition_list)
+from jira_async import AsyncJiraClient, AsyncIssueStream, collect
+from ollama_client import OllamaClient
+from intent_router import looks_like_jql
+from instrumentation import Span, instrumentation, record_ttft, traced_tool
+from ai_context import estimate_tokens
+from jql_cache import JqlResultCache, normalize, pages_for, text_search
+from issue_model import DESCRIPTION_LIMIT, IssueDetail, IssueSummary, parse_summaries, summary_table
+
+logger = logging.getLogger(__name__)
+
+ISSUE_KEY = re.compile(r'\b[A-Za-z][A-Za-z0-9_]+-\d+\b')
+
+class OllamaLLM(LLM):
+    """LangChain LLM backed by a local Ollama server"""
+    model: str = "gemma:2b"
+    
+    def __init__(self, client: OllamaClient, **kwargs):
+        super().__init__(model=client.model, **kwargs)
+        self._client = client
+    
+    @property
+    def client(self):
+        return self._client
+    
+    @property
+    def _llm_type(self) -> str:
+        return "ollama"
+    
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> str:
+        """Stream the completion, forwarding tokens to LangChain callbacks"""
+        tokens = []
+        for token in self.client.stream(prompt, stop=stop):
+            if run_manager:
+                run_manager.on_llm_new_token(token)
+            tokens.append(token)
+        return "".join(tokens)
+
+class InstrumentationCallback(BaseCallbackHandler):
+    """Records an 'llm' span (latency, tokens, payload size) for every LLM call the agent makes"""
+    
+    def __init__(self, name: str):
+        super().__init__()
+        self.name = name
+        self._runs = {}
+    
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._runs[run_id] = (Span('llm', self.name, start=time.time()), time.perf_counter(), prompts)
+    
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        entry = self._runs.get(run_id)
+        if entry and 'ttft_ms' not in entry[0].attributes:
+            ttft = time.perf_counter() - entry[1]
+            entry[0].attributes['ttft_ms'] = round(ttft * 1000, 1)
+            record_ttft(self.name, ttft)
+    
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id, response=response)
+    
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=error)
+    
+    def _finish(self, run_id, response=None, error=None):
+        entry = self._runs.pop(run_id, None)
+        if entry is None:
+            return
+        span, started, prompts = entry
+        span.seconds = time.perf_counter() - started
+        text = "".join(g.text for gens in response.generations for g in gens) if response else ""
+        # Hosted providers report usage; otherwise estimate it
+        usage = ((response.llm_output or {}).get('token_usage') or {}) if response else {}
+        span.tokens = usage.get('total_tokens') or sum(estimate_tokens(p) for p in prompts) + estimate_tokens(text)
+        span.bytes = sum(len(p) for p in prompts) + len(text)
+        if error is not None:
+            span.ok = False
+            span.error = str(error)[:200]
+        instrumentation.record(span)
+
+class TokenStreamHandler(BaseCallbackHandler):
+    """Forwards one agent run's LLM tokens and tool observations to ``on_token`` as they happen"""
+    
+    def __init__(self, on_token, name: str = "agent"):
+        super().__init__()
+        self.on_token = on_token
+        self.name = name
+        self._started = time.perf_counter()
+        self.first_token_seconds = None
+    
+    def on_llm_new_token(self, token, **kwargs):
+        if self.first_token_seconds is None:
+            # End-to-end: from the question to the first token the user sees
+            self.first_token_seconds = time.perf_counter() - self._started
+            record_ttft(self.name, self.first_token_seconds)
+        self.on_token(token)
+    
+    def on_tool_end(self, output, **kwargs):
+        self.on_token(f"\nObservation: {output}\nThought:")
+
+class ObservationRecorder(BaseCallbackHandler):
+    """Collects (tool, input, observation) for every tool call of one agent run"""
+    
+    def __init__(self):
+        super().__init__()
+        self.steps = []
+        self._pending = []
+    
+    def on_tool_start(self, serialized, input_str, **kwargs):
+        self._pending.append(((serialized or {}).get("name", "tool"), input_str))
+    
+    def on_tool_end(self, output, **kwargs):
+        if self._pending:
+            tool, tool_input = self._pending.pop()
+            self.steps.append((tool, tool_input, output))
+    
+    def on_tool_error(self, error, **kwargs):
+        if self._pending:
+            tool, tool_input = self._pending.pop()
+            self.steps.append((tool, tool_input, f"Error: {error}"))
+
+class JiraSearchTool(BaseTool):
+    """Tool for searching JIRA issues"""
+    name: str = "jira_search"
+    description: str = "Search for JIRA issues using JQL (JIRA Query Language). Use this to find specific issues, bugs, or tasks."
+    max_results: int = 50
+    # 'hybrid' ranks semantic hits alongside text/JQL hits; 'semantic' skips the server-side text search
+    semantic_mode: str = "hybrid"
+    
+    def __init__(self, jira_client, mirror: Optional[JiraMirror] = None,
+                 async_client: Optional[AsyncJiraClient] = None, semantic_index=None,
+                 result_cache: Optional[JqlResultCache] = None, **kwargs):
+        super().__init__(**kwargs)
+        self._jira_client = jira_client
+        self._mirror = mirror
+        self._async_client = async_client
+        self._semantic_index = semantic_index
+        self._result_cache = result_cache
+    
+    @property
+    def jira_client(self):
+        return self._jira_client
+    
+    @property
+    def mirror(self):
+        return self._mirror
+    
+    @property
+    def async_client(self):
+        return self._async_client
+    
+    @property
+    def semantic_index(self):
+        return self._semantic_index
+    
+    @property
+    def result_cache(self):
+        return self._result_cache
+    
+    def _build_jql(self, query: str) -> str:
+        """Turn the tool input into JQL"""
+        # Anything that is not JQL is searched as escaped text - prose mentioning
+        # "status" or "project" is not a query Jira can parse
+        if looks_like_jql(query):
+            return query
+        jql = text_search(query)
+        if jql is None:
+            raise ValueError(f"nothing to search for in {query!r}")
+        return jql
+    
+    def _search(self, jql: str):
+        """(issues, total) from the result cache, or a lazily streamed search"""
+        if self.result_cache:
+            return self.result_cache.search(self.jira_client, jql, limit=self.max_results)
+        # Stream pages lazily and only pull the fields we render
+        return search_issues(self.jira_client, jql, fields=SUMMARY_FIELDS, limit=self.max_results), None
+    
+    async def _asearch(self, jql: str):
+        cached = self.result_cache.lookup(jql, self.max_results) if self.result_cache else None
+        if cached:
+            return cached
+        stream = AsyncIssueStream(self.async_client, normalize(jql), fields=SUMMARY_FIELDS, limit=self.max_results)
+        issues = await collect(stream)
+        if self.result_cache:
+            issues = parse_summaries(issues)
+            self.result_cache.store(jql, self.max_results, issues, stream.total, pages_for(len(issues)))
+        return issues, stream.total
+    
+    def _search_mirror(self, jql: str):
+        """Answer text searches of the mirrored project from the local FTS index when possible"""
+        # Unscoped searches span projects the mirror does not hold, so only Jira can answer them
+        text = self.mirror.scoped_text(jql) if self.mirror else None
+        if text:
+            matches = list(self.mirror.search_text(text, limit=self.max_results))
+            if matches:
+                return matches
+        return None
+    
+    def _semantic(self, query: str, jql: str) -> bool:
+        return bool(self.semantic_index) and jql != query
+    
+    def _hybrid(self, query: str, jql: str, lexical) -> Optional[list]:
+        """Rank semantic hits alongside the text/JQL hits for plain-language queries"""
+        if not self._semantic(query, jql):
+            return None
+        return self.semantic_index.hybrid(query, parse_summaries(lexical or []), k=self.max_results)
+    
+    def _format_results(self, issues, total: Optional[int] = None) -> str:
+        """Render search hits for the LLM as a TSV table (header once, one row per issue)"""
+        result = parse_summaries(issues)
+        
+        if not result:
+            return "No issues found matching your search criteria."
+        
+        output = summary_table(result)
+        # Streams only know the server-side total once the first page is in
+        total = total if total is not None else getattr(issues, 'total', None)
+        if total and total > len(result):
+            output += f"\n(Showing {len(result)} of {total} matching issues - refine the JQL to narrow results)"
+        return output
+    
+    @traced_tool
+    def _run(self, query: str) -> str:
+        """Search JIRA issues"""
+        try:
+            jql = self._build_jql(query)
+            issues = self._search_mirror(jql)
+            if issues is None and self.semantic_mode == "semantic" and self._semantic(query, jql):
+                issues = []
+            total = None
+            if issues is None:
+                issues, total = self._search(jql)
+            hybrid = self._hybrid(query, jql, issues)
+            return self._format_results(issues if hybrid is None else hybrid, total if hybrid is None else None)
+        except Exception as e:
+            logger.error(f"Error searching JIRA: {str(e)}")
+            return f"Error searching JIRA: {str(e)}"
+    
+    @traced_tool
+    async def _arun(self, query: str) -> str:
+        """Search JIRA issues without blocking the event loop"""
+        if not self.async_client:
+            return await asyncio.to_thread(self._run, query)
+        try:
+            jql = self._build_jql(query)
+            issues = self._search_mirror(jql)
+            if issues is None and self.semantic_mode == "semantic" and self._semantic(query, jql):
+                issues = []
+            if issues is not None:
+                hybrid = self._hybrid(query, jql, issues)
+                return self._format_results(issues if hybrid is None else hybrid)
+            issues, total = await self._asearch(jql)
+            hybrid = self._hybrid(query, jql, issues)
+            return self._format_results(issues if hybrid is None else hybrid, total if hybrid is None else None)
+        except Exception as e:
+            logger.error(f"Error searching JIRA: {str(e)}")
+            return f"Error searching JIRA: {str(e)}"
+
+class JiraCreateIssueTool(BaseTool):
+    """Tool for creating JIRA issues"""
+    name: str = "jira_create_issue"
+    description: str = "Create a new JIRA issue. Provide project key, issue type, summary, and description."
+    
+    def __init__(self, jira_client, issue_cache: Optional[IssueCache] = None,
+                 async_client: Optional[AsyncJiraClient] = None, metadata: Optional[JiraMetadata] = None):
+        super().__init__()
+        self._jira_client = jira_client
+        self._issue_cache = issue_cache
+        self._async_client = async_client
+        self._metadata = metadata
+    
+    @property
+    def jira_client(self):
+        return self._jira_client
+    
+    @property
+    def issue_cache(self):
+        return self._issue_cache
+    
+    @property
+    def async_client(self):
+        return self._async_client
+    
+    @property
+    def metadata(self):
+        return self._metadata
+    
+    def _fields(self, data) -> dict:
+        """Create fields with project/type/priority/assignee checked locally"""
+        fields = build_issue_fields(data)
+        return self.metadata.resolve_fields(fields) if self.metadata else fields
+    
+    def _created(self, new_issue) -> str:
+        if self.issue_cache:
+            self.issue_cache.invalidate(new_issue['key'])
+        return f"Successfully created issue: {new_issue['key']}"
+    
+    @traced_tool
+    def _run(self, issue_data: str) -> str:
+        """Create a new JIRA issue"""
+        try:
+            # Parse the issue data (expect JSON format)
+            data = json.loads(issue_data)
+            issue_dict = self._fields(data)
+            
+            new_issue = self.jira_client.issue_create(fields=issue_dict)
+            return self._created(new_issue)
+            
+        except json.JSONDecodeError:
+            return "Error: Please provide issue data in JSON format"
+        except ValueError as e:
+            # Rejected locally (unknown project, type, priority or user): nothing was sent
+            return f"Error: {str(e)}"
+        except Exception as e:
+            logger.error(f"Error creating JIRA issue: {str(e)}")
+            return f"Error creating JIRA issue: {str(e)}"
+    
+    @traced_tool
+    async def _arun(self, issue_data: str) -> str:
+        """Create a new JIRA issue without blocking the event loop"""
+        if not self.async_client:
+            return await asyncio.to_thread(self._run, issue_data)
+        try:
+            issue_dict = self._fields(json.loads(issue_data))
+            new_issue = await self.async_client.issue_create(fields=issue_dict)
+            return self._created(new_issue)
+        except json.JSONDecodeError:
+            return "Error: Please provide issue data in JSON format"
+        except ValueError as e:
+            # Rejected locally (unknown project, type, priority or user): nothing was sent
+            return f"Error: {str(e)}"
+        except Exception as e:
+            logger.error(f"Error creating JIRA issue: {str(e)}")
+            return f"Error creating JIRA issue: {str(e)}"
+
+class JiraUpdateIssueTool(BaseTool):
+    """Tool for updating JIRA issues"""
+    name: str = "jira_update_issue"
+    description: str = "Update an existing JIRA issue. Provide issue key and fields to update."
+    
+    def __init__(self, jira_client, issue_cache: Optional[IssueCache] = None,
+                 mirror: Optional[JiraMirror] = None, async_client: Optional[AsyncJiraClient] = None,
+                 metadata: Optional[JiraMetadata] = None):
+        super().__init__()
+        self._jira_client = jira_client
+        self._issue_cache = issue_cache
+        self._mirror = mirror
+        self._async_client = async_client
+        self._metadata = metadata
+    
+    @property
+    def jira_client(self):
+        return self._jira_client
+    
+    @property
+    def issue_cache(self):
+        return self._issue_cache
+    
+    @property
+    def mirror(self):
+        return self._mirror
+    
+    @property
+    def async_client(self):
+        return self._async_client
+    
+    @property
+    def metadata(self):
+        return self._metadata
+    
+    def _invalidate(self, issue_key: str):
+        """Drop cached copies of an issue after a write"""
+        if self.issue_cache:
+            self.issue_cache.invalidate(issue_key)
+        if self.mirror:
+            self.mirror.forget(issue_key)
+    
+    def _fields(self, data) -> dict:
+        fields = build_update_fields(data)
+        return self.metadata.resolve_fields(fields) if self.metadata and fields else fields
+    
+    def _scope(self, issue_key: str):
+        """(project, issue type, status) from a local copy, so transitions are shared per workflow step"""
+        issue = self.issue_cache.peek(issue_key) if self.issue_cache else None
+        if issue is None and self.mirror:
+            issue = self.mirror.get(issue_key)
+        fields = issue.get('fields', {}) if isinstance(issue, dict) else {}
+        try:
+            return fields['project']['key'], fields['issuetype']['name'], fields['status']['name']
+        except (KeyError, TypeError):
+            return None
+    
+    @staticmethod
+    def _match_transition(transitions, new_status: str):
+        return next((t['id'] for t in transitions if t['name'].lower() == new_status.lower()), None)
+    
+    def _transitioned(self, issue_key: str, new_status: str) -> str:
+        self._invalidate(issue_key)
+        if self.metadata:
+            self.metadata.transitioned(issue_key)
+        return f"Successfully transitioned {issue_key} to {new_status}"
+    
+    @traced_tool
+    def _run(self, update_data: str) -> str:
+        """Update a JIRA issue"""
+        try:
+            data = json.loads(update_data)
+            issue_key = data.get('issue_key')
+            
+            if not issue_key:
+                return "Error: issue_key is required"
+            
+            if data.get('status'):
+                # For status updates, we need to use transitions
+                return self._transition_issue(issue_key, data['status'])
+            
+            update_fields = self._fields(data)
+            if update_fields:
+                self.jira_client.issue_update(issue_key, fields=update_fields)
+                self._invalidate(issue_key)
+                return f"Successfully updated issue: {issue_key}"
+            else:
+                return "No valid fields provided for update"
+                
+        except json.JSONDecodeError:
+            return "Error: Please provide update data in JSON format"
+        except ValueError as e:
+            return f"Error: {str(e)}"
+        except Exception as e:
+            logger.error(f"Error updating JIRA issue: {str(e)}")
+            return f"Error updating JIRA issue: {str(e)}"
+    
+    def _transition_issue(self, issue_key: str, new_status: str) -> str:
+        """Transition issue to new status"""
+        try:
+            if self.metadata:
+                transition_id = self.metadata.transition_id(self.jira_client, issue_key, new_status,
+                                                            self._scope(issue_key))
+            else:
+                transition_id = self._match_transition(
+                    transition_list(self.jira_client.get_issue_transitions(issue_key)), new_status)
+            
+            if transition_id is None:
+                return f"Error: Status '{new_status}' not available for issue {issue_key}"
+            post_transition(self.jira_client, issue_key, transition_id)
+            return self._transitioned(issue_key, new_status)
+        except ValueError as e:
+            return f"Error: {str(e)}"
+        except Exception as e:
+            # The local copy may hold an outdated status - re-read it next time
+            self._invalidate(issue_key)
+            return f"Error transitioning issue: {str(e)}"
+    
+    @traced_tool
+    async def _arun(self, update_data: str) -> str:
+        """Update a JIRA issue without blocking the event loop"""
+        if not self.async_client:
+            return await asyncio.to_thread(self._run, update_data)
+        try:
+            data = json.loads(update_data)
+            issue_key = data.get('issue_key')
+            
+            if not issue_key:
+                return "Error: issue_key is required"
+            
+            if data.get('status'):
+                return await self._atransition_issue(issue_key, data['status'])
+            
+            update_fields = self._fields(data)
+            if not update_fields:
+                return "No valid fields provided for update"
+            await self.async_client.issue_update(issue_key, fields=update_fields)
+            self._invalidate(issue_key)
+            return f"Successfully updated issue: {issue_key}"
+        except json.JSONDecodeError:
+            return "Error: Please provide update data in JSON format"
+        except ValueError as e:
+            return f"Error: {str(e)}"
+        except Exception as e:
+            logger.error(f"Error updating JIRA issue: {str(e)}")
+            return f"Error updating JIRA issue: {str(e)}"
+    
+    async def _atransition_issue(self, issue_key: str, new_status: str) -> str:
+        """Transition issue to new status (async)"""
+        try:
+            if self.metadata:
+                scope = self._scope(issue_key) or ('', '', issue_key.upper())
+                transitions = self.metadata.transitions.peek(scope)
+                if transitions is None:
+                    transitions = self.metadata.transitions.put(
+                        scope, await self.async_client.get_issue_transitions(issue_key))
+                transition_id = self.metadata.match_transition(issue_key, new_status, transitions)
+            else:
+                transition_id = self._match_transition(
+                    transition_list(await self.async_client.get_issue_transitions(issue_key)), new_status)
+            
+            if transition_id is None:
+                return f"Error: Status '{new_status}' not available for issue {issue_key}"
+            await self.async_client.post_transition(issue_key, transition_id)
+            return self._transitioned(issue_key, new_status)
+        except ValueError as e:
+            return f"Error: {str(e)}"
+        except Exception as e:
+            self._invalidate(issue_key)
+            return f"Error transitioning issue: {str(e)}"
+
+class JiraBulkCreateIssuesTool(BaseTool):
+    """Tool for creating many JIRA issues at once"""
+    name: str = "jira_bulk_create_issues"
+    description: str = ("Create many JIRA issues in one call. Input is a JSON list of objects with "
+                        "project_key, issue_type, summary, description and optional assignee/priority.")
+    
+    def __init__(self, bulk: JiraBulkOperations):
+        super().__init__()
+        self._bulk = bulk
+    
+    @property
+    def bulk(self):
+        return self._bulk
+    
+    @traced_tool
+    def _run(self, issues_data: str) -> str:
+        """Create issues in chunks through the bulk endpoint"""
+        try:
+            items = json.loads(issues_data)
+            if not isinstance(items, list):
+                return "Error: Please provide a JSON list of issues"
+            return json.dumps(self.bulk.create_issues(items), indent=2)
+        except json.JSONDecodeError:
+            return "Error: Please provide issue data in JSON format"
+        except Exception as e:
+            logger.error(f"Error bulk creating JIRA issues: {str(e)}")
+            return f"Error bulk creating JIRA issues: {str(e)}"
+    
+    @traced_tool
+    async def _arun(self, issues_data: str) -> str:
+        """Bulk operations already fan out on their own pool - just keep them off the event loop"""
+        return await asyncio.to_thread(self._run, issues_data)
+
+class JiraBulkUpdateIssuesTool(BaseTool):
+    """Tool for updating or transitioning many JIRA issues at once"""
+    name: str = "jira_bulk_update_issues"
+    description: str = ("Update or change the status of many JIRA issues in one call. Input is a JSON list "
+                        "of objects with issue_key and any of summary, description, assignee, status.")
+    
+    def __init__(self, bulk: JiraBulkOperations):
+        super().__init__()
+        self._bulk = bulk
+    
+    @property
+    def bulk(self):
+        return self._bulk
+    
+    @traced_tool
+    def _run(self, update_data: str) -> str:
+        """Apply updates concurrently with memoized transition lookups"""
+        try:
+            items = json.loads(update_data)
+            if not isinstance(items, list):
+                return "Error: Please provide a JSON list of updates"
+            return json.dumps(self.bulk.update_issues(items), indent=2)
+        except json.JSONDecodeError:
+            return "Error: Please provide update data in JSON format"
+        except Exception as e:
+            logger.error(f"Error bulk updating JIRA issues: {str(e)}")
+            return f"Error bulk updating JIRA issues: {str(e)}"
+    
+    @traced_tool
+    async def _arun(self, update_data: str) -> str:
+        """Bulk operations already fan out on their own pool - just keep them off the event loop"""
+        return await asyncio.to_thread(self._run, update_data)
+
+class JiraGetIssueTool(BaseTool):
+    """Tool for getting detailed information about a specific JIRA issue"""
+    name: str = "jira_get_issue"
+    description: str = "Get detailed information about a specific JIRA issue by its key (e.g., PROJ-123)."
+    
+    def __init__(self, jira_client, issue_cache: Optional[IssueCache] = None,
+                 mirror: Optional[JiraMirror] = None, async_client: Optional[AsyncJiraClient] = None):
+        super().__init__()
+        self._jira_client = jira_client
+        self._issue_cache = issue_cache
+        self._mirror = mirror
+        self._async_client = async_client
+    
+    @property
+    def jira_client(self):
+        return self._jira_client
+    
+    @property
+    def issue_cache(self):
+        return self._issue_cache
+    
+    @property
+    def mirror(self):
+        return self._mirror
+    
+    @property
+    def async_client(self):
+        return self._async_client
+    
+    def _fetch_issue(self, issue_key: str):
+        """Fetch an issue from the server, via the issue cache when available"""
+        if self.issue_cache:
+            return self.issue_cache.get(issue_key, lambda: self.jira_client.issue(issue_key))
+        return self.jira_client.issue(issue_key)
+    
+    def _format_issue(self, issue) -> str:
+        """Render issue details for the LLM"""
+        return IssueDetail.from_raw(issue).text()
+    
+    @traced_tool
+    def _run(self, issue_key: str) -> str:
+        """Get detailed issue information"""
+        try:
+            if self.mirror:
+                issue = self.mirror.get_or_fetch(issue_key, lambda: self._fetch_issue(issue_key))
+            else:
+                issue = self._fetch_issue(issue_key)
+            
+            return self._format_issue(issue)
+            
+        except Exception as e:
+            logger.error(f"Error getting JIRA issue: {str(e)}")
+            return f"Error getting JIRA issue: {str(e)}"
+    
+    @traced_tool
+    async def _arun(self, issue_key: str) -> str:
+        """Get detailed issue information without blocking the event loop"""
+        if not self.async_client:
+            return await asyncio.to_thread(self._run, issue_key)
+        try:
+            issue = self.mirror.get(issue_key) if self.mirror else None
+            if issue is None and self.issue_cache:
+                issue = self.issue_cache.lookup(issue_key)
+            if issue is None:
+                issue = await self.async_client.issue(issue_key)
+                if self.issue_cache:
+                    self.issue_cache.put(issue_key, issue)
+                if self.mirror:
+                    self.mirror.upsert(issue)
+            
+            return self._format_issue(issue)
+            
+        except Exception as e:
+            logger.error(f"Error getting JIRA issue: {str(e)}")
+            return f"Error getting JIRA issue: {str(e)}"
+
+class JiraGetIssuesTool(BaseTool):
+    """Tool for fetching several JIRA issues in one call"""
+    name: str = "jira_get_issues"
+    description: str = ("Get details for several JIRA issues at once, e.g. to compare them. "
+                        "Input: the issue keys separated by commas (e.g., PROJ-1, PROJ-2, PROJ-3).")
+    max_keys: int = 50
+    
+    def __init__(self, jira_client, issue_cache: Optional[IssueCache] = None,
+                 mirror: Optional[JiraMirror] = None, async_client: Optional[AsyncJiraClient] = None):
+        super().__init__()
+        self._jira_client = jira_client
+        self._issue_cache = issue_cache
+        self._mirror = mirror
+        self._async_client = async_client
+    
+    @property
+    def jira_client(self):
+        return self._jira_client
+    
+    @property
+    def issue_cache(self):
+        return self._issue_cache
+    
+    @property
+    def mirror(self):
+        return self._mirror
+    
+    @property
+    def async_client(self):
+        return self._async_client
+    
+    def _keys(self, text: str) -> List[str]:
+        return list(dict.fromkeys(key.upper() for key in ISSUE_KEY.findall(text)))[:self.max_keys]
+    
+    def _local(self, keys: List[str]) -> dict:
+        """Issues already held by the mirror or the issue cache"""
+        found = {}
+        for key in keys:
+            issue = self.mirror.get(key) if self.mirror else None
+            if issue is None and self.issue_cache:
+                issue = self.issue_cache.lookup(key)
+            if issue is not None:
+                found[key] = issue
+        return found
+    
+    def _store(self, fetched: dict):
+        for key, issue in fetched.items():
+            if self.issue_cache:
+                self.issue_cache.put(key, issue)
+            if self.mirror:
+                self.mirror.upsert(issue)
+    
+    def _try_issue(self, issue_key: str):
+        try:
+            return self.jira_client.issue(issue_key)
+        except Exception as e:
+            logger.error(f"Error getting JIRA issue {issue_key}: {str(e)}")
+            return None
+    
+    def _fetch(self, keys: List[str]) -> dict:
+        """One `key in (...)` search; concurrent single fetches if Jira rejects the JQL"""
+        try:
+            issues = search_issues(self.jira_client, f"key in ({', '.join(keys)})", fields=MIRROR_FIELDS,
+                                   limit=len(keys), prefetch=False)
+            return {IssueSummary.from_raw(issue).key: issue for issue in issues}
+        except Exception as e:
+            # Jira fails the whole search when one key does not exist or is not visible
+            logger.info(f"Batch fetch failed ({str(e)}), fetching {len(keys)} issues one by one")
+        with ThreadPoolExecutor(max_workers=min(8, len(keys)), thread_name_prefix="jira-get-issues") as pool:
+            results = dict(zip(keys, pool.map(self._try_issue, keys)))
+        return {key: issue for key, issue in results.items() if issue is not None}
+    
+    def _format(self, keys: List[str], found: dict) -> str:
+        """Issue blocks in the order asked; descriptions shrink as the list grows"""
+        limit = max(200, DESCRIPTION_LIMIT // len(keys))
+        blocks = [IssueDetail.from_raw(found[key]).text(limit) for key in keys if key in found]
+        missing = [key for key in keys if key not in found]
+        if missing:
+            blocks.append(f"Not found or not visible: {', '.join(missing)}")
+        return "\n\n".join(blocks)
+    
+    @traced_tool
+    def _run(self, issue_keys: str) -> str:
+        """Get several issues with at most one search request"""
+        try:
+            keys = self._keys(issue_keys)
+            if not keys:
+                return "Error: provide issue keys such as PROJ-1, PROJ-2"
+            found = self._local(keys)
+            missing = [key for key in keys if key not in found]
+            if missing:
+                fetched = self._fetch(missing)
+                self._store(fetched)
+                found.update(fetched)
+            return self._format(keys, found)
+        except Exception as e:
+            logger.error(f"Error getting JIRA issues: {str(e)}")
+            return f"Error getting JIRA issues: {str(e)}"
+    
+    @traced_tool
+    async def _arun(self, issue_keys: str) -> str:
+        """Get several issues without blocking the event loop"""
+        if not self.async_client:
+            return await asyncio.to_thread(self._run, issue_keys)
+        try:
+            keys = self._keys(issue_keys)
+            if not keys:
+                return "Error: provide issue keys such as PROJ-1, PROJ-2"
+            found = self._local(keys)
+            missing = [key for key in keys if key not in found]
+            if missing:
+                try:
+                    stream = AsyncIssueStream(self.async_client, f"key in ({', '.join(missing)})",
+                                              fields=MIRROR_FIELDS, limit=len(missing))
+                    fetched = {issue['key']: issue for issue in await collect(stream)}
+                except Exception as e:
+                    logger.info(f"Batch fetch failed ({str(e)}), fetching {len(missing)} issues concurrently")
+                    results = await asyncio.gather(*(self.async_client.issue(key) for key in missing),
+                                                   return_exceptions=True)
+                    fetched = {key: issue for key, issue in zip(missing, results)
+                               if not isinstance(issue, BaseException)}
+                self._store(fetched)
+                found.update(fetched)
+            return self._format(keys, found)
+        except Exception as e:
+            logger.error(f"Error getting JIRA issues: {str(e)}")
+            return f"Error getting JIRA issues: {str(e)}"
+
+class JiraParallelTool(BaseTool):
+    """Runs independent tool calls concurrently within one agent step"""
+    name: str = "jira_parallel"
+    # No literal braces: tool descriptions end up in the agent's prompt template
+    description: str = ("Run several independent tool calls at once instead of one per step. Input is a JSON list "
+                        "of objects with tool (a tool name such as jira_search or jira_get_issue) and input "
+                        "(that tool's input). Returns every observation in order.")
+    max_calls: int = 8
+    
+    def __init__(self, tools):
+        super().__init__()
+        self._tools = {tool.name: tool for tool in tools if tool.name != self.name}
+    
+    @property
+    def tools(self):
+        return self._tools
+    
+    def _calls(self, text: str):
+        """[(tool name, tool or None, input string)] from the JSON input, and how many were left out"""
+        calls = json.loads(text)
+        if isinstance(calls, dict):
+            calls = calls.get("calls", [calls])
+        parsed = []
+        for call in calls[:self.max_calls]:
+            tool_input = call.get("input", "")
+            # Write tools take their arguments as a JSON string
+            if not isinstance(tool_input, str):
+                tool_input = json.dumps(tool_input)
+            parsed.append((call.get("tool"), self.tools.get(call.get("tool")), tool_input))
+        return parsed, max(0, len(calls) - self.max_calls)
+    
+    def _format(self, calls, outputs, skipped: int) -> str:
+        output = "\n\n".join(f"[{i}] {name} {tool_input}:\n{output}"
+                             for i, ((name, _, tool_input), output) in enumerate(zip(calls, outputs), 1))
+        if skipped:
+            # The agent has to know the rest were not run, or it answers from a partial result
+            output += f"\n\nNot run: the last {skipped} calls (at most {self.max_calls} per step) - send them again"
+        return output
+    
+    @staticmethod
+    def _unknown(name) -> str:
+        return f"Error: unknown tool {name}"
+    
+    @traced_tool
+    def _run(self, calls: str) -> str:
+        """Run the calls on a thread per call"""
+        try:
+            parsed, skipped = self._calls(calls)
+        except (ValueError, AttributeError, TypeError) as e:
+            return f"Error: input must be a JSON list of {{\"tool\", \"input\"}} objects ({str(e)})"
+        if not parsed:
+            return "Error: no tool calls given"
+        with ThreadPoolExecutor(max_workers=len(parsed), thread_name_prefix="jira-parallel") as pool:
+            outputs = list(pool.map(lambda call: call[1]._run(call[2]) if call[1] else self._unknown(call[0]),
+                                    parsed))
+        return self._format(parsed, outputs, skipped)
+    
+    @traced_tool
+    async def _arun(self, calls: str) -> str:
+        """Run the calls concurrently on the event loop"""
+        try:
+            parsed, skipped = self._calls(calls)
+        except (ValueError, AttributeError, TypeError) as e:
+            return f"Error: input must be a JSON list of {{\"tool\", \"input\"}} objects ({str(e)})"
+        if not parsed:
+            return "Error: no tool calls given"
+        
+        async def run(call):
+            name, tool, tool_input = call
+            return await tool._arun(tool_input) if tool else self._unknown(name)
+        
+        outputs = await asyncio.gather(*(run(call) for call in parsed))
+        return self._format(parsed, outputs, skipped)
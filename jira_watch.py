@@ -0,0 +1,308 @@
+import hmac
+import ipaddress
+import json
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from issue_model import IssueSummary, loads
+from jira_search import SUMMARY_FIELDS, search_issues
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 30.0
+# The first poll reports this many most-recently-updated issues, like menu option 1
+DEFAULT_INITIAL_LIMIT = 10
+# Seen entries updated this long before the cursor can no longer match the poll window
+PRUNE_MARGIN = 5 * 60
+WATCHED_FIELDS = ('summary', 'status', 'assignee', 'priority')
+WATCH_FIELDS = SUMMARY_FIELDS + ['created', 'updated']
+WEBHOOK_KINDS = {'jira:issue_created': 'created', 'jira:issue_updated': 'updated', 'jira:issue_deleted': 'deleted'}
+
+
+def _epoch(timestamp: Optional[str]) -> Optional[float]:
+    """Epoch seconds of a Jira timestamp like '2024-01-31T09:15:00.000+0000'"""
+    try:
+        return datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.%f%z').timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class IssueChange:
+    """One delta since the last look.
+
+    ``kind`` is 'created', 'updated' or 'deleted' ('recent' for the first poll,
+    which has no earlier state to compare against).
+    """
+    key: str
+    kind: str
+    issue: Optional[IssueSummary] = None
+    updated: Optional[str] = None
+    # field -> (old, new); empty when the previous state is unknown
+    changed: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    source: str = 'poll'
+    raw: Optional[Dict[str, Any]] = field(default=None, repr=False)
+
+    def describe(self) -> str:
+        if self.kind == 'deleted' or self.issue is None:
+            return f"{self.key} {self.kind}"
+        details = ', '.join(f"{name}: {old} -> {new}" for name, (old, new) in self.changed.items())
+        return f"{self.issue.line()}" + (f"  ({details})" if details else '')
+
+
+class IssueWatcher:
+    """Incremental change feed for a JQL scope.
+
+    Each poll asks only for issues with ``updated`` inside the window since the
+    persisted cursor and emits just the ones whose ``updated`` moved, so a refresh
+    costs bytes proportional to what changed. Webhook events (see WebhookReceiver)
+    go through the same de-duplication, so an edit pushed by a webhook is not
+    reported again by the next poll.
+    """
+
+    def __init__(self, client=None, jql: str = 'project = MFLP', cursor_path: Optional[str] = None,
+                 fields: Sequence[str] = WATCH_FIELDS, initial_limit: int = DEFAULT_INITIAL_LIMIT,
+                 clock: Callable[[], float] = time.time):
+        self.client = client
+        self.jql = jql
+        self.cursor_path = cursor_path
+        self.fields = list(fields)
+        self.initial_limit = initial_limit
+        self.clock = clock
+        self.cursor: Optional[float] = None
+        # key -> {'updated': ..., watched field values}; just enough to de-duplicate and diff
+        self._seen: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: List[Callable[[IssueChange], None]] = []
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.polls = 0
+        self.fetched = 0
+        self.emitted = 0
+        self.webhook_events = 0
+        if cursor_path:
+            self.load_cursor()
+
+    # --- Subscribers ---
+    def subscribe(self, callback: Callable[[IssueChange], None]):
+        self._subscribers.append(callback)
+
+    def _notify(self, changes: List[IssueChange]):
+        for change in changes:
+            for callback in self._subscribers:
+                try:
+                    callback(change)
+                except Exception as e:
+                    logger.error(f"Watch subscriber failed on {change.key}: {str(e)}")
+
+    # --- Polling ---
+    def _window_jql(self, now: float) -> str:
+        if self.cursor is None:
+            return f'{self.jql} ORDER BY updated DESC'
+        # Relative dates avoid timezone mismatches; overlap by a minute so nothing is missed
+        minutes = max(1, math.ceil((now - self.cursor) / 60) + 1)
+        return f'({self.jql}) AND updated >= "-{minutes}m" ORDER BY updated ASC'
+
+    def poll_once(self) -> List[IssueChange]:
+        """Fetch what changed since the cursor, emit and return the deltas"""
+        now = self.clock()
+        since = self.cursor
+        first = since is None
+        issues = search_issues(self.client, self._window_jql(now), fields=self.fields,
+                               limit=self.initial_limit if first else None, prefetch=False)
+        changes = []
+        fetched = 0
+        for issue in issues:
+            fetched += 1
+            change = self._diff(issue, 'poll', 'recent' if first else None, since)
+            if change:
+                changes.append(change)
+        with self._lock:
+            self.polls += 1
+            self.fetched += fetched
+            self.emitted += len(changes)
+            self.cursor = now
+            self._prune()
+        self.save_cursor()
+        self._notify(changes)
+        return changes
+
+    def _diff(self, issue, source: str, kind: Optional[str] = None,
+              since: Optional[float] = None) -> Optional[IssueChange]:
+        raw = issue if isinstance(issue, dict) else issue.raw
+        summary = IssueSummary.from_raw(raw)
+        fields = raw.get('fields') or {}
+        updated = fields.get('updated')
+        state = {'updated': updated, **{name: getattr(summary, name) for name in WATCHED_FIELDS}}
+        with self._lock:
+            previous = self._seen.get(summary.key)
+            if previous and previous['updated'] == updated:
+                return None
+            self._seen[summary.key] = state
+        changed = {} if previous is None else {
+            name: (previous.get(name), state[name]) for name in WATCHED_FIELDS if previous.get(name) != state[name]
+        }
+        if kind is None:
+            created = _epoch(fields.get('created'))
+            kind = 'created' if previous is None and created and since and created >= since - 60 else 'updated'
+        return IssueChange(summary.key, kind, summary, updated, changed, source, raw)
+
+    def _prune(self):
+        horizon = (self.cursor or 0) - PRUNE_MARGIN
+        for key in [k for k, s in self._seen.items() if (_epoch(s['updated']) or horizon) < horizon]:
+            del self._seen[key]
+
+    # --- Webhooks ---
+    def ingest(self, event: Dict[str, Any]) -> Optional[IssueChange]:
+        """Apply one Jira webhook payload ({"webhookEvent": "jira:issue_updated", "issue": {...}})"""
+        kind = WEBHOOK_KINDS.get(event.get('webhookEvent'))
+        issue = event.get('issue')
+        if kind is None or not issue or 'key' not in issue:
+            return None
+        with self._lock:
+            self.webhook_events += 1
+        if kind == 'deleted':
+            with self._lock:
+                self._seen.pop(issue['key'], None)
+            change = IssueChange(issue['key'], 'deleted', source='webhook')
+        else:
+            change = self._diff(issue, 'webhook', kind)
+        if change:
+            with self._lock:
+                self.emitted += 1
+            self.save_cursor()
+            self._notify([change])
+        return change
+
+    # --- Background polling ---
+    def start(self, interval: float = DEFAULT_INTERVAL):
+        """Poll every ``interval`` seconds on a daemon thread"""
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    logger.error(f"Watch poll failed, retrying next interval: {str(e)}")
+                self._stop.wait(interval)
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=loop, name='jira-watch', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # --- Cursor ---
+    def load_cursor(self) -> bool:
+        if not self.cursor_path or not os.path.exists(self.cursor_path):
+            return False
+        try:
+            with open(self.cursor_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable watch cursor: {str(e)}")
+            return False
+        if data.get('jql') != self.jql:
+            # A cursor for another scope would hide this scope's older changes
+            return False
+        with self._lock:
+            self.cursor = data.get('cursor')
+            self._seen = data.get('seen', {})
+        return True
+
+    def save_cursor(self):
+        if not self.cursor_path:
+            return
+        with self._lock:
+            data = {'jql': self.jql, 'cursor': self.cursor, 'seen': dict(self._seen)}
+        tmp = f'{self.cursor_path}.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.cursor_path)
+        except OSError as e:
+            logger.error(f"Could not write watch cursor: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'polls': self.polls,
+                'issues_fetched': self.fetched,
+                'changes_emitted': self.emitted,
+                'webhook_events': self.webhook_events,
+                'tracked': len(self._seen),
+                'cursor_age_seconds': round(self.clock() - self.cursor, 1) if self.cursor else None,
+            }
+
+
+def is_loopback(host: str) -> bool:
+    """True when ``host`` only accepts connections from this machine"""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class WebhookReceiver:
+    """Minimal receiver for Jira issue webhooks, feeding an IssueWatcher.
+
+    Register ``url`` (plus ``?secret=...`` when a secret is set) as a Jira webhook
+    for issue created/updated/deleted events. Locally it doubles as the stand-in
+    the mock Jira posts to. Events are written into caches and the mirror, so a
+    host other than loopback is refused unless a secret is set.
+    """
+
+    def __init__(self, watcher: IssueWatcher, host: str = '127.0.0.1', port: int = 0,
+                 secret: Optional[str] = None, path: str = '/webhook'):
+        if not secret and not is_loopback(host):
+            raise ValueError(f"Refusing to accept unauthenticated webhooks on {host}: set a webhook secret")
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int):
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                if url.path.rstrip('/') != path:
+                    return self._reply(404)
+                given = parse_qs(url.query).get('secret', [''])[0]
+                if secret and not hmac.compare_digest(given.encode(), secret.encode()):
+                    return self._reply(403)
+                try:
+                    event = loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+                except ValueError:
+                    return self._reply(400)
+                receiver.watcher.ingest(event)
+                self._reply(204)
+
+        self.watcher = watcher
+        self.path = path
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='jira-webhooks', daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}{self.path}'
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
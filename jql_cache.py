@@ -0,0 +1,300 @@
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from issue_model import IssueSummary, parse_summaries
+from jira_search import DEFAULT_PAGE_SIZE, SUMMARY_FIELDS, count_issues, search_issues
+
+logger = logging.getLogger(__name__)
+
+# Short-lived: an edit anywhere can move issues in or out of a result
+DEFAULT_TTL = 120
+MAX_ENTRIES = 500
+# Larger results are streamed, not kept
+MAX_CACHED_ROWS = 1000
+
+# Lucene operators inside a `text ~` phrase either break the query or change its meaning
+LUCENE_SPECIAL = re.compile(r'[+\-&|!(){}\[\]^~*?:\\/"]')
+PROJECT_KEY = re.compile(r'[A-Za-z][A-Za-z0-9_]*')
+KEYWORDS = {'and', 'or', 'not', 'in', 'is', 'was', 'changed', 'empty', 'null', 'order', 'by', 'asc', 'desc'}
+# Quoted strings, operators, punctuation and bare words
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|!=|!~|>=|<=|[=~<>(),]|[^\s=~<>!(),"\']+|\S')
+_FUNCTION = re.compile(r'[A-Za-z_]\w*')
+
+
+def quote(value: str) -> str:
+    """A JQL string literal for arbitrary user text"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def text_search(text: str, project: Optional[str] = None, order_by: str = 'created DESC') -> Optional[str]:
+    """`text ~` JQL for plain user text (None when nothing searchable is left)"""
+    phrase = ' '.join(LUCENE_SPECIAL.sub(' ', text).split())
+    if not phrase:
+        return None
+    clauses = [f'text ~ {quote(phrase)}']
+    if project:
+        clauses.insert(0, f'project = {project if PROJECT_KEY.fullmatch(project) else quote(project)}')
+    return ' AND '.join(clauses) + (f' ORDER BY {order_by}' if order_by else '')
+
+
+def normalize(jql: str) -> str:
+    """Canonical spelling of a query: single spaces, upper-case keywords, quoted values untouched.
+
+    'project=MFLP and status in ("Done","To Do") order by created desc' becomes
+    'project = MFLP AND status IN ("Done", "To Do") ORDER BY created DESC'.
+    """
+    text, previous = '', None
+    for token in _TOKEN.findall(jql.strip()):
+        keyword = token.lower() in KEYWORDS
+        token = token.upper() if keyword else token
+        if previous is None or token in (')', ',') or previous == '(':
+            text += token
+        elif token == '(' and _FUNCTION.fullmatch(previous) and previous.lower() not in KEYWORDS:
+            # Function calls keep their parenthesis: currentUser(), membersOf("team")
+            text += token
+        else:
+            text += ' ' + token
+        previous = token
+    return text
+
+
+def pages_for(rows: int, page_size: int = DEFAULT_PAGE_SIZE) -> int:
+    """Requests a search returning ``rows`` issues took"""
+    return max(1, math.ceil(rows / page_size))
+
+
+class JqlResultCache:
+    """Result key lists per normalized JQL, kept for ``ttl`` seconds and optionally persisted to ``path``.
+
+    Every entry holds the matching keys in order, the server-side total and each
+    key's summary row, so a repeated search is answered without a request.
+    ``count`` is the cheap ``maxResults=0`` precheck, cached the same way.
+    Call ``clear()`` after writes.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_TTL, max_entries: int = MAX_ENTRIES,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        # cache key -> (rows, total, pages, stored_at)
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        # normalized JQL -> (total, stored_at)
+        self._counts: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.count_hits = 0
+        self.prechecks = 0
+        self.server_calls_saved = 0
+        self.clears = 0
+        if path:
+            self.load()
+
+    @staticmethod
+    def _key(jql: str, limit: Optional[int]) -> str:
+        return f"{limit or ''}|{jql}"
+
+    def _fresh(self, stored_at: float) -> bool:
+        return self.clock() - stored_at < self.ttl
+
+    @staticmethod
+    def _trim(entries: 'OrderedDict[str, tuple]', size: int):
+        while len(entries) > size:
+            entries.popitem(last=False)
+
+    # --- Results ---
+    def lookup(self, jql: str, limit: Optional[int] = None) -> Optional[Tuple[List[IssueSummary], int]]:
+        """(summaries, total) of a cached search, or None"""
+        key = self._key(normalize(jql), limit)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and self._fresh(entry[3]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.server_calls_saved += entry[2]
+                return list(entry[0]), entry[1]
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def store(self, jql: str, limit: Optional[int], issues: Sequence[IssueSummary], total: Optional[int],
+              pages: int = 1):
+        """Keep a finished search (and its total, which answers later prechecks)"""
+        jql = normalize(jql)
+        total = len(issues) if total is None else total
+        with self._lock:
+            now = self._remember_count(jql, total)
+            if len(issues) > MAX_CACHED_ROWS:
+                return
+            key = self._key(jql, limit)
+            self._entries[key] = (tuple(issues), total, max(1, pages), now)
+            self._entries.move_to_end(key)
+            self._trim(self._entries, self.max_entries)
+
+    def search(self, client, jql: str, limit: Optional[int] = None,
+               page_size: int = DEFAULT_PAGE_SIZE) -> Tuple[List[IssueSummary], Optional[int]]:
+        """Summary rows for ``jql`` from the cache, or from a streamed search that is then cached"""
+        cached = self.lookup(jql, limit)
+        if cached:
+            return cached
+        jql = normalize(jql)
+        stream = search_issues(client, jql, fields=SUMMARY_FIELDS, limit=limit, page_size=page_size)
+        issues = parse_summaries(stream)
+        self.store(jql, limit, issues, stream.total, stream.pages_fetched)
+        return issues, stream.total
+
+    def stream(self, client, jql: str, page_size: int = DEFAULT_PAGE_SIZE) -> 'ResultStream':
+        """Every row of ``jql``, replayed from the cache or streamed page by page"""
+        return ResultStream(self, client, jql, page_size)
+
+    # --- Counts ---
+    def cached_count(self, jql: str) -> Optional[int]:
+        jql = normalize(jql)
+        with self._lock:
+            entry = self._counts.get(jql)
+            if entry and self._fresh(entry[1]):
+                self.count_hits += 1
+                self.server_calls_saved += 1
+                return entry[0]
+            return None
+
+    def _remember_count(self, jql: str, total: int) -> float:
+        with self._lock:
+            now = self.clock()
+            self._counts[jql] = (total, now)
+            self._counts.move_to_end(jql)
+            self._trim(self._counts, self.max_entries)
+            return now
+
+    def store_count(self, jql: str, total: int):
+        jql = normalize(jql)
+        with self._lock:
+            self.prechecks += 1
+            self._remember_count(jql, total)
+
+    def count(self, client, jql: str) -> int:
+        """Matching issues, from the cache or a ``maxResults=0`` request that returns no issues"""
+        total = self.cached_count(jql)
+        if total is None:
+            total = count_issues(client, normalize(jql))
+            self.store_count(jql, total)
+        return total
+
+    def clear(self):
+        """Forget every result (after a write, which may change any of them)"""
+        with self._lock:
+            if self._entries or self._counts:
+                self.clears += 1
+            self._entries.clear()
+            self._counts.clear()
+
+    # --- Persistence ---
+    def load(self) -> bool:
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable JQL cache: {str(e)}")
+            return False
+        with self._lock:
+            for key, entry in data.get('results', {}).items():
+                if self._fresh(entry['stored_at']):
+                    rows = tuple(IssueSummary(*row) for row in entry['rows'])
+                    self._entries[key] = (rows, entry['total'], entry['pages'], entry['stored_at'])
+            for jql, (total, stored_at) in data.get('counts', {}).items():
+                if self._fresh(stored_at):
+                    self._counts[jql] = (total, stored_at)
+        return True
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                'results': {key: {'rows': [[issue.key, issue.summary, issue.status, issue.assignee, issue.priority]
+                                           for issue in rows],
+                                  'total': total, 'pages': pages, 'stored_at': stored_at}
+                            for key, (rows, total, pages, stored_at) in self._entries.items()
+                            if self._fresh(stored_at)},
+                'counts': {jql: [total, stored_at] for jql, (total, stored_at) in self._counts.items()
+                           if self._fresh(stored_at)},
+            }
+        tmp = f'{self.path}.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.error(f"Could not write JQL cache: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'results': len(self._entries),
+                'counts': len(self._counts),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'count_hits': self.count_hits,
+                'count_prechecks': self.prechecks,
+                'server_calls_saved': self.server_calls_saved,
+                'clears': self.clears,
+            }
+
+
+
+class ResultStream:
+    """Summary rows of one search, yielded as they arrive.
+
+    A cached result is replayed and a cached zero count answers without a request.
+    Otherwise the rows stream page by page, the total comes from the first page
+    (no separate count request), and results up to MAX_CACHED_ROWS are cached.
+    ``total`` is set once the first row is yielded.
+    """
+
+    def __init__(self, cache: JqlResultCache, client, jql: str, page_size: int = DEFAULT_PAGE_SIZE):
+        self.cache = cache
+        self.client = client
+        self.jql = normalize(jql)
+        self.page_size = page_size
+        self.total: Optional[int] = None
+
+    def __iter__(self) -> Iterator[IssueSummary]:
+        cached = self.cache.lookup(self.jql)
+        if cached:
+            rows, self.total = cached
+            yield from rows
+            return
+        if self.cache.cached_count(self.jql) == 0:
+            self.total = 0
+            return
+
+        stream = search_issues(self.client, self.jql, fields=SUMMARY_FIELDS, page_size=self.page_size)
+        kept: Optional[List[IssueSummary]] = []
+        for issue in stream:
+            row = IssueSummary.from_raw(issue)
+            self.total = stream.total
+            if kept is not None:
+                kept.append(row)
+                if len(kept) > MAX_CACHED_ROWS:
+                    # Too large to keep: only the total is remembered
+                    kept = None
+            yield row
+        self.total = stream.total or 0
+        if kept is None:
+            self.cache._remember_count(self.jql, self.total)
+        else:
+            self.cache.store(self.jql, None, kept, self.total, stream.pages_fetched)
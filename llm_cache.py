@@ -0,0 +1,212 @@
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from ai_context import estimate_tokens
+from instrumentation import record_ttft, span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+"""
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so trivially different prompts share a cache entry"""
+    return re.sub(r'\s+', ' ', prompt).strip()
+
+
+def cache_key(provider: str, model: str, prompt: str) -> str:
+    return hashlib.sha256(f'{provider}\0{model}\0{normalize_prompt(prompt)}'.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Persistent on-disk LLM response cache keyed by (provider, model, normalized prompt).
+
+    Entries expire after ``ttl`` seconds; once the stored responses exceed
+    ``max_bytes`` the least recently used ones are evicted.
+    """
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, provider: str, model: str, prompt: str) -> Optional[str]:
+        key = cache_key(provider, model, prompt)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute('SELECT response, created FROM responses WHERE key = ?', (key,)).fetchone()
+            if row and now - row[1] < self.ttl:
+                self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+                self.hits += 1
+                return row[0]
+            if row:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self.misses += 1
+            return None
+
+    def put(self, provider: str, model: str, prompt: str, response: str):
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, provider, model, response, size, created, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (cache_key(provider, model, prompt), provider, model, response, size, now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        self._conn.execute('DELETE FROM responses WHERE created <= ?', (now - self.ttl,))
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY last_access').fetchall():
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'entries': entries,
+            'bytes': size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class RequestCoalescer:
+    """Lets concurrent callers with the same key share one in-flight upstream call"""
+
+    def __init__(self):
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: str, call: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = call()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+class CachedLLM:
+    """Response cache + request coalescing in front of any prompt -> text callable"""
+
+    def __init__(self, cache: Optional[ResponseCache] = None):
+        self.cache = cache
+        self.coalescer = RequestCoalescer()
+        self.upstream_calls = 0
+
+    def complete(self, provider: str, model: str, prompt: str, call: Callable[[str], str]) -> str:
+        name = f'{provider}:{model}'
+        if self.cache:
+            with span('llm_cache', name) as s:
+                cached = self.cache.get(provider, model, prompt)
+                s.attributes['hit'] = cached is not None
+            if cached is not None:
+                return cached
+
+        def upstream():
+            self.upstream_calls += 1
+            with span('llm', name) as s:
+                response = call(prompt)
+                prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(response or '')
+                s.tokens = prompt_tokens + completion_tokens
+                s.bytes = len(prompt) + len(response or '')
+                s.attributes.update(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+            # Only successful completions are cached; errors propagate to the caller
+            if self.cache and response:
+                self.cache.put(provider, model, prompt, response)
+            return response
+
+        return self.coalescer.do(cache_key(provider, model, prompt), upstream)
+
+    def stream(self, provider: str, model: str, prompt: str,
+               call: Callable[[str], Iterable[str]]) -> Iterator[str]:
+        """Like complete(), but yields text chunks as the provider produces them.
+
+        A cache hit is yielded in one piece. Streams are not coalesced, because each
+        caller needs its own tokens as they arrive.
+        """
+        name = f'{provider}:{model}'
+        if self.cache:
+            with span('llm_cache', name) as s:
+                cached = self.cache.get(provider, model, prompt)
+                s.attributes['hit'] = cached is not None
+            if cached is not None:
+                yield cached
+                return
+
+        self.upstream_calls += 1
+        parts = []
+        with span('llm', name, stream=True) as s:
+            started = time.perf_counter()
+            for chunk in call(prompt):
+                if not chunk:
+                    continue
+                if not parts:
+                    ttft = time.perf_counter() - started
+                    s.attributes['ttft_ms'] = round(ttft * 1000, 1)
+                    record_ttft(name, ttft)
+                parts.append(chunk)
+                yield chunk
+            response = ''.join(parts)
+            prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(response)
+            s.tokens = prompt_tokens + completion_tokens
+            s.bytes = len(prompt) + len(response)
+            s.attributes.update(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        if self.cache and response:
+            self.cache.put(provider, model, prompt, response)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.cache.stats() if self.cache else {}
+        stats.update({'upstream_calls': self.upstream_calls, 'coalesced': self.coalescer.coalesced})
+        return stats
@@ -1,16 +1,12 @@
-import subprocess
-import json
+from ollama_client import OllamaClient
 
 # Example prompt
 prompt = "Summarize this text: 'Hello world, I am testing Ollama.'"
 
-# Call the Ollama CLI
-result = subprocess.run(
-    ["ollama", "generate", "gemma:2b", prompt, "--json"],
-    capture_output=True,
-    text=True
-)
+# Talk to the local Ollama server over HTTP (model stays loaded between prompts)
+client = OllamaClient(model="gemma:2b")
 
-# Parse the JSON output
-response = json.loads(result.stdout)
-print(response['text'])
+# Print tokens as they are generated
+for token in client.stream(prompt):
+    print(token, end="", flush=True)
+print()
@@ -0,0 +1,92 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_URL = 'http://localhost:11434'
+DEFAULT_MODEL = 'gemma:2b'
+# How long Ollama keeps the model loaded after a request
+DEFAULT_KEEP_ALIVE = '30m'
+
+
+class OllamaClient:
+    """Persistent HTTP client for a local Ollama server.
+
+    Uses one pooled keep-alive session for every prompt and asks Ollama to keep
+    the model resident, so neither a process spawn nor a model load is paid per call.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, model: Optional[str] = None,
+                 keep_alive: str = DEFAULT_KEEP_ALIVE, timeout: float = 300.0,
+                 max_parallel: int = 4, session: Optional[requests.Session] = None,
+                 options: Optional[Dict[str, Any]] = None):
+        self.base_url = (base_url or os.getenv('OLLAMA_URL', DEFAULT_URL)).rstrip('/')
+        self.model = model or os.getenv('OLLAMA_MODEL', DEFAULT_MODEL)
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.max_parallel = max_parallel
+        self.options = options or {}
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_parallel)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+
+    def _payload(self, prompt: str, stream: bool, stop: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        options = dict(self.options)
+        if stop:
+            options['stop'] = list(stop)
+        payload = {'model': self.model, 'prompt': prompt, 'stream': stream, 'keep_alive': self.keep_alive}
+        if options:
+            payload['options'] = options
+        return payload
+
+    def stream(self, prompt: str, stop: Optional[Sequence[str]] = None) -> Iterator[str]:
+        """Yield response tokens as Ollama produces them"""
+        with self.session.post(f'{self.base_url}/api/generate', json=self._payload(prompt, True, stop),
+                               stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get('error'):
+                    raise RuntimeError(f"Ollama error: {chunk['error']}")
+                if chunk.get('response'):
+                    yield chunk['response']
+                if chunk.get('done'):
+                    return
+
+    def generate(self, prompt: str, stop: Optional[Sequence[str]] = None) -> str:
+        """Full completion for one prompt"""
+        return ''.join(self.stream(prompt, stop))
+
+    def generate_batch(self, prompts: Sequence[str]) -> List[str]:
+        """Run several prompts concurrently over the pooled session (see OLLAMA_NUM_PARALLEL)"""
+        with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix='ollama') as pool:
+            return list(pool.map(self.generate, prompts))
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embedding vectors for ``texts`` (use an embedding model such as nomic-embed-text)"""
+        response = self.session.post(f'{self.base_url}/api/embed',
+                                     json={'model': self.model, 'input': list(texts), 'keep_alive': self.keep_alive},
+                                     timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()['embeddings']
+
+    def warm_up(self):
+        """Load the model into memory ahead of the first real prompt"""
+        response = self.session.post(f'{self.base_url}/api/generate',
+                                     json={'model': self.model, 'keep_alive': self.keep_alive},
+                                     timeout=self.timeout)
+        response.raise_for_status()
+
+    def close(self):
+        self.session.close()
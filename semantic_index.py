@@ -0,0 +1,371 @@
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from issue_model import IssueSummary
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIM = 384
+EMBED_BATCH_SIZE = 256
+# Reciprocal rank fusion constant; 60 is the usual choice and rarely worth tuning
+RRF_K = 60
+INDEX_FIELDS = ['summary', 'description', 'status', 'assignee', 'priority', 'updated']
+
+
+def issue_text(raw: Dict[str, Any]) -> str:
+    fields = raw.get('fields') or {}
+    return f"{fields.get('summary') or ''}\n{fields.get('description') or ''}".strip()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+# --- Embedders: anything with ``dim`` and ``embed(texts) -> (n, dim) float32`` ---
+class HashingEmbedder:
+    """Dependency-free local embedder: hashed word and character-trigram features.
+
+    No model download and deterministic across processes. It matches word variants
+    ("timeout"/"timeouts") but not true paraphrases; plug in a real model for those.
+    """
+
+    # Issue text reuses a small vocabulary, so each word's buckets are hashed once
+    MAX_CACHED_WORDS = 100_000
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+        self._words: Dict[str, List[Tuple[int, float]]] = {}
+
+    def _buckets(self, word: str) -> List[Tuple[int, float]]:
+        buckets = self._words.get(word)
+        if buckets is None:
+            padded = f'#{word}#'
+            features = [(word, 1.0)] + [(padded[i:i + 3], 0.5) for i in range(len(padded) - 2)]
+            buckets = []
+            for feature, weight in features:
+                h = zlib.crc32(feature.encode('utf-8'))
+                # The sign bit keeps colliding features from always adding up
+                buckets.append((h % self.dim, weight if h & 0x80000000 else -weight))
+            if len(self._words) < self.MAX_CACHED_WORDS:
+                self._words[word] = buckets
+        return buckets
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows, cols, values = [], [], []
+        for row, text in enumerate(texts):
+            for word in re.findall(r'[a-z0-9]+', text.lower()):
+                for col, value in self._buckets(word):
+                    rows.append(row)
+                    cols.append(col)
+                    values.append(value)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(vectors, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)),
+                  np.array(values, dtype=np.float32))
+        return _normalize(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model (e.g. all-MiniLM-L6-v2); needs the optional package"""
+
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self.model.encode(list(texts), batch_size=64, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class OllamaEmbedder:
+    """Embeddings from a local Ollama model (e.g. nomic-embed-text)"""
+
+    def __init__(self, client):
+        self.client = client
+        self.dim = len(client.embed(['dimension probe'])[0])
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return _normalize(np.asarray(self.client.embed(list(texts)), dtype=np.float32))
+
+
+def make_embedder(spec: Optional[str] = None):
+    """'hashing' (default), 'sentence-transformers:<model>' or 'ollama:<model>'"""
+    spec = spec or os.getenv('SEMANTIC_EMBEDDER', 'hashing')
+    kind, _, model = spec.partition(':')
+    if kind == 'sentence-transformers':
+        return SentenceTransformerEmbedder(model or 'all-MiniLM-L6-v2')
+    if kind == 'ollama':
+        from ollama_client import OllamaClient
+        return OllamaEmbedder(OllamaClient(model=model or 'nomic-embed-text'))
+    if kind == 'hashing':
+        return HashingEmbedder(int(model) if model else DEFAULT_DIM)
+    raise ValueError(f"Unknown embedder '{spec}'")
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], k: int = RRF_K) -> List[Tuple[str, float]]:
+    """Merge ranked key lists; keys ranked well by several lists come first"""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class SemanticIndex:
+    """Embedding index over issue summary + description.
+
+    Search is an exact NumPy dot product over normalized vectors by default; with
+    ``use_ann`` and hnswlib installed an HNSW graph answers instead. Upserts only
+    re-embed issues whose text changed, so the index can follow the change feed.
+    """
+
+    def __init__(self, embedder=None, path: Optional[str] = None, use_ann: bool = False):
+        self.embedder = embedder or HashingEmbedder()
+        self.dim = self.embedder.dim
+        self.path = path
+        self._lock = threading.RLock()
+        self._vectors = np.zeros((1024, self.dim), dtype=np.float32)
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._digests: Dict[str, str] = {}
+        self._issues: Dict[str, IssueSummary] = {}
+        self._ann = None
+        self._labels: Dict[str, int] = {}
+        self._label_keys: Dict[int, str] = {}
+        self._next_label = 0
+        # When the last sync from Jira started; saved with the index so restarts only fetch edits
+        self.synced_at: Optional[float] = None
+        self.embedded = 0
+        self.skipped = 0
+        self.queries = 0
+        if use_ann:
+            self._ann = self._new_ann()
+        if path and os.path.exists(path):
+            self.load()
+
+    # --- ANN ---
+    def _new_ann(self, capacity: int = 1024):
+        try:
+            import hnswlib
+        except ImportError:
+            logger.warning("hnswlib is not installed, using exact search")
+            return None
+        ann = hnswlib.Index(space='ip', dim=self.dim)
+        ann.init_index(max_elements=capacity, ef_construction=200, M=16, allow_replace_deleted=True)
+        ann.set_ef(64)
+        return ann
+
+    def _ann_add(self, keys: List[str], vectors: np.ndarray):
+        if self._ann is None:
+            return
+        existing = [i for i, key in enumerate(keys) if key in self._labels]
+        added = [i for i, key in enumerate(keys) if key not in self._labels]
+        if existing:
+            # Re-adding a live label replaces its vector in place
+            self._ann.add_items(vectors[existing], np.array([self._labels[keys[i]] for i in existing], dtype=np.int64))
+        if added:
+            labels = []
+            for i in added:
+                self._labels[keys[i]] = self._next_label
+                self._label_keys[self._next_label] = keys[i]
+                labels.append(self._next_label)
+                self._next_label += 1
+            needed = self._ann.get_current_count() + len(labels)
+            if needed > self._ann.get_max_elements():
+                self._ann.resize_index(max(needed, 2 * self._ann.get_max_elements()))
+            # New labels reuse the slots of removed issues
+            self._ann.add_items(vectors[added], np.array(labels, dtype=np.int64), replace_deleted=True)
+
+    # --- Writes ---
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def sync_jql(self, jql: str, now: Optional[float] = None) -> str:
+        """``jql`` narrowed to issues updated since the last sync (all of them before the first)"""
+        if self.synced_at is None:
+            return jql
+        now = time.time() if now is None else now
+        # Relative dates avoid timezone mismatches; overlap by a minute so nothing is missed
+        minutes = max(1, math.ceil((now - self.synced_at) / 60) + 1)
+        return f'({jql}) AND updated >= "-{minutes}m"'
+
+    def upsert(self, issues: Iterable[Any]) -> int:
+        """Add or refresh issues (REST dicts or jira resources); returns how many were embedded"""
+        batch: List[Tuple[str, str, str]] = []
+        embedded = 0
+        for issue in issues:
+            raw = issue if isinstance(issue, dict) else issue.raw
+            text = issue_text(raw)
+            digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+            summary = IssueSummary.from_raw(raw)
+            with self._lock:
+                self._issues[summary.key] = summary
+                if self._digests.get(summary.key) == digest:
+                    self.skipped += 1
+                    continue
+            batch.append((summary.key, text, digest))
+            if len(batch) == EMBED_BATCH_SIZE:
+                embedded += self._embed_batch(batch)
+                batch = []
+        if batch:
+            embedded += self._embed_batch(batch)
+        return embedded
+
+    def _embed_batch(self, batch) -> int:
+        # The last copy of an issue listed twice wins
+        batch = list({key: (key, text, digest) for key, text, digest in batch}.values())
+        # Embedding runs outside the lock so searches are not blocked by a model call
+        vectors = self.embedder.embed([text for _, text, _ in batch])
+        with self._lock:
+            for (key, _, digest), vector in zip(batch, vectors):
+                row = self._rows.get(key)
+                if row is None:
+                    row = len(self._keys)
+                    if row == len(self._vectors):
+                        self._vectors = np.concatenate([self._vectors, np.zeros_like(self._vectors)])
+                    self._keys.append(key)
+                    self._rows[key] = row
+                self._vectors[row] = vector
+                self._digests[key] = digest
+            self._ann_add([key for key, _, _ in batch], vectors)
+            self.embedded += len(batch)
+        return len(batch)
+
+    def remove(self, key: str):
+        key = key.strip().upper()
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return
+            # Move the last row into the hole so the matrix stays dense
+            last = len(self._keys) - 1
+            if row != last:
+                moved = self._keys[last]
+                self._vectors[row] = self._vectors[last]
+                self._keys[row] = moved
+                self._rows[moved] = row
+            self._keys.pop()
+            self._digests.pop(key, None)
+            self._issues.pop(key, None)
+            if self._ann is not None and key in self._labels:
+                label = self._labels.pop(key)
+                del self._label_keys[label]
+                self._ann.mark_deleted(label)
+
+    def on_change(self, change):
+        """IssueWatcher subscriber: follow creates, edits and deletes"""
+        if change.kind == 'deleted':
+            self.remove(change.key)
+        elif change.raw and 'description' in (change.raw.get('fields') or {}):
+            self.upsert([change.raw])
+
+    # --- Queries ---
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """(key, cosine similarity) of the ``k`` nearest issues"""
+        vector = self.embedder.embed([query])[0]
+        with self._lock:
+            self.queries += 1
+            count = len(self._keys)
+            if not count:
+                return []
+            k = min(k, count)
+            if self._ann is not None:
+                self._ann.set_ef(max(64, k))
+                labels, distances = self._ann.knn_query(vector, k=k)
+                # 'ip' distance is 1 - dot product
+                return [(self._label_keys[int(label)], float(1.0 - distance))
+                        for label, distance in zip(labels[0], distances[0])]
+            scores = self._vectors[:count] @ vector
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self._keys[i], float(scores[i])) for i in top]
+
+    def hybrid(self, query: str, lexical: Sequence[IssueSummary], k: int = 10) -> List[IssueSummary]:
+        """Semantic hits fused with ranked lexical/JQL hits (reciprocal rank fusion)"""
+        # Lexical hits come straight from Jira, so their fields win over the index's copy
+        known = {issue.key: issue for issue in lexical}
+        semantic_keys = [key for key, _ in self.search(query, k)]
+        fused = reciprocal_rank_fusion([semantic_keys, list(known)])[:k]
+        with self._lock:
+            return [known.get(key) or self._issues[key] for key, _ in fused if key in known or key in self._issues]
+
+    def issue(self, key: str) -> Optional[IssueSummary]:
+        with self._lock:
+            return self._issues.get(key)
+
+    # --- Persistence ---
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            count = len(self._keys)
+            keys = list(self._keys)
+            arrays = {
+                'vectors': self._vectors[:count].copy(),
+                'keys': np.array(keys),
+                'digests': np.array([self._digests[key] for key in keys]),
+                'issues': np.array([[getattr(self._issues[key], name) for name in IssueSummary.__dataclass_fields__]
+                                    for key in keys]).reshape(count, len(IssueSummary.__dataclass_fields__)),
+                'synced_at': np.array(np.nan if self.synced_at is None else self.synced_at),
+            }
+        tmp = f'{path}.tmp.npz'
+        try:
+            np.savez(tmp, **arrays)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.error(f"Could not write semantic index: {str(e)}")
+
+    def load(self, path: Optional[str] = None) -> bool:
+        path = path or self.path
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                vectors = data['vectors']
+                keys = [str(key) for key in data['keys']]
+                digests = [str(digest) for digest in data['digests']]
+                issues = data['issues']
+                # Indexes saved before sync tracking have no mark and get one full sync
+                synced_at = float(data['synced_at']) if 'synced_at' in data.files else math.nan
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Ignoring unreadable semantic index: {str(e)}")
+            return False
+        if vectors.shape[1:] != (self.dim,):
+            # A different embedder wrote this file; start over rather than mix spaces
+            logger.warning("Semantic index was built with another embedder, rebuilding")
+            return False
+        with self._lock:
+            self._vectors = np.concatenate([vectors.astype(np.float32), np.zeros((max(1024, len(keys)), self.dim),
+                                                                                 dtype=np.float32)])
+            self._keys = keys
+            self._rows = {key: row for row, key in enumerate(keys)}
+            self._digests = dict(zip(keys, digests))
+            self._issues = {key: IssueSummary(*(str(v) for v in row)) for key, row in zip(keys, issues)}
+            self.synced_at = None if math.isnan(synced_at) else synced_at
+            if self._ann is not None and keys:
+                self._ann = self._new_ann(len(keys))
+                self._labels, self._label_keys, self._next_label = {}, {}, 0
+                self._ann_add(keys, vectors)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'issues': len(self._keys),
+                'dim': self.dim,
+                'ann': self._ann is not None,
+                'embedded': self.embedded,
+                'unchanged_skipped': self.skipped,
+                'queries': self.queries,
+                'mb': round(len(self._keys) * self.dim * 4 / 1e6, 1),
+            }
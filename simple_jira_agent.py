@@ -1,6 +1,16 @@
 import os
-from jira import JIRA
+import re
+import threading
+import time
 from dotenv import load_dotenv
+from jira_search import search_issues
+from jira_cache import IssueCache, jira_changed_keys
+from jql_cache import JqlResultCache, text_search
+from jira_mirror import MIRROR_FIELDS, JiraMirror
+from jira_metadata import JiraMetadata
+from instrumentation import configure_from_env, instrumentation, record_ttft
+from llm_cache import CachedLLM, ResponseCache
+from ai_context import CONTEXT_FIELDS, ContextBuilder, question_keywords
 
 # Load environment variables
 load_dotenv()
@@ -10,100 +20,469 @@ JIRA_EMAIL = os.getenv("JIRA_EMAIL")
 JIRA_API_TOKEN = os.getenv("JIRA_API_TOKEN")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Local model via Ollama (e.g. OLLAMA_MODEL=gemma:2b) - used first when set
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL")
+# Optional offline mirror (SQLite path) - options 1-3 are then answered locally
+JIRA_MIRROR_DB = os.getenv("JIRA_MIRROR_DB")
+JIRA_MIRROR_PROJECT = os.getenv("JIRA_MIRROR_PROJECT", "MFLP")
+# Projects/issue types/priorities/users snapshot for a warm start (empty to disable)
+JIRA_METADATA_PATH = os.getenv("JIRA_METADATA_PATH", ".jira_metadata.json")
+JIRA_METADATA_REFRESH = float(os.getenv("JIRA_METADATA_REFRESH", "3600"))
+# Watch mode: persisted change-feed cursor, poll interval and optional webhook receiver port
+JIRA_WATCH_CURSOR = os.getenv("JIRA_WATCH_CURSOR", ".jira_watch.json")
+JIRA_WATCH_INTERVAL = float(os.getenv("JIRA_WATCH_INTERVAL", "30"))
+JIRA_WEBHOOK_PORT = os.getenv("JIRA_WEBHOOK_PORT")
+JIRA_WEBHOOK_SECRET = os.getenv("JIRA_WEBHOOK_SECRET")
+# Loopback by default; other interfaces are only served when JIRA_WEBHOOK_SECRET is set
+JIRA_WEBHOOK_HOST = os.getenv("JIRA_WEBHOOK_HOST", "127.0.0.1")
+# Bulk exports for reports and dashboards (Parquet when pyarrow is installed, else CSV)
+JIRA_EXPORT_DIR = os.getenv("JIRA_EXPORT_DIR", "exports")
+# Menu search results per normalized JQL (persisted, short TTL); results over JIRA_LARGE_RESULT
+# still stream in full, under a header with the total
+JIRA_JQL_CACHE = os.getenv("JIRA_JQL_CACHE", ".jira_jql_cache.json")
+JIRA_JQL_CACHE_TTL = float(os.getenv("JIRA_JQL_CACHE_TTL", "120"))
+JIRA_LARGE_RESULT = int(os.getenv("JIRA_LARGE_RESULT", "200"))
 
 # --- Connect JIRA ---
+# The jira library (and its HTTP stack) is imported and connected in the
+# background, so the menu appears before the first round trip completes
+def create_jira_client(adapter=None):
+    from jira import JIRA
+    from jira_http import configure_session
+    # Retries/backoff live in the shared adapter, so turn off the client's own retry loop
+    client = JIRA(server=JIRA_URL, basic_auth=(JIRA_EMAIL, JIRA_API_TOKEN), max_retries=0)
+    configure_session(client._session, adapter)
+    return client
+
 jira = None
-try:
-    if not JIRA_URL or not JIRA_EMAIL or not JIRA_API_TOKEN:
-        print("❌ Missing JIRA credentials in .env")
-    else:
-        jira = JIRA(server=JIRA_URL, basic_auth=(JIRA_EMAIL, JIRA_API_TOKEN))
-        print(f"🔗 Connected to JIRA as: {JIRA_EMAIL}")
-except Exception as e:
-    print(f"❌ JIRA connection error: {e}")
+jira_error = None
+_jira_thread = None
+_jira_lock = threading.Lock()
+_jira_ready = threading.Event()
+
+# Repeated searches are answered locally until a write (or the TTL) makes them stale
+jql_cache = JqlResultCache(JIRA_JQL_CACHE or None, ttl=JIRA_JQL_CACHE_TTL)
+# Repeated lookups of the same key are served locally and revalidated in batches
+issue_cache = IssueCache(on_invalidate=jql_cache.clear)
+mirror = JiraMirror(JIRA_MIRROR_DB, JIRA_MIRROR_PROJECT) if JIRA_MIRROR_DB else None
+# Project lists and create inputs are served/validated locally
+metadata = JiraMetadata(snapshot_path=JIRA_METADATA_PATH or None)
+
+def connect_jira():
+    global jira, jira_error
+    try:
+        jira = create_jira_client()
+        issue_cache.changed_keys = jira_changed_keys(jira)
+        metadata.client = jira
+        metadata.start_background_refresh(JIRA_METADATA_REFRESH)
+    except Exception as e:
+        jira_error = e
+        print(f"\n❌ JIRA connection error: {e}")
+    finally:
+        _jira_ready.set()
+    if jira and mirror:
+        sync_mirror()
+
+def start_jira_connection():
+    global _jira_thread
+    with _jira_lock:
+        if _jira_thread is None:
+            _jira_thread = threading.Thread(target=connect_jira, name="jira-connect", daemon=True)
+            _jira_thread.start()
+
+def get_jira():
+    # Waits for the background connection on first use
+    start_jira_connection()
+    _jira_ready.wait()
+    if jira is None:
+        raise RuntimeError(f"JIRA is not connected ({jira_error})")
+    return jira
+
+def get_metadata():
+    # A warm snapshot answers before the connection is up; otherwise wait for it
+    if metadata.loaded_at is None:
+        get_jira()
+    return metadata
+
+def as_resource(raw):
+    from jira.resources import dict2resource
+    return dict2resource(raw)
+
+def sync_mirror():
+    try:
+        stats = mirror.sync(get_jira())
+        print(f"🗄️ Mirror {stats['mode']} sync: {stats['synced']} updated, {stats['total']} issues in {stats['seconds']}s")
+    except Exception as e:
+        print(f"❌ Mirror sync failed (serving local data): {e}")
 
 # --- AI Setup (Gemini + OpenAI fallback) ---
 AI_ENABLED = True
 use_gemini = True if GEMINI_API_KEY else False
+use_ollama = True if OLLAMA_MODEL else False
+GEMINI_MODEL = "gemini-1.5-pro"
+OPENAI_MODEL = "gpt-4o-mini"
+
+# Identical prompts are answered from disk instead of spending quota again
+AI_CACHE_PATH = os.getenv("AI_CACHE_PATH", ".ai_cache.db")
+AI_CACHE_TTL = float(os.getenv("AI_CACHE_TTL", str(24 * 60 * 60)))
+llm = CachedLLM(ResponseCache(AI_CACHE_PATH, ttl=AI_CACHE_TTL) if AI_CACHE_PATH else None)
+
+# Provider clients are built once and reused for every prompt
+_ai_clients = {}
+_ai_clients_lock = threading.Lock()
+
+def get_gemini_model():
+    with _ai_clients_lock:
+        if "gemini" not in _ai_clients:
+            import google.generativeai as genai
+            genai.configure(api_key=GEMINI_API_KEY)
+            _ai_clients["gemini"] = genai.GenerativeModel(GEMINI_MODEL)
+        return _ai_clients["gemini"]
+
+def get_openai_client():
+    with _ai_clients_lock:
+        if "openai" not in _ai_clients:
+            from openai import OpenAI
+            _ai_clients["openai"] = OpenAI(api_key=OPENAI_API_KEY)
+        return _ai_clients["openai"]
+
+def get_ollama_client():
+    with _ai_clients_lock:
+        if "ollama" not in _ai_clients:
+            from ollama_client import OllamaClient
+            _ai_clients["ollama"] = OllamaClient(model=OLLAMA_MODEL)
+        return _ai_clients["ollama"]
+
+def _ask_ollama(prompt):
+    return get_ollama_client().generate(prompt)
+
+def _ask_gemini(prompt):
+    return get_gemini_model().generate_content(prompt).text
+
+def _ask_openai(prompt):
+    response = get_openai_client().chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[{"role": "user", "content": prompt}]
+    )
+    return response.choices[0].message.content
+
+# Streaming variants yield text as the provider produces it
+def _stream_ollama(prompt):
+    return get_ollama_client().stream(prompt)
+
+def _stream_gemini(prompt):
+    for chunk in get_gemini_model().generate_content(prompt, stream=True):
+        yield chunk.text
+
+def _stream_openai(prompt):
+    stream = get_openai_client().chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        stream=True
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
 
 def ask_ai(prompt):
-    global use_gemini
+    global use_gemini, use_ollama
 
     if not AI_ENABLED:
         return "⚠️ AI is disabled."
 
     try:
-        if use_gemini:
-            import google.generativeai as genai
-            genai.configure(api_key=GEMINI_API_KEY)
-            model = genai.GenerativeModel("gemini-1.5-pro")
-            response = model.generate_content(prompt)
-            return response.text
+        if use_ollama:
+            return llm.complete("ollama", OLLAMA_MODEL, prompt, _ask_ollama)
+        elif use_gemini:
+            return llm.complete("gemini", GEMINI_MODEL, prompt, _ask_gemini)
         elif OPENAI_API_KEY:
-            from openai import OpenAI
-            client = OpenAI(api_key=OPENAI_API_KEY)
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}]
-            )
-            return response.choices[0].message.content
+            return llm.complete("openai", OPENAI_MODEL, prompt, _ask_openai)
         else:
             return "⚠️ No AI keys configured in .env"
     except Exception as e:
+        if use_ollama and (GEMINI_API_KEY or OPENAI_API_KEY):
+            print(f"⚠️ Local Ollama model unavailable ({e}). Switching to hosted AI...")
+            use_ollama = False
+            return ask_ai(prompt)
         if "429" in str(e) and use_gemini:
             print("⚠️ Gemini quota exceeded. Switching to OpenAI fallback...")
             use_gemini = False
             return ask_ai(prompt)
         return f"❌ AI Error: {e}"
 
-# --- Menu Functions ---
-def search_recent_issues():
+def ask_ai_stream(prompt):
+    # Same provider order and fallbacks as ask_ai, yielding tokens as they arrive
+    global use_gemini, use_ollama
+
+    if not AI_ENABLED:
+        yield "⚠️ AI is disabled."
+        return
+
+    streamed = False
     try:
-        # Restrict search to your project (MFLP) and only last 10
-        issues = jira.search_issues("project=MFLP ORDER BY created DESC", maxResults=10)
-        if not issues:
-            print("⚠️ No issues found.")
+        if use_ollama:
+            chunks = llm.stream("ollama", OLLAMA_MODEL, prompt, _stream_ollama)
+        elif use_gemini:
+            chunks = llm.stream("gemini", GEMINI_MODEL, prompt, _stream_gemini)
+        elif OPENAI_API_KEY:
+            chunks = llm.stream("openai", OPENAI_MODEL, prompt, _stream_openai)
+        else:
+            yield "⚠️ No AI keys configured in .env"
+            return
+        for chunk in chunks:
+            streamed = True
+            yield chunk
+    except Exception as e:
+        # Once text is on screen a provider switch would print a second answer
+        if streamed:
+            yield f"\n❌ AI Error: {e}"
+            return
+        if use_ollama and (GEMINI_API_KEY or OPENAI_API_KEY):
+            print(f"⚠️ Local Ollama model unavailable ({e}). Switching to hosted AI...")
+            use_ollama = False
+            yield from ask_ai_stream(prompt)
+            return
+        if "429" in str(e) and use_gemini:
+            print("⚠️ Gemini quota exceeded. Switching to OpenAI fallback...")
+            use_gemini = False
+            yield from ask_ai_stream(prompt)
             return
-        for issue in issues:
-            print(f"{issue.key}: {issue.fields.summary}")
+        yield f"❌ AI Error: {e}"
+
+# --- Menu Functions ---
+def print_issue_stream(issues, empty_message):
+    # Print as pages arrive instead of buffering the whole result set
+    count = 0
+    for issue in issues:
+        print(f"{issue.key}: {issue.fields.summary}")
+        count += 1
+    if not count:
+        print(empty_message)
+
+RECENT_JQL = "project = MFLP ORDER BY created DESC"
+
+def keyword_jql(keyword):
+    # Quotes and Lucene operators in the keyword are escaped/dropped, not spliced into the JQL
+    jql = text_search(keyword, project="MFLP")
+    if jql is None:
+        raise ValueError(f"nothing to search for in {keyword!r}")
+    return jql
+
+def fetch_recent_issues(limit=None, fields=("summary",)):
+    if mirror and mirror.project == "MFLP":
+        return (as_resource(raw) for raw in mirror.recent(limit))
+    # Restrict search to your project (MFLP), streaming every page
+    return search_issues(get_jira(), RECENT_JQL, fields=list(fields), limit=limit)
+
+def fetch_issues_by_keyword(keyword, limit=None, fields=("summary",)):
+    jql = keyword_jql(keyword)
+    # The mirror only holds JIRA_MIRROR_PROJECT; other projects' matches come from Jira
+    text = mirror.scoped_text(jql) if mirror else None
+    if text:
+        matches = [as_resource(raw) for raw in mirror.search_text(text, limit)]
+        if matches:
+            return matches
+    return search_issues(get_jira(), jql, fields=list(fields), limit=limit)
+
+def print_search(jql, empty_message):
+    # Rows print as pages arrive; the first page carries the total, so no separate count request
+    results = jql_cache.stream(get_jira(), jql)
+    count = 0
+    for issue in results:
+        if not count and results.total > JIRA_LARGE_RESULT:
+            print(f"🔎 {results.total} matching issues, newest first:")
+        print(f"{issue.key}: {issue.summary}")
+        count += 1
+    if not count:
+        print(empty_message)
+
+def fetch_issue(issue_key):
+    if mirror:
+        return as_resource(mirror.get_or_fetch(issue_key, lambda: get_jira().issue(issue_key)))
+    return issue_cache.get(issue_key, lambda: get_jira().issue(issue_key))
+
+def search_recent_issues(limit=None):
+    try:
+        if mirror or limit:
+            print_issue_stream(fetch_recent_issues(limit), "⚠️ No issues found.")
+        else:
+            print_search(RECENT_JQL, "⚠️ No issues found.")
     except Exception as e:
         print(f"❌ Error searching issues: {e}")
 
-def search_issues_by_keyword(keyword):
+def search_issues_by_keyword(keyword, limit=None):
     try:
-        jql = f'project=MFLP AND text ~ "{keyword}" ORDER BY created DESC'
-        issues = jira.search_issues(jql, maxResults=10)
-        if not issues:
-            print("⚠️ No issues match that keyword.")
-            return
-        for issue in issues:
-            print(f"{issue.key}: {issue.fields.summary}")
+        if mirror or limit:
+            print_issue_stream(fetch_issues_by_keyword(keyword, limit), "⚠️ No issues match that keyword.")
+        else:
+            print_search(keyword_jql(keyword), "⚠️ No issues match that keyword.")
     except Exception as e:
         print(f"❌ Error searching issues: {e}")
 
 def get_issue_details(issue_key):
     try:
-        issue = jira.issue(issue_key)
+        issue = fetch_issue(issue_key)
         print(f"\n📋 Issue Details:\n{issue.key} - {issue.fields.summary}\n{issue.fields.description}")
     except Exception as e:
         print(f"❌ Error getting issue details: {e}")
 
 def view_projects():
     try:
-        projects = jira.projects()
-        for project in projects:
-            print(f"{project.key}: {project.name}")
+        for project in get_metadata().projects():
+            print(f"{project['key']}: {project['name']}")
     except Exception as e:
         print(f"❌ Error fetching projects: {e}")
 
 def create_issue(project_key, summary, description=""):
     try:
-        new_issue = jira.create_issue(project=project_key, summary=summary,
-                                      description=description, issuetype={"name": "Task"})
+        # Unknown projects are rejected here instead of by a failed round trip
+        fields = get_metadata().resolve_fields({"project": {"key": project_key}, "summary": summary,
+                                                "description": description, "issuetype": {"name": "Task"}})
+        new_issue = get_jira().create_issue(fields=fields)
+        issue_cache.invalidate(new_issue.key)
         print(f"✅ Successfully created issue: {new_issue.key}")
     except Exception as e:
         print(f"❌ Error creating issue: {e}")
 
+# --- AI over JIRA data ---
+# Issues are retrieved, compacted to one line each and packed into a token budget
+AI_CONTEXT_ISSUES = int(os.getenv("AI_CONTEXT_ISSUES", "200"))
+AI_TOKEN_BUDGET = int(os.getenv("AI_TOKEN_BUDGET", "3000"))
+context_builder = ContextBuilder(ask_ai, token_budget=AI_TOKEN_BUDGET, stream=ask_ai_stream)
+
+def fetch_issues_if_exist(keys):
+    issues = []
+    for key in keys:
+        try:
+            issues.append(fetch_issue(key))
+        except Exception as e:
+            # "UTF-8" or "GPT-4" look like keys too - skip them rather than fail the question
+            print(f"⚠️ Skipping {key}: {e}")
+    return issues
+
+def retrieve_issues_for_question(question):
+    # Case-sensitive: keys are written upper case, while "covid-19" or "iso-8601" are just words
+    keys = re.findall(r"\b[A-Z][A-Z0-9]+-\d+\b", question)
+    if keys:
+        issues = fetch_issues_if_exist(dict.fromkeys(keys))
+        if issues:
+            return issues
+    keywords = question_keywords(question)
+    if keywords:
+        issues = list(fetch_issues_by_keyword(" ".join(keywords), AI_CONTEXT_ISSUES, CONTEXT_FIELDS))
+        if issues:
+            return issues
+    return fetch_recent_issues(AI_CONTEXT_ISSUES, CONTEXT_FIELDS)
+
+def print_context_stats():
+    stats = context_builder.last_stats
+    if stats:
+        print(f"\n📦 Context: {stats.issues_included} issues in {stats.chunks} chunk(s), "
+              f"{stats.llm_calls} AI call(s), ~{stats.prompt_tokens} prompt tokens")
+
+def ask_ai_about_jira(question, on_token=None):
+    try:
+        answer = context_builder.answer(question, retrieve_issues_for_question(question), on_token)
+        print_context_stats()
+        return answer
+    except Exception as e:
+        return f"❌ Error preparing JIRA context: {e}"
+
+def summarize_recent_issues(on_token=None):
+    try:
+        issues = fetch_recent_issues(AI_CONTEXT_ISSUES, CONTEXT_FIELDS)
+        answer = context_builder.answer("Summarize the most recent issues from my JIRA project.", issues, on_token)
+        print_context_stats()
+        return answer
+    except Exception as e:
+        return f"❌ Error preparing JIRA context: {e}"
+
+def print_answer(answer_fn, *args):
+    # Print tokens as they arrive; answers that were not streamed (errors, no issues) are printed whole
+    started = time.perf_counter()
+    streamed = []
+
+    def on_token(token):
+        if not streamed:
+            record_ttft("ask_ai", time.perf_counter() - started)
+        streamed.append(token)
+        print(token, end="", flush=True)
+
+    answer = answer_fn(*args, on_token=on_token)
+    if streamed:
+        print()
+    else:
+        print(answer)
+
+# --- Watch mode ---
+# Only issues that changed since the persisted cursor are fetched and printed
+watcher = None
+webhook_receiver = None
+
+def on_issue_change(change):
+    issue_cache.invalidate(change.key)
+    if mirror:
+        # The watcher asks for the mirror's fields, so the change keeps the mirror current
+        if change.raw:
+            mirror.upsert(change.raw)
+        else:
+            mirror.forget(change.key)
+    icon = {"created": "🆕", "updated": "✏️", "deleted": "🗑️"}.get(change.kind, "📌")
+    print(f"{icon} {change.describe()}")
+
+def get_watcher():
+    global watcher, webhook_receiver
+    if watcher is None:
+        from jira_watch import WATCH_FIELDS, IssueWatcher, WebhookReceiver
+        watcher = IssueWatcher(get_jira(), "project=MFLP", JIRA_WATCH_CURSOR or None,
+                               fields=MIRROR_FIELDS if mirror else WATCH_FIELDS)
+        watcher.subscribe(on_issue_change)
+        if JIRA_WEBHOOK_PORT:
+            try:
+                webhook_receiver = WebhookReceiver(watcher, host=JIRA_WEBHOOK_HOST, port=int(JIRA_WEBHOOK_PORT),
+                                                   secret=JIRA_WEBHOOK_SECRET)
+                print(f"📬 Receiving Jira webhooks on {JIRA_WEBHOOK_HOST}:{JIRA_WEBHOOK_PORT}")
+            except ValueError as e:
+                print(f"⚠️ Webhooks disabled: {e}")
+    return watcher
+
+def watch_changes():
+    try:
+        feed = get_watcher()
+        print(f"👀 Watching MFLP every {JIRA_WATCH_INTERVAL:.0f}s - press Ctrl+C to return to the menu")
+        while True:
+            feed.poll_once()
+            time.sleep(JIRA_WATCH_INTERVAL)
+    except KeyboardInterrupt:
+        print(f"\n📊 Watch: {watcher.stats() if watcher else {}}")
+    except Exception as e:
+        print(f"❌ Error watching issues: {e}")
+
+def print_stats():
+    print("\n📊 Timings (tools, Jira calls, LLM calls):")
+    print(instrumentation.format_stats())
+    print(f"\n🗃️ Issue cache: {issue_cache.stats()}")
+    print(f"🔎 JQL cache: {jql_cache.stats()}")
+    print(f"🤖 AI cache: {llm.stats()}")
+    print(f"📚 Metadata: {metadata.stats()}")
+    if jira:
+        from jira_http import session_stats
+        print(f"🌐 HTTP: {session_stats(jira._session)}")
+
+# --- Export ---
+def export_issues():
+    from jira_export import JiraExporter
+    jql = input("JQL to export (Enter for project=MFLP): ").strip() or "project=MFLP"
+    default_dir = os.path.join(JIRA_EXPORT_DIR, "MFLP" if jql == "project=MFLP" else "export")
+    out_dir = input(f"Output directory (Enter for {default_dir}): ").strip() or default_dir
+    try:
+        print("📦 Exporting... (interrupted exports resume where they stopped)")
+        stats = JiraExporter(get_jira(), jql, out_dir).run()
+        print(f"✅ {stats['rows']} issues exported to {out_dir} as {stats['format']} "
+              f"({stats['total_rows']} in total, {stats['issues_per_second']:.0f} issues/s)")
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+
 # --- Menu ---
 def show_menu():
     print("""
@@ -123,16 +502,23 @@ def show_menu():
 🔧 UTILITIES:
 8️⃣  Test JIRA connection
 9️⃣  Show this menu
+🔄  m = Sync offline mirror
+👀  w = Watch for changes
+📦  e = Export issues to Parquet/CSV
+📊  s = Show stats
 0️⃣  Exit
 ══════════════════════════════════════════════════
     """)
 
 def main():
-    if not jira:
+    if not JIRA_URL or not JIRA_EMAIL or not JIRA_API_TOKEN:
+        print("❌ Missing JIRA credentials in .env")
         return
 
     print("🚀 Initializing Simple JIRA Agent...")
-    print("✅ JIRA Agent ready!")
+    configure_from_env()
+    # Connect (and sync the mirror) in the background while the menu is shown
+    start_jira_connection()
     print("🎉 Welcome to Simple JIRA Agent! 🎉")
     show_menu()
 
@@ -157,20 +543,31 @@ def main():
         elif choice == "6":
             prompt = input("Ask AI about your JIRA: ")
             print("\n🤖 AI Response:")
-            print(ask_ai(prompt))
+            print_answer(ask_ai_about_jira, prompt)
         elif choice == "7":
             print("\n🤖 AI Summary of Recent Issues:")
-            summary_prompt = "Summarize the most recent issues from my JIRA project."
-            print(ask_ai(summary_prompt))
+            print_answer(summarize_recent_issues)
         elif choice == "8":
             try:
-                jira.myself()
+                get_jira().myself()
                 print("✅ JIRA connection successful.")
             except Exception as e:
                 print(f"❌ JIRA connection failed: {e}")
         elif choice == "9":
             show_menu()
+        elif choice.lower() == "m":
+            if mirror:
+                sync_mirror()
+            else:
+                print("⚠️ Set JIRA_MIRROR_DB in .env to enable the offline mirror.")
+        elif choice.lower() == "w":
+            watch_changes()
+        elif choice.lower() == "e":
+            export_issues()
+        elif choice.lower() in ("s", "stats"):
+            print_stats()
         elif choice == "0":
+            jql_cache.save()
             print("👋 Goodbye!")
             break
         else:
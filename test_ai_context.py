@@ -0,0 +1,62 @@
+"""ContextBuilder chunking, truncation notice and budgeted reduce with a fake LLM.
+
+    python -m unittest test_ai_context
+"""
+import threading
+import unittest
+
+from ai_context import ContextBuilder, estimate_tokens
+
+
+def issue(n, words=20):
+    return {'key': f'MFLP-{n}', 'fields': {'summary': ' '.join(['word'] * words), 'status': {'name': 'Done'}}}
+
+
+class FakeLLM:
+    """Records prompts and answers with ``answer_tokens`` worth of text"""
+
+    def __init__(self, answer_tokens=20):
+        self.answer_tokens = answer_tokens
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def __call__(self, prompt):
+        with self.lock:
+            self.prompts.append(prompt)
+        return 'answer ' * self.answer_tokens
+
+
+class ContextBuilderTest(unittest.TestCase):
+    def test_small_input_is_one_call(self):
+        llm = FakeLLM()
+        builder = ContextBuilder(llm, token_budget=1000)
+        builder.answer('what is done?', [issue(1), issue(2)])
+        self.assertEqual(len(llm.prompts), 1)
+        self.assertIn('MFLP-2', llm.prompts[0])
+        self.assertFalse(builder.last_stats.truncated)
+
+    def test_truncation_is_reported(self):
+        llm = FakeLLM()
+        builder = ContextBuilder(llm, token_budget=200, max_chunks=2)
+        tokens = []
+        answer = builder.answer('what is done?', (issue(n) for n in range(100)), on_token=tokens.append)
+        stats = builder.last_stats
+        self.assertTrue(stats.truncated)
+        self.assertEqual(stats.chunks, 2)
+        self.assertIn(f'Only the first {stats.issues_included} matching issues', answer)
+        self.assertIn('Only the first', ''.join(tokens))
+
+    def test_reduce_stays_within_budget(self):
+        budget = 300
+        llm = FakeLLM(answer_tokens=120)
+        builder = ContextBuilder(llm, token_budget=budget, max_chunks=50)
+        builder.answer('what is done?', [issue(n) for n in range(60)])
+        stats = builder.last_stats
+        self.assertGreater(stats.chunks, 4)
+        self.assertGreater(stats.reduce_rounds, 1)
+        self.assertTrue(all(estimate_tokens(prompt) <= budget for prompt in llm.prompts),
+                        max(estimate_tokens(prompt) for prompt in llm.prompts))
+
+
+if __name__ == '__main__':
+    unittest.main()
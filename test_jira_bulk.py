@@ -0,0 +1,76 @@
+"""Bulk create/update/transition against the mock Jira in benchmarks/.
+
+    python -m unittest test_jira_bulk
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+
+from atlassian import Jira  # noqa: E402
+
+from jira_bulk import JiraBulkOperations  # noqa: E402
+from mock_jira import MockJiraServer  # noqa: E402
+
+ISSUES = 30
+
+
+class JiraBulkOperationsTest(unittest.TestCase):
+    def setUp(self):
+        self.server = MockJiraServer(issue_count=ISSUES, project='MOCK').start()
+        self.addCleanup(self.server.stop)
+        self.client = Jira(url=self.server.url, username='test', password='test')
+        self.written = []
+        self.bulk = JiraBulkOperations(self.client, max_workers=4, on_write=self.written.append)
+
+    def fields(self, key):
+        return self.client.issue(key)['fields']
+
+    def test_create_is_chunked(self):
+        before = self.server.request_count
+        result = self.bulk.create_issues([{'project_key': 'MOCK', 'summary': f'new {n}'} for n in range(120)])
+        self.assertEqual(self.server.request_count - before, 3)
+        self.assertEqual(result['stats']['succeeded'], 120)
+        # Chunks are created concurrently, so keys are only ordered within a chunk
+        keys = [r['issue_key'] for r in result['results']]
+        self.assertEqual(set(keys), {f'MOCK-{ISSUES + 1 + n}' for n in range(120)})
+        self.assertEqual(sorted(self.written), sorted(keys))
+        for n in (0, 50, 119):
+            self.assertEqual(self.fields(keys[n])['summary'], f'new {n}')
+
+    def test_unknown_key_fails_alone(self):
+        result = self.bulk.update_issues([
+            {'issue_key': 'MOCK-1', 'summary': 'edited'},
+            {'issue_key': 'MOCK-9999', 'summary': 'nope', 'status': 'Done'},
+            {'issue_key': 'MOCK-2', 'status': 'Done'},
+            {'summary': 'no key'},
+            {'issue_key': 'MOCK-3'},
+        ])
+        self.assertEqual([r['ok'] for r in result['results']], [True, False, True, False, False])
+        self.assertEqual(result['results'][3]['error'], 'issue_key is required')
+        self.assertEqual(result['results'][4]['error'], 'No valid fields provided for update')
+        self.assertEqual(self.fields('MOCK-1')['summary'], 'edited')
+        self.assertEqual(self.fields('MOCK-2')['status']['name'], 'Done')
+        self.assertEqual(sorted(self.written), ['MOCK-1', 'MOCK-2'])
+
+    def test_field_edit_is_reported_written_when_transition_fails(self):
+        result = self.bulk.update_issues([{'issue_key': 'MOCK-1', 'summary': 'edited', 'status': 'Shipped'}])
+        self.assertFalse(result['results'][0]['ok'])
+        self.assertIn("Status 'Shipped' not available", result['results'][0]['error'])
+        self.assertEqual(self.fields('MOCK-1')['summary'], 'edited')
+        self.assertEqual(self.written, ['MOCK-1'])
+
+    def test_transitions_share_lookups_per_workflow_scope(self):
+        # Project, issue type and status repeat every 12 issues in the mock; one worker keeps the count exact
+        self.bulk.max_workers = 1
+        result = self.bulk.transition_issues([{'issue_key': f'MOCK-{n}', 'status': 'In Review'}
+                                              for n in range(1, 25)])
+        stats = result['stats']
+        self.assertEqual(stats['succeeded'], 24)
+        self.assertEqual((stats['transition_lookups'], stats['transition_cache_hits']), (12, 12))
+        self.assertEqual({self.fields(f'MOCK-{n}')['status']['name'] for n in range(1, 25)}, {'In Review'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""IssueCache hits, TTL revalidation and invalidation with a fake clock.
+
+    python -m unittest test_jira_cache
+"""
+import threading
+import unittest
+
+from jira_cache import IssueCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class IssueCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.changed = set()
+        self.asked = []
+        self.cleared = []
+        self.cache = IssueCache(max_size=3, ttl=60, changed_keys=self.changed_keys, clock=self.clock,
+                                on_invalidate=lambda: self.cleared.append(True))
+
+    def changed_keys(self, keys, since):
+        self.asked.append(sorted(keys))
+        return self.changed & set(keys)
+
+    def test_get_fetches_once(self):
+        calls = []
+        fetch = lambda: calls.append(1) or {'key': 'MFLP-1'}  # noqa: E731
+        self.assertEqual(self.cache.get('mflp-1', fetch), {'key': 'MFLP-1'})
+        self.assertEqual(self.cache.get('MFLP-1 ', fetch), {'key': 'MFLP-1'})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_peek_leaves_stats_alone(self):
+        self.cache.put('MFLP-1', 'one')
+        self.assertEqual(self.cache.peek('MFLP-1'), 'one')
+        self.assertIsNone(self.cache.peek('MFLP-2'))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
+        self.assertEqual(self.cache.lookup('MFLP-1'), 'one')
+        self.assertIsNone(self.cache.lookup('MFLP-2'))
+        self.assertEqual(self.cache.stats()['hit_rate'], 0.5)
+
+    def test_stale_entries_are_revalidated_in_one_batch(self):
+        for n in (1, 2, 3):
+            self.cache.put(f'MFLP-{n}', f'old {n}')
+        self.clock.now += 61
+        self.changed.add('MFLP-2')
+
+        self.assertEqual(self.cache.get('MFLP-1', lambda: 'refetched'), 'old 1')
+        self.assertEqual(self.asked, [['MFLP-1', 'MFLP-2', 'MFLP-3']])
+        self.assertEqual(self.cache.get('MFLP-2', lambda: 'new 2'), 'new 2')
+        self.assertEqual(self.cache.get('MFLP-3', lambda: 'refetched'), 'old 3')
+        self.assertEqual(len(self.asked), 1)
+
+    def test_revalidation_runs_outside_the_lock(self):
+        self.cache.put('MFLP-1', 'old')
+        self.clock.now += 61
+        inside, release = threading.Event(), threading.Event()
+
+        def slow(keys, since):
+            inside.set()
+            release.wait(5)
+            return set()
+        self.cache.changed_keys = slow
+        reader = threading.Thread(target=self.cache.get, args=('MFLP-1', lambda: 'new'))
+        reader.start()
+        self.assertTrue(inside.wait(5))
+        # Another reader is not blocked while Jira is being asked
+        self.cache.put('MFLP-2', 'other')
+        self.assertEqual(self.cache.peek('MFLP-2'), 'other')
+        release.set()
+        reader.join(5)
+
+    def test_invalidate_and_lru_bound(self):
+        for n in (1, 2, 3, 4):
+            self.cache.put(f'MFLP-{n}', n)
+        self.assertIsNone(self.cache.peek('MFLP-1'))
+        self.cache.invalidate('mflp-2')
+        self.assertIsNone(self.cache.peek('MFLP-2'))
+        self.assertEqual(self.cleared, [True])
+        self.assertEqual(self.cache.stats()['invalidations'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
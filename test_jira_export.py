@@ -0,0 +1,98 @@
+"""Export checkpoints, resume and format handling against the mock Jira in benchmarks/.
+
+    python -m unittest test_jira_export
+"""
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+
+from atlassian import Jira  # noqa: E402
+
+from jira_export import STATE_FILE, JiraExporter, iter_rows  # noqa: E402
+from mock_jira import MockJiraServer  # noqa: E402
+
+ISSUES = 230
+PAGE = 20
+
+
+class FlakyJira(Jira):
+    """Fails every search after ``fail_after`` pages, like a dropped connection mid-export"""
+    fail_after = None
+    pages = 0
+
+    def jql(self, *args, **kwargs):
+        self.pages += 1
+        if self.fail_after is not None and self.pages > self.fail_after:
+            raise ConnectionError('connection reset')
+        return super().jql(*args, **kwargs)
+
+
+class JiraExporterTest(unittest.TestCase):
+    def setUp(self):
+        self.server = MockJiraServer(issue_count=ISSUES, project='MOCK').start()
+        self.addCleanup(self.server.stop)
+        self.client = FlakyJira(url=self.server.url, username='test', password='test')
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.out_dir = tmp.name
+
+    def exporter(self, fmt='csv'):
+        return JiraExporter(self.client, 'project = MOCK', self.out_dir, fields=['summary', 'status'], fmt=fmt,
+                            workers=2, page_size=PAGE, row_group_size=PAGE, rows_per_part=50)
+
+    def keys(self):
+        return [row['key'] for row in iter_rows(self.out_dir)]
+
+    def test_export_writes_every_issue_in_order(self):
+        stats = self.exporter().run()
+        self.assertEqual((stats['rows'], stats['parts']), (ISSUES, 4))
+        self.assertEqual(self.keys(), [f'MOCK-{n}' for n in range(1, ISSUES + 1)])
+
+    def test_interrupted_export_resumes_from_the_last_part(self):
+        self.client.fail_after = 7
+        with self.assertRaises(ConnectionError):
+            self.exporter().run()
+        with open(os.path.join(self.out_dir, STATE_FILE)) as f:
+            done = json.load(f)['rows']
+        self.assertGreater(done, 0)
+        self.assertFalse([name for name in os.listdir(self.out_dir) if name.endswith('.tmp')])
+
+        self.client.fail_after = None
+        stats = self.exporter().run()
+        self.assertEqual(stats['rows'], ISSUES - done)
+        self.assertEqual(self.keys(), [f'MOCK-{n}' for n in range(1, ISSUES + 1)])
+
+    def test_rerun_appends_new_issues_only(self):
+        self.exporter().run()
+        self.server.state.create({'summary': 'brand new'})
+        stats = self.exporter().run()
+        self.assertEqual(stats['rows'], 1)
+        self.assertEqual(self.keys()[-1], f'MOCK-{ISSUES + 1}')
+
+    def test_other_format_points_to_restart(self):
+        self.exporter().run()
+        with open(os.path.join(self.out_dir, STATE_FILE)) as f:
+            state = json.load(f)
+        state['format'] = 'parquet'
+        with open(os.path.join(self.out_dir, STATE_FILE), 'w') as f:
+            json.dump(state, f)
+        with self.assertRaisesRegex(ValueError, '--restart'):
+            self.exporter('csv').run()
+        stats = self.exporter('csv').run(resume=False)
+        self.assertEqual(stats['total_rows'], ISSUES)
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_auto_resumes_a_csv_export(self):
+        self.exporter('csv').run()
+        self.server.state.create({'summary': 'brand new'})
+        stats = self.exporter('auto').run()
+        self.assertEqual((stats['rows'], stats['format']), (1, 'csv'))
+
+
+if __name__ == '__main__':
+    unittest.main()
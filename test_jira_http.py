@@ -0,0 +1,68 @@
+"""Retry-After parsing and 429/503 retries of the pooled adapter.
+
+    python -m unittest test_jira_http
+"""
+import email.utils
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from jira_http import RetryingAdapter, build_session, retry_after_seconds
+
+
+class Response:
+    def __init__(self, retry_after=None):
+        self.headers = {'Retry-After': retry_after} if retry_after is not None else {}
+
+
+class RetryAfterTest(unittest.TestCase):
+    def test_delta_seconds(self):
+        self.assertEqual(retry_after_seconds(Response('3')), 3.0)
+        self.assertEqual(retry_after_seconds(Response('-5')), 0.0)
+        self.assertIsNone(retry_after_seconds(Response()))
+
+    def test_http_date(self):
+        value = email.utils.formatdate(time.time() + 30, usegmt=True)
+        self.assertAlmostEqual(retry_after_seconds(Response(value)), 30, delta=2)
+        past = email.utils.formatdate(time.time() - 30, usegmt=True)
+        self.assertEqual(retry_after_seconds(Response(past)), 0.0)
+
+    def test_malformed_values_fall_back_to_backoff(self):
+        for value in ('soon', 'Mon, 99 Foo 2024 99:99:99 GMT', 'nan', 'inf', ' '):
+            self.assertIsNone(retry_after_seconds(Response(value)), value)
+
+
+class RetryingAdapterTest(unittest.TestCase):
+    def setUp(self):
+        self.statuses = [429, 503, 200]
+        statuses = self.statuses
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                status = statuses.pop(0) if statuses else 200
+                self.send_response(status)
+                if status != 200:
+                    self.send_header('Retry-After', 'soon')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.addCleanup(self.httpd.server_close)
+        self.addCleanup(self.httpd.shutdown)
+
+    def test_bad_retry_after_header_is_retried_with_backoff(self):
+        adapter = RetryingAdapter(max_retries=3, backoff=0.01)
+        session = build_session(adapter)
+        host, port = self.httpd.server_address[:2]
+        response = session.get(f'http://{host}:{port}/rest/api/2/myself', timeout=5)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(adapter.stats()['retries'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
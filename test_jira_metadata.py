@@ -0,0 +1,117 @@
+"""Metadata validation, refresh-on-miss and call accounting against a fake client.
+
+    python -m unittest test_jira_metadata
+"""
+import os
+import tempfile
+import unittest
+
+from jira_metadata import MISS_REFRESH_INTERVAL, JiraMetadata
+
+
+class FakeJira:
+    """Answers the metadata endpoints from plain lists; ``jql`` marks it as an atlassian-style client"""
+    jql = None
+
+    def __init__(self):
+        self.projects = [{'id': '1', 'key': 'MFLP', 'name': 'Main'}]
+        self.priorities = ['High', 'Low']
+        self.issue_types = ['Bug', 'Task']
+        self.createmeta_error = None
+        self.calls = []
+
+    def get(self, path, params=None):
+        self.calls.append(path)
+        endpoint = path.rsplit('rest/api/2/', 1)[1]
+        if endpoint == 'project':
+            return self.projects
+        if endpoint == 'priority':
+            return [{'name': name} for name in self.priorities]
+        if endpoint == 'issue/createmeta':
+            if self.createmeta_error:
+                raise self.createmeta_error
+            return {'projects': [{'key': p['key'], 'issuetypes': [{'name': n} for n in self.issue_types]}
+                                 for p in self.projects]}
+        if endpoint == 'user/search':
+            return [{'accountId': 'acct-1', 'displayName': 'Grace Hopper'}]
+        raise AssertionError(f'unexpected GET {path}')
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class JiraMetadataTest(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeJira()
+        self.clock = Clock()
+        self.metadata = JiraMetadata(self.client, clock=self.clock)
+
+    def test_resolves_case_insensitively(self):
+        self.assertEqual(self.metadata.resolve_fields({'project': {'key': 'mflp'}, 'priority': {'name': 'high'},
+                                                       'issuetype': {'name': 'bug'}}),
+                         {'project': {'key': 'MFLP'}, 'priority': {'name': 'High'}, 'issuetype': {'name': 'Bug'}})
+
+    def test_miss_refreshes_once_before_rejecting(self):
+        self.metadata.ensure_loaded()
+        self.clock.now += MISS_REFRESH_INTERVAL
+        self.client.projects.append({'id': '2', 'key': 'NEW', 'name': 'New'})
+        self.client.priorities.append('Blocker')
+
+        self.assertEqual(self.metadata.resolve_project('new'), 'NEW')
+        # The refresh above also picked up the new priority: no second reload
+        calls = len(self.client.calls)
+        self.assertEqual(self.metadata.resolve_priority('blocker'), 'Blocker')
+        with self.assertRaisesRegex(ValueError, "Unknown project 'NOPE'"):
+            self.metadata.resolve_project('NOPE')
+        self.assertEqual(len(self.client.calls), calls)
+
+        self.clock.now += MISS_REFRESH_INTERVAL
+        with self.assertRaises(ValueError):
+            self.metadata.resolve_project('NOPE')
+        self.assertEqual(len(self.client.calls), calls + 3)
+
+    def test_warm_start_snapshot_learns_new_projects(self):
+        path = os.path.join(tempfile.mkdtemp(), 'metadata.json')
+        JiraMetadata(self.client, snapshot_path=path, clock=self.clock).refresh()
+        self.client.projects.append({'id': '2', 'key': 'NEW', 'name': 'New'})
+        self.clock.now += MISS_REFRESH_INTERVAL
+
+        warm = JiraMetadata(self.client, snapshot_path=path, clock=self.clock)
+        calls = len(self.client.calls)
+        self.assertEqual(warm.resolve_project('MFLP'), 'MFLP')
+        self.assertEqual(len(self.client.calls), calls)
+        self.assertEqual(warm.resolve_project('NEW'), 'NEW')
+
+    def test_createmeta_failure_leaves_issue_types_to_jira(self):
+        self.client.createmeta_error = PermissionError('403 Forbidden')
+        self.metadata.ensure_loaded()
+        self.assertEqual(self.metadata.resolve_issue_type('Anything'), 'Anything')
+        self.assertEqual(self.metadata.resolve_project('mflp'), 'MFLP')
+        with self.assertRaises(ValueError):
+            self.metadata.resolve_priority('Urgent')
+
+    def test_calls_saved_counts_replaced_requests_only(self):
+        self.metadata.ensure_loaded()
+        for _ in range(3):
+            self.metadata.resolve_project('MFLP')
+            self.metadata.resolve_priority('High')
+        self.metadata.projects()
+        self.metadata.projects()
+        self.metadata.resolve_user('Grace Hopper')
+        self.metadata.resolve_user('grace hopper')
+        with self.assertRaises(ValueError):
+            self.metadata.resolve_priority('Hgh')
+
+        stats = self.metadata.stats()
+        self.assertEqual(stats['local_hits'], 9)
+        # Two project lists, one repeated user lookup and one local rejection
+        self.assertEqual(stats['calls_saved'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
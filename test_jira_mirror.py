@@ -0,0 +1,76 @@
+"""JiraMirror sync and search against the mock Jira in benchmarks/ (no network).
+
+    python -m unittest test_jira_mirror
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+
+from atlassian import Jira  # noqa: E402
+
+from jira_mirror import JiraMirror  # noqa: E402
+from jql_cache import text_search  # noqa: E402
+from mock_jira import MockJiraServer  # noqa: E402
+
+ISSUES = 40
+
+
+class JiraMirrorTest(unittest.TestCase):
+    def setUp(self):
+        self.server = MockJiraServer(issue_count=ISSUES, project='MOCK').start()
+        self.addCleanup(self.server.stop)
+        self.client = Jira(url=self.server.url, username='test', password='test')
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.mirror = JiraMirror(os.path.join(tmp.name, 'mirror.db'), 'MOCK')
+        self.addCleanup(self.mirror.close)
+
+    def expected(self, word):
+        """Keys whose summary or description mention ``word``, newest first"""
+        state = self.server.state
+        issues = [state.issue(i) for i in range(state.issue_count - 1, -1, -1)]
+        return [issue['key'] for issue in issues
+                if word in f"{issue['fields']['summary']} {issue['fields']['description']}".lower()]
+
+    def test_full_sync_then_search_text(self):
+        stats = self.mirror.sync(self.client)
+        self.assertEqual((stats['mode'], stats['synced'], stats['total']), ('full', ISSUES, ISSUES))
+
+        keys = [issue['key'] for issue in self.mirror.search_text('login')]
+        self.assertEqual(keys, self.expected('login'))
+        self.assertEqual(len(list(self.mirror.search_text('login', limit=2))), 2)
+        self.assertEqual(list(self.mirror.search_text('nothing-like-this')), [])
+        self.assertEqual(self.mirror.get('mock-3')['fields']['summary'], self.server.state.summary(2))
+
+    def test_incremental_sync_picks_up_edits(self):
+        self.mirror.sync(self.client)
+        self.server.state.update(4, {'summary': 'Quarterly billing overhaul'})
+        requests = self.server.request_count
+
+        stats = self.mirror.sync(self.client)
+        self.assertEqual((stats['mode'], stats['synced'], stats['total']), ('incremental', 1, ISSUES))
+        self.assertEqual(self.server.request_count - requests, 1)
+        self.assertEqual([issue['key'] for issue in self.mirror.search_text('billing')], ['MOCK-5'])
+
+    def test_search_text_stays_in_mirrored_project(self):
+        self.mirror.sync(self.client)
+        other = self.server.state.issue(0)
+        self.mirror.upsert(dict(other, key='OTHER-1', fields=dict(other['fields'], project={'key': 'OTHER'})))
+
+        keys = [issue['key'] for issue in self.mirror.search_text('login')]
+        self.assertNotIn('OTHER-1', keys)
+        self.assertIsNotNone(self.mirror.get('OTHER-1'))
+
+    def test_only_scoped_text_searches_are_answered_locally(self):
+        self.assertEqual(self.mirror.scoped_text(text_search('login "page"', project='MOCK')), 'login page')
+        self.assertEqual(self.mirror.scoped_text('project=mock and text ~ "crash"'), 'crash')
+        self.assertIsNone(self.mirror.scoped_text(text_search('login')))
+        self.assertIsNone(self.mirror.scoped_text(text_search('login', project='OTHER')))
+        self.assertIsNone(self.mirror.scoped_text('project = MOCK AND text ~ "login" AND status = Done'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""Webhook receiver authentication (no network beyond loopback).
+
+    python -m unittest test_jira_watch
+"""
+import json
+import unittest
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from jira_watch import IssueWatcher, WebhookReceiver, is_loopback
+
+EVENT = {
+    'webhookEvent': 'jira:issue_updated',
+    'issue': {'key': 'MFLP-1', 'fields': {'summary': 'Forged', 'updated': '2024-01-02T00:00:00.000+0000'}},
+}
+
+
+class WebhookReceiverTest(unittest.TestCase):
+    def receiver(self, **kwargs):
+        self.changes = []
+        watcher = IssueWatcher()
+        watcher.subscribe(self.changes.append)
+        receiver = WebhookReceiver(watcher, **kwargs)
+        self.addCleanup(receiver.close)
+        return receiver
+
+    def post(self, url) -> int:
+        request = Request(url, data=json.dumps(EVENT).encode(), headers={'Content-Type': 'application/json'})
+        try:
+            with urlopen(request, timeout=5) as response:
+                return response.status
+        except HTTPError as e:
+            return e.code
+
+    def test_secret_is_required(self):
+        receiver = self.receiver(secret='s3cret')
+        self.assertEqual(self.post(receiver.url), 403)
+        self.assertEqual(self.post(receiver.url + '?secret=wrong'), 403)
+        self.assertEqual(self.changes, [])
+        self.assertEqual(self.post(receiver.url + '?secret=s3cret'), 204)
+        self.assertEqual([change.key for change in self.changes], ['MFLP-1'])
+
+    def test_loopback_without_secret_accepts_events(self):
+        receiver = self.receiver()
+        self.assertEqual(self.post(receiver.url), 204)
+        self.assertEqual(len(self.changes), 1)
+
+    def test_public_host_without_secret_is_refused(self):
+        with self.assertRaises(ValueError):
+            WebhookReceiver(IssueWatcher(), host='0.0.0.0')
+        self.assertTrue(is_loopback('localhost'))
+        self.assertTrue(is_loopback('::1'))
+        self.assertFalse(is_loopback('0.0.0.0'))
+        self.assertFalse(is_loopback('jira.example.com'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""JQL normalization and the search result cache against the mock Jira in benchmarks/.
+
+    python -m unittest test_jql_cache
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+
+from atlassian import Jira  # noqa: E402
+
+from jql_cache import MAX_CACHED_ROWS, JqlResultCache, normalize, text_search  # noqa: E402
+from mock_jira import MockJiraServer  # noqa: E402
+
+PAGE = 50
+
+
+class JqlTextTest(unittest.TestCase):
+    def test_normalize(self):
+        self.assertEqual(normalize('project=MFLP and status in ("Done","To Do") order by created desc'),
+                         'project = MFLP AND status IN ("Done", "To Do") ORDER BY created DESC')
+        self.assertEqual(normalize('assignee = currentUser()'), 'assignee = currentUser()')
+
+    def test_text_search_escapes_user_input(self):
+        self.assertEqual(text_search('say "hi" OR 1=1 -x'), 'text ~ "say hi OR 1=1 x" ORDER BY created DESC')
+        self.assertIsNone(text_search('"*?'))
+        self.assertEqual(text_search('x', project='MFLP'), 'project = MFLP AND text ~ "x" ORDER BY created DESC')
+
+
+class ResultStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.server = MockJiraServer(issue_count=MAX_CACHED_ROWS + 200, project='MOCK').start()
+        self.addCleanup(self.server.stop)
+        self.client = Jira(url=self.server.url, username='test', password='test')
+        self.cache = JqlResultCache()
+
+    def requests(self, jql):
+        before = self.server.request_count
+        stream = self.cache.stream(self.client, jql, page_size=PAGE)
+        rows = list(stream)
+        return rows, stream.total, self.server.request_count - before
+
+    def test_large_results_stream_in_full_without_a_count_request(self):
+        jql = 'project = MOCK ORDER BY created DESC'
+        rows, total, requests = self.requests(jql)
+        issues = self.server.state.issue_count
+        self.assertEqual((len(rows), total), (issues, issues))
+        self.assertEqual(rows[0].key, f'MOCK-{issues}')
+        self.assertEqual(requests, -(-issues // PAGE))
+
+        # Too large to keep, but the total answers later count prechecks
+        self.assertIsNone(self.cache.lookup(jql))
+        self.assertEqual(self.cache.cached_count(jql), issues)
+
+    def test_small_results_are_cached(self):
+        jql = text_search('login', project='MOCK')
+        rows, total, requests = self.requests(jql)
+        self.assertEqual(len(rows), total)
+        self.assertGreater(requests, 0)
+
+        again, total_again, requests = self.requests('project=MOCK and text ~ "login" order by created desc')
+        self.assertEqual((again, total_again, requests), (rows, total, 0))
+
+    def test_clear_drops_results(self):
+        jql = text_search('crash', project='MOCK')
+        self.requests(jql)
+        self.cache.clear()
+        self.assertGreater(self.requests(jql)[2], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()